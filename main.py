@@ -18,13 +18,23 @@ import atexit
 import threading
 import time
 import queue
+import heapq
+import pickle
+import sqlite3
+import bisect
+import select
+import struct
+import ctypes
+import ctypes.util
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import partial
 from datetime import datetime, timedelta
-from typing import Optional, Any, Dict, List, Set, Callable
+from typing import Optional, Any, Dict, List, Set, Callable, Iterator, Tuple
 
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.util import astimezone, localize
 from apscheduler.events import (
     EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED,
     JobExecutionEvent
@@ -34,6 +44,10 @@ try:
     local_timezone = get_localzone()
 except ImportError:
     local_timezone = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -47,6 +61,13 @@ def generate_action_id(data: Dict) -> str:
     s = "|".join(parts)
     return hashlib.md5(s.encode('utf-8')).hexdigest()
 
+def generate_event_id(event: Dict) -> str:
+    keys = ['DisplayName', 'Category', 'TargetID', 'CustomCommand', 'MinuteInterval', 'Second', 'TenMinuteInterval',
+            'Hours', 'Days', 'Weeks', 'Months', 'Enabled', 'RunAtStartup', 'CatchUp', 'CatchUpWindow',
+            'client_config', 'clients', 'flavor']
+    s = json.dumps({k: event.get(k) for k in keys}, sort_keys=True, default=str)
+    return hashlib.md5(s.encode('utf-8')).hexdigest()
+
 def get_optimal_thread_count(max_threads: int = 4, scale_factor: float = 0.5) -> int:
     try:
         cpu_count = os.cpu_count() or 2
@@ -58,7 +79,15 @@ def get_optimal_thread_count(max_threads: int = 4, scale_factor: float = 0.5) ->
 _perf_config = {
     'maxThreads': 4,
     'schedulerPollIntervalMs': 100,
-    'cacheUpdateIntervalSec': 5
+    'cacheUpdateIntervalSec': 5,
+    'fileWatchDebounceMs': 100,
+    'fileWatchPollIntervalSec': 1.0,
+    'waveDispatch': False,
+    'timetableJournalCompactSec': 300,
+    'sshChannelsPerHost': 4,
+    'sshPoolMaxSize': 8,
+    'sshPoolIdleTtlSec': 60,
+    'suShellPoolSize': 2
 }
 
 def load_performance_config(config: dict) -> None:
@@ -67,9 +96,20 @@ def load_performance_config(config: dict) -> None:
     _perf_config.update({
         'maxThreads': perf.get('maxThreads', 4),
         'schedulerPollIntervalMs': perf.get('schedulerPollIntervalMs', 100),
-        'cacheUpdateIntervalSec': perf.get('cacheUpdateIntervalSec', 5)
+        'cacheUpdateIntervalSec': perf.get('cacheUpdateIntervalSec', 5),
+        'fileWatchDebounceMs': perf.get('fileWatchDebounceMs', 100),
+        'fileWatchPollIntervalSec': perf.get('fileWatchPollIntervalSec', 1.0),
+        'waveDispatch': bool(perf.get('waveDispatch', False)),
+        'timetableJournalCompactSec': perf.get('timetableJournalCompactSec', 300),
+        'sshChannelsPerHost': perf.get('sshChannelsPerHost', 4),
+        'sshPoolMaxSize': perf.get('sshPoolMaxSize', 8),
+        'sshPoolIdleTtlSec': perf.get('sshPoolIdleTtlSec', 60),
+        'suShellPoolSize': perf.get('suShellPoolSize', 2)
     })
     provision.configure_executor(_perf_config['maxThreads'])
+    provision.configure_ssh_channels(_perf_config['sshChannelsPerHost'])
+    provision.configure_ssh_pool(_perf_config['sshPoolMaxSize'], _perf_config['sshPoolIdleTtlSec'],
+                                 _perf_config['suShellPoolSize'])
     logger.info(f"Performance config loaded: maxThreads={_perf_config['maxThreads']}, "
                 f"pollInterval={_perf_config['schedulerPollIntervalMs']}ms")
 
@@ -1058,16 +1098,21 @@ class EventDialog(QtWidgets.QDialog):
         self.resize(800, 960)
         self.event_data = event_data or {}
         self.clients = clients or []
-        self.all_events = all_events or []
+        self.set_events(all_events or [])
         self.original_name = self.event_data.get('DisplayName')
         self._setup_ui()
         self._populate_fields()
+    def set_events(self, all_events):
+        self.all_events = all_events
+        self._events_by_name = {}
+        for e in all_events:
+            self._events_by_name.setdefault(e.get('DisplayName'), e)
     def _on_event_selected(self, text):
         if text == "<New Event>":
             self.event_data = {}
             self.original_name = None
         else:
-            found = next((e for e in self.all_events if e.get('DisplayName') == text), None)
+            found = self._events_by_name.get(text)
             if found:
                 self.event_data = found
                 self.original_name = found.get('DisplayName')
@@ -1093,7 +1138,7 @@ class EventDialog(QtWidgets.QDialog):
         sep.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
         self.form.addRow(sep)
         self.category_combo = QtWidgets.QComboBox()
-        self.category_combo.addItems(["Cue Presentation", "Custom Command", "Cancel Presentation"])
+        self.category_combo.addItems(list(EVENT_CATEGORIES))
         self.category_combo.setHidden(True)
         self.form.addRow("Category:", self.category_combo)
         self.name_edit = QtWidgets.QLineEdit()
@@ -1104,11 +1149,25 @@ class EventDialog(QtWidgets.QDialog):
         self.form.addRow("", self.enabled_chk)
         self.runstartup_chk = QtWidgets.QCheckBox("Run on Startup")
         self.form.addRow("", self.runstartup_chk)
+        catch_up_layout = QtWidgets.QHBoxLayout()
+        self.catch_up_combo = QtWidgets.QComboBox()
+        for label, policy in CATCH_UP_POLICIES.items():
+            self.catch_up_combo.addItem(label, policy)
+        self.catch_up_window_spin = QtWidgets.QSpinBox()
+        self.catch_up_window_spin.setRange(1, 24 * 60)
+        self.catch_up_window_spin.setSuffix(" min window")
+        catch_up_layout.addWidget(self.catch_up_combo)
+        catch_up_layout.addWidget(self.catch_up_window_spin)
+        self.form.addRow("Missed Fires:", catch_up_layout)
         self.custom_cmd_edit = QtWidgets.QLineEdit()
         self.form.addRow("Custom Command:", self.custom_cmd_edit)
         self.min_interval_edit = QtWidgets.QLineEdit()
         self.min_interval_edit.setPlaceholderText("e.g. 15 (optional)")
         self.form.addRow("Minute Interval:", self.min_interval_edit)
+        self.second_spin = QtWidgets.QSpinBox()
+        self.second_spin.setRange(0, 59)
+        self.second_spin.setSuffix(" s")
+        self.form.addRow("Second:", self.second_spin)
         self.ten_min_group = QtWidgets.QButtonGroup(self)
         self.ten_min_group.setExclusive(False)
         tm_layout = QtWidgets.QHBoxLayout()
@@ -1273,7 +1332,10 @@ class EventDialog(QtWidgets.QDialog):
             self.target_id_edit.clear()
             self.enabled_chk.setChecked(True)
             self.runstartup_chk.setChecked(False)
+            self.catch_up_combo.setCurrentIndex(0)
+            self.catch_up_window_spin.setValue(DEFAULT_CATCH_UP_WINDOW)
             self.min_interval_edit.clear()
+            self.second_spin.setValue(0)
             self.custom_cmd_edit.clear()
             for c in list(self.card_widgets):
                 self._remove_card(c)
@@ -1290,7 +1352,10 @@ class EventDialog(QtWidgets.QDialog):
         self.target_id_edit.setText(self.event_data.get('TargetID', ''))
         self.enabled_chk.setChecked(self.event_data.get('Enabled', True))
         self.runstartup_chk.setChecked(self.event_data.get('RunAtStartup', False))
+        self.catch_up_combo.setCurrentIndex(max(0, self.catch_up_combo.findData(self.event_data.get('CatchUp', 'skip'))))
+        self.catch_up_window_spin.setValue(_int_or_none(self.event_data.get('CatchUpWindow', '')) or DEFAULT_CATCH_UP_WINDOW)
         self.min_interval_edit.setText(self.event_data.get('MinuteInterval', ''))
+        self.second_spin.setValue(_int_or_none(self.event_data.get('Second', 0)) or 0)
         self.custom_cmd_edit.setText(self.event_data.get('CustomCommand', ''))
         tm_vals = self.event_data.get('TenMinuteInterval', [])
         for chk in self.tm_checks:
@@ -1451,8 +1516,11 @@ class EventDialog(QtWidgets.QDialog):
             'TargetID': self.target_id_edit.text(),
             'Enabled': self.enabled_chk.isChecked(),
             'RunAtStartup': self.runstartup_chk.isChecked(),
+            'CatchUp': self.catch_up_combo.currentData(),
+            'CatchUpWindow': self.catch_up_window_spin.value(),
             'CustomCommand': self.custom_cmd_edit.text(),
             'MinuteInterval': self.min_interval_edit.text(),
+            'Second': self.second_spin.value(),
             'TenMinuteInterval': tm,
             'Weeks': weeks,
             'Months': months,
@@ -1607,18 +1675,13 @@ class QuickTimeEventTab(QtWidgets.QWidget):
         t.start()
         
     async def _run_batch_logic_async(self, cat, target_clients, client_configs, target_id, custom_cmd, length):
-        clients = self.controller.get_configured_clients()
+        clients = self.controller.get_client_directory()
         logger.info("Executing Quick Time Event batch...")
-        
-        client_map = {}
-        for c in clients:
-             if c.get('id'): client_map[c.get('id')] = c
-             if c.get('star'): client_map[c.get('star')] = c
 
         tasks = []
         for key, conf in client_configs.items():
             cid = conf.get('client_id') or key
-            client = client_map.get(cid)
+            client = clients.get(cid)
             if not client:
                 continue
 
@@ -2282,6 +2345,7 @@ class HomeTab(QtWidgets.QWidget):
         return empty_widget
 
     def _save_config(self):
+        self.controller.invalidate_clients()
         try:
             with open('user/config.json', 'w') as f:
                 json.dump(self.controller.config, f, indent=4)
@@ -2518,113 +2582,27 @@ class SchedulerTab(QtWidgets.QWidget):
         
         layout.addWidget(self.table)
 
-    def _is_event_in_slot(self, event, row_data, client, day_context):
-        event_clients = event.get('clients', [])
-        if not event_clients and event.get('Category') == 'Cue Presentation' and event.get('flavor'):
-             event_clients = list(event.get('flavor', {}).keys())
-
-        client_id = client.get("id", "")
-        if event_clients:
-            c_name = client.get("displayName", "")
-            c_star = client.get("star", "")
-            match_client = False
-            for ec in event_clients:
-                if ec == client_id or ec == c_name or ec == c_star:
-                    match_client = True
-                    break
-            if not match_client:
-                return False
-        event_days = event.get('Days', [])
+    def _is_event_in_slot(self, event: 'CompiledEvent', row_data, day_context):
+        if row_data.get('type') == 'day':
+            return event.matches_weekday(WEEKDAY_NAMES.index(row_data['day']))
+
         current_view_day = day_context
         if current_view_day == "Today":
              current_view_day = QtCore.QDateTime.currentDateTime().toString("dddd")
-        
-        if event_days and current_view_day not in event_days:
-            if row_data.get('type') == 'day':
-                 if row_data['day'] not in event_days:
-                     return False
-            else:
-                 return False
+        if current_view_day in WEEKDAY_NAMES and not event.matches_weekday(WEEKDAY_NAMES.index(current_view_day)):
+            return False
         
         if row_data.get('type') == 'time':
-            row_h = row_data['h']
-            row_m = row_data['m']
+            row_start = row_data['h'] * 60 + row_data['m']
             view_mode = self.view_selector.currentText()
 
-            event_hours = event.get('Hours', [])
-            if event_hours:
-                match_hour = False
-                for eh in event_hours:
-                    h_val = int(eh['hour'])
-                    period = eh['period']
-                    
-                    target_hours = []
-                    if period == "AM/PM":
-                        if h_val == 12:
-                            target_hours.append(0)
-                            target_hours.append(12)
-                        elif h_val == 0:
-                            target_hours.append(0)
-                            target_hours.append(12)
-                        else:
-                            target_hours.append(h_val)
-                            target_hours.append(h_val + 12)
-                            
-                    elif period == 'PM':
-                        if h_val != 12:
-                            target_hours.append(h_val + 12)
-                        else:
-                            target_hours.append(12)
-                            
-                    elif period == 'AM':
-                        if h_val == 12:
-                            target_hours.append(0)
-                        else:
-                            target_hours.append(h_val)
-                    
-                    if row_h in target_hours:
-                        match_hour = True
-                        break
-                if not match_hour:
-                    return False
-
-            tm_vals = event.get('TenMinuteInterval', [])
-            m_val = event.get('MinuteInterval')
-            
-            try:
-                offset = int(m_val) if (m_val and str(m_val).strip()) else 0
-            except:
-                offset = 0
-
-            bases = [int(x) for x in tm_vals] if tm_vals else [0]
-            
-            allowed_minutes = []
-            for b in bases:
-                val = b + offset
-                if 0 <= val < 60:
-                    allowed_minutes.append(val)
-            
-            match_minute = False
-            
             if view_mode == "Minute Interval":
-                if row_m in allowed_minutes: 
-                    match_minute = True
-            
+                return event.matches_minute(row_start)
             elif view_mode == "10 Minute Interval":
-                for am in allowed_minutes:
-                    if row_m <= am < row_m + 10:
-                        match_minute = True
-                        break
-                        
+                return event.fires_between(row_start, row_start + 10)
             elif view_mode == "Hourly":
-                if allowed_minutes:
-                    match_minute = True
-
-            if not match_minute:
-                return False
-
-        elif row_data.get('type') == 'day':
-            pass
+                return event.fires_between(row_start, row_start + 60)
+            return False
 
         return True
 
@@ -2636,7 +2614,7 @@ class SchedulerTab(QtWidgets.QWidget):
         
         view_mode = self.view_selector.currentText()
         clients = self.controller.get_configured_clients()
-        all_events = self.scheduler.grab_all_events()
+        untargeted = self.scheduler.catalog.untargeted()
 
         col_labels = []
         self.col_map = {}
@@ -2645,6 +2623,10 @@ class SchedulerTab(QtWidgets.QWidget):
             name = client.get("displayName", client.get("star", "Unknown"))
             col_labels.append(name)
             self.col_map[i] = client
+        if untargeted:
+            # Events naming no client still get a column, so they never vanish from the grid.
+            self.col_map[len(col_labels)] = None
+            col_labels.append("Untargeted")
             
         self.table.setColumnCount(len(col_labels))
         self.table.setHorizontalHeaderLabels(col_labels)
@@ -2716,6 +2698,17 @@ class SchedulerTab(QtWidgets.QWidget):
         self.table.setVerticalHeaderLabels(row_labels)
 
         current_day_context = self.day_selector.currentText()
+
+        matrix = None
+        if view_mode != "Daily":
+            today = datetime.now().date()
+            view_day = today
+            if current_day_context in WEEKDAY_NAMES:
+                view_day = today + timedelta(days=(WEEKDAY_NAMES.index(current_day_context) - today.weekday()) % 7)
+            matrix = self.scheduler.build_schedule_matrix(view_day, clients, enabled_only=False)
+        slot_minutes = {"Minute Interval": 1, "10 Minute Interval": 10, "Hourly": 60}.get(view_mode, 1)
+        conflicts = self.scheduler.playout_conflicts()
+        client_events = [] if matrix is not None else [self.scheduler.catalog.targeting(client) for client in clients] + [untargeted]
         
         self.table.setUpdatesEnabled(False)
         
@@ -2736,10 +2729,15 @@ class SchedulerTab(QtWidgets.QWidget):
             for c in range(self.table.columnCount()):
                 client = self.col_map[c]
 
-                matches = []
-                for event in all_events:
-                    if self._is_event_in_slot(event, row_data, client, current_day_context):
-                        matches.append(event)
+                if matrix is not None:
+                    slot_start = row_data['h'] * 60 + row_data['m']
+                    if client is None:
+                        fired = [matrix.events[i] for i in matrix.firing_events(slot_start, slot_start + slot_minutes)]
+                        matches = [e for e in fired if not e.client_keys]
+                    else:
+                        matches = [matrix.events[i] for i in matrix.firing_events(slot_start, slot_start + slot_minutes, client_index=c)]
+                else:
+                    matches = [e for e in client_events[c] if self._is_event_in_slot(e, row_data, current_day_context)]
                 
                 item = QtWidgets.QTableWidgetItem("")
                 item.setBackground(bg_color)
@@ -2753,19 +2751,24 @@ class SchedulerTab(QtWidgets.QWidget):
                     layout.setContentsMargins(1, 1, 1, 1)
                     layout.setSpacing(1)
                     
+                    client_key = client and (client.get('id') or client.get('star'))
                     for event_obj in matches:
-                        name = event_obj.get('DisplayName', 'Event') or "Event"
+                        name = event_obj.name or "Event"
+                        clashes = [x for x in conflicts.get(event_obj.name, []) if x['client_id'] == client_key]
                         lbl = QtWidgets.QLabel(name)
                         lbl.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                        lbl.setStyleSheet("""
+                        lbl.setStyleSheet(f"""
                             background-color: transparent; 
                             border-radius: 3px; 
                             color: white; 
                             font-size: 11px; 
                             padding: 2px;
-                            border: 1px solid #4A5E4A;
+                            border: 1px solid {'#C0392B' if clashes else '#4A5E4A'};
                         """)
-                        lbl.setToolTip(name)
+                        tooltip = name
+                        for x in clashes:
+                            tooltip += f"\nPlayout overlaps '{x['other']}' ({x['start']:%a %I:%M:%S %p})"
+                        lbl.setToolTip(tooltip)
                         layout.addWidget(lbl)
                         
                     self.table.setCellWidget(r, c, container)
@@ -2907,6 +2910,17 @@ class SchedulerTab(QtWidgets.QWidget):
         
         if success:
              self.refresh_grid()
+             self._warn_playout_conflicts(dialog, data.get('DisplayName', ''))
+
+    def _warn_playout_conflicts(self, parent, display_name):
+        conflicts = self.scheduler.playout_conflicts(display_name)
+        if not conflicts:
+            return
+        lines = [f"- {c['client_id']}: overlaps '{c['other']}' ({c['start']:%a %I:%M:%S %p})" for c in conflicts[:10]]
+        if len(conflicts) > 10:
+            lines.append(f"...and {len(conflicts) - 10} more")
+        QtWidgets.QMessageBox.warning(parent, "Playout Conflict",
+                                      f"'{display_name}' will start while another presentation is still playing:\n\n" + "\n".join(lines))
     
     def _handle_event_dialog_apply(self, dialog):
         data = dialog.get_data()
@@ -2932,7 +2946,7 @@ class SchedulerTab(QtWidgets.QWidget):
         if success:
              self.refresh_grid()
              all_events = self.scheduler.grab_all_events()
-             dialog.all_events = all_events
+             dialog.set_events(all_events)
              current_text = dialog.event_selector.currentText()
              dialog.event_selector.blockSignals(True)
              dialog.event_selector.clear()
@@ -2944,6 +2958,7 @@ class SchedulerTab(QtWidgets.QWidget):
              dialog.event_selector.blockSignals(False)
 
              QtWidgets.QMessageBox.information(dialog, "Success", "Event applied!")
+             self._warn_playout_conflicts(dialog, data.get('DisplayName', ''))
         else:
              QtWidgets.QMessageBox.warning(dialog, "Error", "Failed to apply event: " + fail_reason)
 
@@ -2985,8 +3000,8 @@ class SchedulerTab(QtWidgets.QWidget):
         menu.exec(self.table.viewport().mapToGlobal(position))
 
     def force_execute_event(self, display_name):
-        all_events = self.scheduler.grab_all_events()
-        event_data = next((e for e in all_events if e.get('DisplayName') == display_name), None)
+        compiled = self.scheduler.get_event(display_name)
+        event_data = compiled.data if compiled is not None else None
         
         if not event_data:
             QtWidgets.QMessageBox.warning(self, "Error", f"Event '{display_name}' not found.")
@@ -3007,13 +3022,14 @@ class SchedulerTab(QtWidgets.QWidget):
                 QtWidgets.QMessageBox.warning(self, "Error", "Scheduler loop is not running.")
 
     def edit_event(self, display_name):
-        all_events = self.scheduler.grab_all_events()
-        event_data = next((e for e in all_events if e.get('DisplayName') == display_name), None)
+        compiled = self.scheduler.get_event(display_name)
+        event_data = compiled.data if compiled is not None else None
         
         if not event_data:
             QtWidgets.QMessageBox.warning(self, "Error", f"Event '{display_name}' not found.")
             return
 
+        all_events = self.scheduler.grab_all_events()
         clients = self.controller.get_configured_clients()
         dialog = EventDialog(self, event_data=event_data, clients=clients, all_events=all_events)
         if dialog.exec() == QtWidgets.QDialog.DialogCode.Accepted:
@@ -3369,6 +3385,7 @@ class user_interface:
             }
         }
         self.controller.config["outputs"].append(new_client)
+        self.controller.invalidate_clients()
         try:
             with open('user/config.json', 'w') as f:
                 json.dump(self.controller.config, f, indent=4)
@@ -3376,7 +3393,7 @@ class user_interface:
             msg = QtWidgets.QMessageBox()
             msg.setIcon(QtWidgets.QMessageBox.Icon.Information)
             msg.setWindowTitle("Success")
-            msg.setText(f"Client added successfully!\n\nRestart the application to connect to the new client.")
+            msg.setText(f"Client added successfully!\n\nThe new client will be connected automatically.")
             msg.exec()
             
             dialog.accept()
@@ -3413,6 +3430,55 @@ class user_interface:
         """)
         return output_widget
 
+class ClientDirectory:
+    """The configured output clients, with ids normalized once and indexed for lookup.
+
+    Built from the config's outputs list and thrown away whenever the config
+    changes. Clients without an id get `<star>_<hostname>`; for keys shared
+    by several clients the first one wins.
+    """
+
+    def __init__(self, outputs: list):
+        self.clients = outputs
+        self._by_id: Dict[str, Dict] = {}
+        self._by_star: Dict[str, Dict] = {}
+        self._by_hostname: Dict[str, Dict] = {}
+        self._by_display_name: Dict[str, Dict] = {}
+        for c in outputs:
+            creds = c.get('credentials') or {}
+            if not c.get('id'):
+                host = creds.get('hostname', 'unknown').replace('.', '_')
+                c['id'] = f"{c.get('star', 'unknown')}_{host}"
+            self._by_id.setdefault(c['id'], c)
+            for index, key in ((self._by_star, c.get('star')),
+                               (self._by_hostname, creds.get('hostname')),
+                               (self._by_display_name, c.get('displayName'))):
+                if key:
+                    index.setdefault(key, c)
+
+    def __iter__(self):
+        return iter(self.clients)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def get(self, client_ref: str) -> Optional[Dict]:
+        """Resolve a client config's client_id, which is an id or, for older timetables, a star."""
+        return self._by_id.get(client_ref) or self._by_star.get(client_ref)
+
+    def by_id(self, client_id: str) -> Optional[Dict]:
+        return self._by_id.get(client_id)
+
+    def by_star(self, star: str) -> Optional[Dict]:
+        return self._by_star.get(star)
+
+    def by_hostname(self, hostname: str) -> Optional[Dict]:
+        return self._by_hostname.get(hostname)
+
+    def by_display_name(self, display_name: str) -> Optional[Dict]:
+        return self._by_display_name.get(display_name)
+
+
 class star_controller:
     def __init__(self):
         with open('user/config.json', 'r') as f:
@@ -3424,9 +3490,31 @@ class star_controller:
         self.scheduler = None
         self.stats = {}
         self.connection_registry = None
+        self._connection_loop = None
+        self._client_directory: Optional[ClientDirectory] = None
     
+    def reload_config(self):
+        try:
+            with open('user/config.json', 'r') as f:
+                config = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to reload config: {e}")
+            return
+        perf_changed = (config.get('system', {}).get('performance')
+                        != self.config.get('system', {}).get('performance'))
+        self.config = config
+        self.invalidate_clients()
+        if perf_changed:
+            load_performance_config(self.config)
+        if self.connection_registry is not None:
+            self.connection_registry.reconcile(self.get_configured_clients())
+        elif self._connection_loop is not None:
+            self.init_persistent_connections(self._connection_loop)
+
     def init_persistent_connections(self, async_loop=None):
+        self._connection_loop = async_loop
         clients = self.get_configured_clients()
+        provision.configure_warm_shells(clients)
         if not clients:
             logger.warning("No clients configured for persistent connections")
             return
@@ -3526,13 +3614,23 @@ class star_controller:
         connected_outputs_data = new_data
         return clients
     
+    def get_client_directory(self) -> ClientDirectory:
+        directory = self._client_directory
+        if directory is None:
+            directory = self._client_directory = ClientDirectory(self.config.get("outputs", []))
+            provision.configure_ssh_backends(directory.clients)
+            if self._connection_loop is not None:
+                provision.configure_warm_shells(directory.clients)
+        return directory
+
+    def invalidate_clients(self):
+        """Drop the client directory after the outputs list was edited; the next lookup rebuilds it."""
+        self._client_directory = None
+        if self.scheduler is not None:
+            self.scheduler.clients_changed()
+
     def get_configured_clients(self) -> list:
-        clients = self.config.get("outputs", [])
-        for c in clients:
-            if not c.get('id'):
-                host = c.get('credentials', {}).get('hostname', 'unknown').replace('.', '_')
-                c['id'] = f"{c.get('star', 'unknown')}_{host}"
-        return clients
+        return self.get_client_directory().clients
     
     def get_client_status(self, hostname: str) -> dict:
         clients = self.get_configured_clients()
@@ -3635,155 +3733,1915 @@ class LogSignalProxy(QtCore.QObject):
     log_received = QtCore.pyqtSignal(str, str)
 
 
-class EventSchedulerEngine:
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+CRON_DAY_NAMES = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+MINUTES_PER_DAY = 1440
+DEFAULT_LEAD_SECONDS = 60
+# Headroom kept ahead of the earliest load/run offset so the job is awake before it is due.
+LEAD_MARGIN_SECONDS = 10
+PLAYOUT_FPS = 30
+CATCH_UP_POLICIES = {"Skip": "skip", "Fire Latest": "latest", "Fire All": "all"}
+DEFAULT_CATCH_UP_WINDOW = 10
+# A 5th-week-only event restricted to February and one weekday recurs on a 28-year cycle.
+MAX_SEARCH_DAYS = 366 * 28
+ALL_WEEKDAYS_MASK = (1 << 7) - 1
+ALL_WEEKS_MASK = (1 << 5) - 1
+ALL_MONTHS_MASK = (1 << 12) - 1
+
+def resolve_hour_rule(h_rule: Dict) -> List[int]:
+    """Resolve a timetable <Hour period="..."> rule to 24h clock hours."""
+    try:
+        rule_h = int(h_rule.get('hour', 0))
+    except (TypeError, ValueError):
+        return []
+    period = h_rule.get('period') or 'AM'
+    if period == 'AM/PM':
+        return sorted({rule_h % 12, (rule_h % 12) + 12})
+    if period == 'PM':
+        return [12 if rule_h == 12 else (rule_h % 12) + 12]
+    if period == 'AM':
+        return [0 if rule_h == 12 else rule_h % 12]
+    return [rule_h % 24]
+
+def _ordinal_mask(values, lookup, width: int) -> int:
+    mask = 0
+    for v in values or []:
+        idx = lookup(v)
+        if idx is not None and 0 <= idx < width:
+            mask |= 1 << idx
+    return mask or (1 << width) - 1
+
+def _int_or_none(value) -> Optional[int]:
+    value = str(value).strip()
+    return int(value) if value.isdigit() else None
+
+def _weekday_index(name) -> Optional[int]:
+    name = str(name).strip().lower()[:3]
+    return CRON_DAY_NAMES.index(name) if name in CRON_DAY_NAMES else None
+
+EVENT_CATEGORIES = ("Cue Presentation", "Custom Command", "Cancel Presentation")
+CLIENT_ACTIONS = ("LoadRun", "Cancel", "Custom Command", "LDL (On/Off)")
+
+
+def validate_event(event: Dict) -> List[str]:
+    """Problems that would keep an event from scheduling as intended; empty if it is valid."""
+    errors = []
+    if not str(event.get('DisplayName', '') or '').strip():
+        errors.append("missing DisplayName")
+    if event.get('Category') and event['Category'] not in EVENT_CATEGORIES:
+        errors.append(f"unknown Category '{event['Category']}'")
+    minute = str(event.get('MinuteInterval', '') or '').strip()
+    if minute and (not minute.isdigit() or int(minute) > 59):
+        errors.append(f"MinuteInterval '{minute}' is not 0-59")
+    second = str(event.get('Second', 0) if event.get('Second', 0) is not None else 0).strip()
+    if not second.isdigit() or int(second) > 59:
+        errors.append(f"Second '{second}' is not 0-59")
+    for value in event.get('TenMinuteInterval', []):
+        if _int_or_none(value) not in (0, 10, 20, 30, 40, 50):
+            errors.append(f"TenMinute '{value}' is not a multiple of 10 below 60")
+    for h_rule in event.get('Hours', []):
+        if not resolve_hour_rule(h_rule) or (h_rule.get('period') or 'AM') not in ('AM', 'PM', 'AM/PM'):
+            errors.append(f"invalid Hour {h_rule.get('hour')!r} ({h_rule.get('period')})")
+    for day in event.get('Days', []):
+        if _weekday_index(day) is None:
+            errors.append(f"unknown Day '{day}'")
+    for week in event.get('Weeks', []):
+        if not 1 <= (_int_or_none(week) or 0) <= 5:
+            errors.append(f"Week '{week}' is not 1-5")
+    for month in event.get('Months', []):
+        if not 1 <= (_int_or_none(month) or 0) <= 12:
+            errors.append(f"Month '{month}' is not 1-12")
+    if str(event.get('CatchUp', 'skip') or 'skip').lower() not in CATCH_UP_POLICIES.values():
+        errors.append(f"unknown CatchUp policy '{event.get('CatchUp')}'")
+    for key, conf in event.get('client_config', {}).items():
+        action = conf.get('action') or 'LoadRun'
+        if action not in CLIENT_ACTIONS:
+            errors.append(f"client config {key}: unknown action '{action}'")
+        for field in ('load_offset', 'run_offset'):
+            try:
+                int(conf.get(field, 0))
+            except (TypeError, ValueError):
+                errors.append(f"client config {key}: {field} '{conf.get(field)}' is not an integer")
+    return errors
+
+
+class TimetableImportError(ValueError):
+    """A bulk import was rejected; `errors` lists every invalid event."""
+
+    def __init__(self, errors: List[str]):
+        super().__init__(f"{len(errors)} invalid event(s): " + "; ".join(errors[:5]))
+        self.errors = errors
+
+
+class CompiledEvent:
+    """Timetable event with its schedule precomputed as bitmasks.
+
+    minute_mask has bit (hour * 60 + minute) set for every minute of the day
+    the event fires; weekday_mask is Monday-first, week_mask and month_mask
+    are one-based values shifted down by one. Empty selections mean "any".
+    second is the offset into each firing minute the event targets, and lead
+    how far ahead of that target its job wakes up.
+    """
+    __slots__ = (
+        'data', 'name', 'category', 'enabled', 'run_at_startup',
+        'hours', 'minutes', 'minute_mask', 'weekday_mask', 'week_mask', 'month_mask',
+        'client_configs', 'client_refs', 'client_keys', 'content_hash', 'second', 'lead',
+        'catch_up', 'catch_up_window'
+    )
+
+    def __init__(self, event: Dict):
+        self.data = event
+        self.name = event.get('DisplayName', '') or ''
+        self.category = event.get('Category', '')
+        self.enabled = bool(event.get('Enabled', False))
+        self.run_at_startup = bool(event.get('RunAtStartup', False))
+        policy = str(event.get('CatchUp', '') or 'skip').lower()
+        self.catch_up = policy if policy in CATCH_UP_POLICIES.values() else 'skip'
+        self.catch_up_window = timedelta(minutes=_int_or_none(event.get('CatchUpWindow', '')) or DEFAULT_CATCH_UP_WINDOW)
 
-    def __init__(self, controller):
-        self.controller = controller
-        self.timetable_file = os.path.join(os.path.dirname(__file__), "user", "timetable.xml")
-        self._scheduler: Optional[BackgroundScheduler] = None
-        self._loop: Optional[asyncio.AbstractEventLoop] = None
-        self._thread: Optional[threading.Thread] = None
-        self._running = False
-        self._cached_events: List[Dict] = []
-        self._cached_mtime: float = 0
-        self._cache_lock = threading.Lock()
-        self.last_event_name = "None"
-        self.last_event_time = "N/A"
-        self.last_event_offset = 0.0
-        self.next_event_name = "None"
-        self.next_event_time = "N/A"
-        self.next_event_countdown = "00:00:00"
-        self.next_event_dt: Optional[datetime] = None
-        self.next_check_time = "Scanning..."
-        self.startup_event_fired = False
-        self.total_client_warnings = 0
-        self._event_jobs: Dict[str, List[str]] = {}
-        self._countdown_job_id: Optional[str] = None
-        
-    def start(self):
-        if self._running:
-            logger.warning("Scheduler already running")
-            return
-            
-        self._running = True
-        self._loop = asyncio.new_event_loop()
-        self._thread = threading.Thread(
-            target=self._loop.run_forever,
-            daemon=True,
-            name="SchedulerEventLoop"
+        hours = set()
+        for h_rule in event.get('Hours', []):
+            hours.update(resolve_hour_rule(h_rule))
+        self.hours = tuple(sorted(hours)) if hours else tuple(range(24))
+
+        m_val = _int_or_none(event.get('MinuteInterval', '')) or 0
+        bases = [b for b in (_int_or_none(x) for x in event.get('TenMinuteInterval', [])) if b is not None]
+        self.minutes = tuple(sorted({(b + m_val) % 60 for b in (bases or [0])}))
+        self.second = min(max(_int_or_none(event.get('Second', 0)) or 0, 0), 59)
+
+        minute_mask = 0
+        for h in self.hours:
+            for m in self.minutes:
+                minute_mask |= 1 << (h * 60 + m)
+        self.minute_mask = minute_mask
+        self.weekday_mask = _ordinal_mask(event.get('Days', []), _weekday_index, 7)
+        self.week_mask = _ordinal_mask(event.get('Weeks', []), lambda w: (_int_or_none(w) or 0) - 1, 5)
+        self.month_mask = _ordinal_mask(event.get('Months', []), lambda m: (_int_or_none(m) or 0) - 1, 12)
+
+        self.client_configs = self._resolve_client_configs(event)
+        refs = list(event.get('clients', []))
+        if not refs and self.category == 'Cue Presentation' and event.get('flavor'):
+            refs = list(event.get('flavor', {}).keys())
+        self.client_refs = frozenset(refs)
+        self.client_keys = self.client_refs | {conf['client_id'] for _, conf in self.client_configs}
+        self.content_hash = generate_event_id(event)
+
+        earliest = 0
+        for _, conf in self.client_configs:
+            if conf.get('separate_load_run'):
+                try:
+                    earliest = min(earliest, int(conf.get('load_offset', -20)), int(conf.get('run_offset', -12)))
+                except (TypeError, ValueError):
+                    pass
+        self.lead = timedelta(seconds=max(DEFAULT_LEAD_SECONDS, LEAD_MARGIN_SECONDS - earliest))
+
+    @staticmethod
+    def _resolve_client_configs(event: Dict) -> tuple:
+        configs = []
+        for key, conf in event.get('client_config', {}).items():
+            resolved = dict(conf)
+            resolved['client_id'] = conf.get('client_id') or key
+            configs.append((key, resolved))
+        if configs:
+            return tuple(configs)
+        legacy_flavor = event.get('flavor', {})
+        global_pid = event.get('TargetID', '').strip()
+        for cid in (event.get('clients', []) or list(legacy_flavor.keys())):
+            configs.append((cid, {
+                'client_id': cid,
+                'action': 'LoadRun',
+                'flavor': legacy_flavor.get(cid, ''),
+                'presentation_id': global_pid,
+                'duration': '60'
+            }))
+        return tuple(configs)
+
+    def matches_minute(self, minute_of_day: int) -> bool:
+        return bool((self.minute_mask >> minute_of_day) & 1)
+
+    def fires_between(self, start_minute: int, end_minute: int) -> bool:
+        """True if any firing minute falls in [start_minute, end_minute)."""
+        span = (1 << (end_minute - start_minute)) - 1
+        return bool((self.minute_mask >> start_minute) & span)
+
+    def matches_weekday(self, weekday: int) -> bool:
+        return bool((self.weekday_mask >> weekday) & 1)
+
+    def matches_date(self, target) -> bool:
+        week_num = (target.day - 1) // 7
+        return bool(
+            (self.weekday_mask >> target.weekday()) & 1
+            and (self.week_mask >> week_num) & 1
+            and (self.month_mask >> (target.month - 1)) & 1
         )
-        self._thread.start()
-        self._scheduler = BackgroundScheduler(
-            timezone=local_timezone,
-            job_defaults={
-                'coalesce': True,
-                'max_instances': 1,
-                'misfire_grace_time': 30
-            }
+
+    def matches(self, target: datetime) -> bool:
+        return (
+            self.enabled
+            and self.matches_minute(target.hour * 60 + target.minute)
+            and self.matches_date(target)
         )
-        self._scheduler.add_listener(
-            self._on_job_event,
-            EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED
+
+    def align(self, moment: datetime) -> datetime:
+        """Latest minute-plus-second slot of this event at or before moment (not checked for a match)."""
+        shifted = moment - timedelta(seconds=self.second)
+        return shifted.replace(second=0, microsecond=0) + timedelta(seconds=self.second)
+
+    def next_target(self, after: datetime) -> Optional[datetime]:
+        """First firing time >= after (naive wall clock), including the seconds offset."""
+        if not self.minute_mask:
+            return None
+        offset = timedelta(seconds=self.second)
+        after = after - offset
+        start = after.replace(second=0, microsecond=0)
+        if start < after:
+            start += timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        from_minute = start.hour * 60 + start.minute
+        for _ in range(MAX_SEARCH_DAYS):
+            if self.matches_date(day):
+                remaining = self.minute_mask >> from_minute
+                if remaining:
+                    return day + timedelta(minutes=from_minute + _lowest_bit(remaining)) + offset
+            day += timedelta(days=1)
+            from_minute = 0
+        return None
+
+    def iter_targets(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """Every firing time in [start, end), in order (naive wall clock)."""
+        offsets = [timedelta(minutes=h * 60 + m, seconds=self.second)
+                   for h in self.hours for m in self.minutes]
+        offsets.sort()
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day < end:
+            if self.matches_date(day):
+                for offset in offsets:
+                    target = day + offset
+                    if target >= end:
+                        return
+                    if target >= start:
+                        yield target
+            day += timedelta(days=1)
+
+    def targets_client(self, client: Dict) -> bool:
+        """True if the clients list or a client config names this client by id, star or displayName."""
+        return (
+            client.get("id", "") in self.client_keys
+            or client.get("displayName", "") in self.client_keys
+            or client.get("star", "") in self.client_keys
         )
-        self._scheduler.start()
-        self._do_initial_setup()
-        self._scheduler.add_job(
-            self._check_timetable_changes,
-            'interval',
-            seconds=5,
-            id='timetable_watcher',
-            replace_existing=True,
-            max_instances=1,
-            coalesce=True,
-            misfire_grace_time=10
+
+def _lowest_bit(mask: int) -> int:
+    return (mask & -mask).bit_length() - 1
+
+@dataclass(frozen=True, eq=False)
+class ActionPlan:
+    """One client config of an event, resolved against its client ahead of time.
+
+    Plans are compiled when the timetable or the client list loads, so a fire
+    only reads attributes: offsets are timedeltas, durations are in frames,
+    and the commands and log lines for the configured action are rendered.
+    steps maps "Load", "Run" and "LoadRun" to the (command, log label) pairs
+    sent in order over the plan's one-shot transport; persistent_steps holds
+    the same for a persistent SSH session.
+    """
+    client: Dict
+    cid: str
+    star_type: str
+    is_i1: bool
+    protocol: str
+    hostname: Optional[str]
+    user: Optional[str]
+    password: Optional[str]
+    port: Any
+    command_port: Any
+    su: Optional[str]
+    action: str
+    flavor: str
+    final_id: str
+    duration_frames: int
+    separate_load_run: bool
+    load_offset: timedelta
+    run_offset: timedelta
+    command: str
+    steps: Dict[str, Tuple[Tuple[str, str], ...]]
+    persistent_steps: Dict[str, Tuple[Tuple[str, str], ...]]
+    dispatch_message: str
+    action_message: str
+    load_message: str
+    run_message: str
+    result_label: str
+
+    @classmethod
+    def compile(cls, client: Dict, conf: Dict, event: Dict) -> 'ActionPlan':
+        """Build the plan for one client config; raises ValueError if it could never dispatch."""
+        creds = client.get('credentials') or {}
+        cid = client.get('id') or client.get('star')
+        star_type = client.get('star', 'unknown')
+        is_i1 = star_type == 'i1'
+        normalized_star = star_type.removesuffix('xd').removesuffix('jr')
+        protocol = client.get('protocol', 'ssh')
+        port = creds.get('port', 22)
+        command_port = port
+        if protocol == 'telnet':
+            command_port = int(port) if port else 23
+        elif protocol == 'udp':
+            command_port = int(port) if port else 7787
+
+        action = conf.get('action', 'LoadRun')
+        if action not in CLIENT_ACTIONS:
+            raise ValueError(f"unknown action '{action}'")
+        flavor = conf.get('flavor', '') or ''
+        pres_id = conf.get('presentation_id', '') or event.get('TargetID', '')
+        final_id = pres_id or ('local' if is_i1 else '1')
+        duration = str(conf.get('duration', 60))
+        duration_frames = (int(duration) if duration.isdigit() else 60) * PLAYOUT_FPS
+        load_offset = int(conf.get('load_offset', -20))
+        run_offset = int(conf.get('run_offset', -12))
+
+        label = f"{protocol.upper()} {star_type.upper()} client {cid}"
+        command = action_message = result_label = ''
+        if action == "Custom Command":
+            command = conf.get('command', '') or event.get('CustomCommand', '')
+            action_message = f"Dispatching Custom Command to {label} with command {command[:50]}"
+            result_label = f"{protocol.upper()} Custom: {command[:50]}"
+        elif action == "Cancel":
+            command = f'"{provision.i2exec}" cancelPres(PresentationId="{final_id}")'
+            result_label = (f"Subprocess Cancel pres_id={final_id}" if protocol == 'subprocess'
+                            else f"{protocol.upper()} Cancel pres_id={final_id}")
+        elif action == "LDL (On/Off)":
+            ldl_state = str(conf.get('ldl_state', '1'))
+            target_state = int(ldl_state) if ldl_state.isdigit() else 1
+            command = f'runomni /twc/util/toggleNationalLDL.pyc {target_state}'
+            action_message = f"Dispatching LDL command to {label} with state={target_state}"
+            result_label = f"{protocol.upper()} i1 LDL state={target_state}"
+        elif action == "LoadRun":
+            details = {
+                "i2": f"load(flavor='{flavor}',presentationId='{pres_id}',duration={duration_frames})",
+                "i1": f"flavor='{flavor}'"
+            }.get(normalized_star, '')
+            action_message = f"Dispatching LoadRun to {label} with {details}"
+
+        steps, persistent_steps = cls._render_steps(protocol, is_i1, flavor, final_id, duration_frames)
+        load_details = {
+            "i2": f"load(flavor='{flavor}',presentationId='{pres_id}',duration={duration_frames}) with load_offset={load_offset}, run_offset={run_offset}",
+            "i1": f"flavor='{flavor}'"
+        }.get(normalized_star, '')
+        run_details = {
+            "i2": f"run(presentationId='{pres_id}') with offset {run_offset}",
+            "i1": f"presentationId='{pres_id}'"
+        }.get(normalized_star, '')
+
+        return cls(
+            client=client, cid=cid, star_type=star_type, is_i1=is_i1, protocol=protocol,
+            hostname=creds.get('hostname'), user=creds.get('user'), password=creds.get('password'),
+            port=port, command_port=command_port, su=creds.get('su', 'dgadmin' if is_i1 else None),
+            action=action, flavor=flavor, final_id=final_id, duration_frames=duration_frames,
+            separate_load_run=bool(conf.get('separate_load_run', False)),
+            load_offset=timedelta(seconds=load_offset), run_offset=timedelta(seconds=run_offset),
+            command=command, steps=steps, persistent_steps=persistent_steps,
+            dispatch_message=f"Dispatching action '{action}' to {label}",
+            action_message=action_message,
+            load_message=f"Dispatching Load to {label} with {load_details}",
+            run_message=f"Dispatching Run to {label} with {run_details}",
+            result_label=result_label,
         )
-        self._countdown_job_id = None
-        
-        logger.info("APScheduler engine started")
-        
+
+    @staticmethod
+    def _render_steps(protocol: str, is_i1: bool, flavor: str, final_id: str, duration_frames: int):
+        """Commands for Load, Run and LoadRun in each transport's wire format, one-shot and persistent."""
+        if is_i1:
+            load_cmd = f'runomni /twc/util/load.pyc {final_id} {flavor.capitalize()}'
+            run_cmd = f'runomni /twc/util/run.pyc {final_id}'
+            tag, end = ('i1 Telnet', '\n') if protocol == 'telnet' else ('i1', '')
+            load = (load_cmd + end, f"{tag} Load {flavor}")
+            run = (run_cmd + end, f"{tag} Run {final_id}")
+            steps = {"Load": (load,), "Run": (run,), "LoadRun": (load, run)}
+            if protocol not in ('ssh', 'telnet'):
+                steps = {}
+            return steps, {"Load": ((load_cmd, load[1]),), "Run": ((run_cmd, run[1]),), "LoadRun": ((load_cmd, load[1]), (run_cmd, run[1]))}
+
+        exe = f'"{provision.i2exec}" '
+        load_call = f'loadPres(Flavor="{flavor}",Duration="{duration_frames}",PresentationId="{final_id}")'
+        run_call = f'runPres(PresentationId="{final_id}")'
+        load_details = f"flavor={flavor} pres={final_id}"
+        if protocol == 'ssh':
+            load = (exe + load_call, f"i2 Load {load_details}")
+            run = (exe + run_call, f"i2 Run pres={final_id}")
+            loadrun = ((exe + f'loadRunPres(Flavor="{flavor}",Duration="{duration_frames}",PresentationId="{final_id}")',
+                        f"i2 LoadRun {load_details} dur={duration_frames}"),)
+        elif protocol == 'subprocess':
+            load = (exe + load_call, f"i2 Subprocess Load {load_details}")
+            run = (exe + run_call, f"i2 Subprocess Run pres={final_id}")
+            loadrun = (load, run)
+        elif protocol == 'telnet':
+            load = (load_call + '\n', f"i2 Telnet Load {load_details}")
+            run = (run_call + '\n', f"i2 Telnet Run pres={final_id}")
+            loadrun = (load, run)
+        elif protocol == 'udp':
+            load = (f'<MSG><Exec workRequest="loadPres(File=0,VideoBehind=000,Logo=,Flavor={flavor},Duration={duration_frames},'
+                    f'PresentationId={final_id})" /></MSG>', f"i2 UDP Load {load_details}")
+            run = (f'<MSG><Exec workRequest="runPres(File=0,PresentationId={final_id})" /></MSG>', f"i2 UDP Run pres={final_id}")
+            loadrun = (load, run)
+        else:
+            return {}, {}
+        persistent_steps = {
+            "Load": ((exe + f'loadPres(Flavor="{flavor}",Duration={duration_frames},PresentationId="{final_id}")', load[1]),),
+            "Run": ((exe + run_call, f"i2 Run pres={final_id}"),),
+            "LoadRun": ((exe + f'loadRunPres(Flavor="{flavor}",Duration={duration_frames},PresentationId="{final_id}")',
+                         f"i2 LoadRun {load_details} dur={duration_frames}"),),
+        }
+        return {"Load": (load,), "Run": (run,), "LoadRun": loadrun}, persistent_steps
+
+
+class ScheduleMatrix:
+    """Which events fire at which minute of one day, and on which clients.
+
+    fires is [events x 1440] and incidence is [events x clients]. With NumPy
+    both are boolean arrays; without it fires holds each event's minute
+    bitmask and incidence a client bitmask per event, and every query below
+    answers the same way on either backend. A client column is set where
+    CompiledEvent.targets_client holds, the same rule EventCatalog.targeting uses.
+    """
+
+    def __init__(self, events: List[CompiledEvent], clients: List[Dict], day, enabled_only: bool = True):
+        self.events = list(events)
+        self.clients = list(clients)
+        self.day = day
+
+        masks = []
+        client_sets = []
+        for event in self.events:
+            live = (event.enabled or not enabled_only) and event.matches_date(day)
+            masks.append(event.minute_mask if live else 0)
+            client_sets.append({col for col, c in enumerate(self.clients) if event.targets_client(c)})
+
+        if np is not None:
+            raw = b''.join(m.to_bytes(MINUTES_PER_DAY // 8, 'little') for m in masks)
+            bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder='little')
+            self.fires = bits.reshape(len(masks), MINUTES_PER_DAY).astype(bool)
+            self.incidence = np.zeros((len(self.events), len(self.clients)), dtype=bool)
+            for e_idx, cols in enumerate(client_sets):
+                self.incidence[e_idx, list(cols)] = True
+        else:
+            self.fires = masks
+            self.incidence = [sum(1 << col for col in cols) for cols in client_sets]
+
+    def firing_events(self, start: int, end: Optional[int] = None, client_index: Optional[int] = None) -> List[int]:
+        """Indexes of events firing in [start, end), optionally only on one client."""
+        end = start + 1 if end is None else end
+        if np is not None:
+            active = self.fires[:, start:end].any(axis=1)
+            if client_index is not None:
+                active &= self.incidence[:, client_index]
+            return np.flatnonzero(active).tolist()
+        span = ((1 << (end - start)) - 1) << start
+        return [
+            i for i, mask in enumerate(self.fires)
+            if mask & span and (client_index is None or (self.incidence[i] >> client_index) & 1)
+        ]
+
+    def client_fire_counts(self):
+        """[clients x 1440] number of events landing on each client per minute."""
+        if np is not None:
+            return self.incidence.T.astype(np.int32) @ self.fires.astype(np.int32)
+        counts = [[0] * MINUTES_PER_DAY for _ in self.clients]
+        for mask, client_bits in zip(self.fires, self.incidence):
+            while client_bits:
+                col = _lowest_bit(client_bits)
+                client_bits &= client_bits - 1
+                row = counts[col]
+                m = mask
+                while m:
+                    minute = _lowest_bit(m)
+                    m &= m - 1
+                    row[minute] += 1
+        return counts
+
+    def next_firing(self, after_minute: int = 0) -> Optional[int]:
+        """First minute >= after_minute at which any event fires, or None."""
+        if np is not None:
+            hits = np.flatnonzero(self.fires[:, after_minute:].any(axis=0))
+            return int(hits[0]) + after_minute if hits.size else None
+        combined = 0
+        for mask in self.fires:
+            combined |= mask
+        combined >>= after_minute
+        return _lowest_bit(combined) + after_minute if combined else None
+
+
+class EventCatalog:
+    """Compiled timetable events with secondary indexes, shared between threads.
+
+    Events are kept in timetable order by DisplayName. The client, flavor and
+    presentation id indexes map each key to the names that reference it and
+    are updated together with the primary map under one lock, so readers on
+    the Qt thread and the scheduler loop never see them disagree.
+    """
+
+    def __init__(self, events=()):
+        self._lock = threading.RLock()
+        self._by_name: Dict[str, CompiledEvent] = {}
+        self._order: Dict[str, int] = {}
+        self._seq = 0
+        self._by_client_id: Dict[str, set] = {}
+        self._by_flavor: Dict[str, set] = {}
+        self._by_presentation: Dict[str, set] = {}
+        self._untargeted: set = set()
+        self.apply(events, replace=True)
+
+    def _index_keys(self, event: CompiledEvent):
+        confs = [conf for _, conf in event.client_configs]
+        flavors = {conf['flavor'] for conf in confs if conf.get('flavor')}
+        presentations = {str(conf['presentation_id']).strip() for conf in confs if conf.get('presentation_id')}
+        return (
+            (self._by_client_id, event.client_keys),
+            (self._by_flavor, flavors),
+            (self._by_presentation, presentations),
+        )
+
+    def _add(self, event: CompiledEvent):
+        name = event.name
+        previous = self._by_name.get(name)
+        if previous is not None:
+            self._unindex(previous)
+        else:
+            self._seq += 1
+            self._order[name] = self._seq
+        self._by_name[name] = event
+        self._index(event)
+
+    def _index(self, event: CompiledEvent):
+        name = event.name
+        for index, keys in self._index_keys(event):
+            for key in keys:
+                index.setdefault(key, set()).add(name)
+        if not event.client_keys:
+            self._untargeted.add(name)
+
+    def _unindex(self, event: CompiledEvent):
+        for index, keys in self._index_keys(event):
+            for key in keys:
+                names = index.get(key)
+                if names is not None:
+                    names.discard(event.name)
+                    if not names:
+                        del index[key]
+        self._untargeted.discard(event.name)
+
+    def _discard(self, name: str) -> Optional[CompiledEvent]:
+        event = self._by_name.pop(name, None)
+        if event is not None:
+            self._unindex(event)
+        return event
+
+    def _ordered(self, names) -> List[CompiledEvent]:
+        return [self._by_name[n] for n in sorted(names, key=self._order.__getitem__)]
+
+    def apply(self, events, replace: bool = False):
+        """Upsert a batch of events, or replace the whole catalog with it, in one step."""
+        with self._lock:
+            if replace:
+                self._by_name, self._order, self._seq = {}, {}, 0
+                for index in (self._by_client_id, self._by_flavor, self._by_presentation):
+                    index.clear()
+                self._untargeted.clear()
+            for event in events:
+                self._add(event)
+
+    def upsert(self, event: CompiledEvent, old_name: Optional[str] = None) -> bool:
+        """Add or replace an event; with old_name it replaces that event.
+
+        Fails if old_name is gone, or if a rename would land on another
+        event's DisplayName. A renamed event keeps its timetable position.
+        """
+        with self._lock:
+            if old_name is not None and old_name != event.name:
+                previous = self._by_name.get(old_name)
+                if previous is None or event.name in self._by_name:
+                    return False
+                self._unindex(previous)
+                del self._by_name[old_name]
+                self._by_name[event.name] = event
+                self._order[event.name] = self._order.pop(old_name)
+                self._index(event)
+                return True
+            if old_name is not None and old_name not in self._by_name:
+                return False
+            self._add(event)
+            return True
+
+    def remove(self, name: str) -> Optional[CompiledEvent]:
+        with self._lock:
+            event = self._discard(name)
+            if event is not None:
+                del self._order[name]
+            return event
+
+    def get(self, name: str) -> Optional[CompiledEvent]:
+        with self._lock:
+            return self._by_name.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._by_name
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_name)
+
+    def all(self) -> List[CompiledEvent]:
+        """Every event in timetable order."""
+        with self._lock:
+            return self._ordered(self._by_name)
+
+    def resolve(self, names) -> List[CompiledEvent]:
+        with self._lock:
+            return [self._by_name[n] for n in names if n in self._by_name]
+
+    def targeting(self, client: Dict) -> List[CompiledEvent]:
+        """Events that name this client by id, star or displayName (see CompiledEvent.targets_client)."""
+        with self._lock:
+            names = set()
+            for key in (client.get("id", ""), client.get("star", ""), client.get("displayName", "")):
+                names |= self._by_client_id.get(key, set())
+            return self._ordered(names)
+
+    def untargeted(self) -> List[CompiledEvent]:
+        """Events that name no client at all."""
+        with self._lock:
+            return self._ordered(self._untargeted)
+
+    def for_client_id(self, client_id: str) -> List[CompiledEvent]:
+        """Events that list the client or carry a client config for it."""
+        with self._lock:
+            return self._ordered(self._by_client_id.get(client_id, ()))
+
+    def for_flavor(self, flavor: str) -> List[CompiledEvent]:
+        with self._lock:
+            return self._ordered(self._by_flavor.get(flavor, ()))
+
+    def for_presentation(self, presentation_id: str) -> List[CompiledEvent]:
+        with self._lock:
+            return self._ordered(self._by_presentation.get(str(presentation_id).strip(), ()))
+
+
+class PlayoutIndex:
+    """Projected playout windows per client, kept sorted for overlap checks.
+
+    Every LoadRun an event sends to an I2 client is projected as a window of
+    Duration frames starting when the presentation runs, over `horizon_days`
+    from the anchor day. Events are indexed and unindexed one at a time, so
+    an edit only re-checks the windows of the event that changed. The window
+    is re-anchored on today once today passes its midpoint, and everything
+    is re-projected when the client directory it was built from is replaced.
+    """
+
+    def __init__(self, horizon_days: int = 7):
+        self.horizon_days = horizon_days
+        self.anchor = None
+        self.clients: Optional['ClientDirectory'] = None
+        self._windows: Dict[str, List[tuple]] = {}
+        self._max_len: Dict[str, timedelta] = {}
+        self._by_event: Dict[str, Dict[str, List[tuple]]] = {}
+        self._hashes: Dict[str, str] = {}
+        self._conflicts: Dict[str, Dict[tuple, tuple]] = {}
+        self._lock = threading.Lock()
+
+    def sync(self, events: List['CompiledEvent'], clients: 'ClientDirectory', today=None,
+             names: Optional[List[str]] = None) -> List[str]:
+        """Reindex events that were added, changed or removed; returns their names.
+
+        With names, only those events are looked at: `events` holds their
+        current versions and a name missing from it is unindexed. A stale
+        index is always rebuilt from scratch, which needs the full list.
+        """
+        today = today or datetime.now().date()
+        desired = {e.name: e for e in events if e.enabled}
+        with self._lock:
+            if self.needs_rebuild(clients, today):
+                if names is not None:
+                    raise ValueError("a stale playout index needs every event to re-anchor")
+                self.anchor = today
+                self.clients = clients
+                self._windows, self._max_len, self._by_event = {}, {}, {}
+                self._hashes, self._conflicts = {}, {}
+            candidates = dict.fromkeys([*self._hashes, *desired] if names is None else names)
+            changed = [n for n in candidates
+                       if self._hashes.get(n) != (desired[n].content_hash if n in desired else None)]
+            for name in changed:
+                self._remove(name)
+            for name in changed:
+                if name in desired:
+                    self._add(desired[name], clients)
+            for name in changed:
+                if name in desired:
+                    self._check(name)
+        return changed
+
+    def needs_rebuild(self, clients: 'ClientDirectory', today=None) -> bool:
+        """Whether the next sync must re-project every event: never built, stale, or new clients."""
+        return self.anchor is None or self.is_stale(today) or clients is not self.clients
+
+    def is_stale(self, today=None) -> bool:
+        """Whether today has reached the middle of the projected window, or left it."""
+        today = today or datetime.now().date()
+        if self.anchor is None:
+            return False
+        return not (self.anchor <= today < self.anchor + timedelta(days=max(1, self.horizon_days // 2)))
+
+    def conflicts_for(self, name: str) -> List[Dict]:
+        with self._lock:
+            return [
+                {'event': name, 'other': other, 'client_id': cid, 'start': start}
+                for (other, cid), start in sorted(self._conflicts.get(name, {}).items())
+            ]
+
+    def all_conflicts(self) -> Dict[str, List[Dict]]:
+        with self._lock:
+            names = [n for n, found in self._conflicts.items() if found]
+        return {n: self.conflicts_for(n) for n in names}
+
+    def _project(self, event: 'CompiledEvent', clients: 'ClientDirectory') -> Dict[str, List[tuple]]:
+        start = datetime.combine(self.anchor, datetime.min.time())
+        end = start + timedelta(days=self.horizon_days)
+        per_client: Dict[str, List[tuple]] = {}
+        targets = None
+        for _, conf in event.client_configs:
+            client = clients.get(conf['client_id'])
+            if not client or not str(client.get('star', '')).startswith('i2'):
+                continue
+            if conf.get('action', 'LoadRun') != 'LoadRun':
+                continue
+            duration = str(conf.get('duration', 60))
+            frames = (int(duration) if duration.isdigit() else 60) * PLAYOUT_FPS
+            length = timedelta(seconds=frames / PLAYOUT_FPS)
+            shift = timedelta(0)
+            if conf.get('separate_load_run'):
+                try:
+                    shift = timedelta(seconds=int(conf.get('run_offset', -12)))
+                except (TypeError, ValueError):
+                    pass
+            if targets is None:
+                targets = list(event.iter_targets(start, end))
+            cid = client.get('id') or client.get('star')
+            per_client.setdefault(cid, []).extend((t + shift, t + shift + length, event.name) for t in targets)
+        return per_client
+
+    def _add(self, event: 'CompiledEvent', clients: 'ClientDirectory'):
+        projected = self._project(event, clients)
+        for cid, windows in projected.items():
+            index = self._windows.setdefault(cid, [])
+            for window in windows:
+                bisect.insort(index, window)
+                if window[1] - window[0] > self._max_len.get(cid, timedelta(0)):
+                    self._max_len[cid] = window[1] - window[0]
+        self._by_event[event.name] = projected
+        self._hashes[event.name] = event.content_hash
+
+    def _remove(self, name: str):
+        for cid, windows in self._by_event.pop(name, {}).items():
+            index = self._windows.get(cid, [])
+            for window in windows:
+                i = bisect.bisect_left(index, window)
+                if i < len(index) and index[i] == window:
+                    del index[i]
+        self._hashes.pop(name, None)
+        for other in self._conflicts.pop(name, {}):
+            found = self._conflicts.get(other[0])
+            if found:
+                found.pop((name, other[1]), None)
+
+    def _check(self, name: str):
+        for cid, windows in self._by_event.get(name, {}).items():
+            index = self._windows.get(cid, [])
+            max_len = self._max_len.get(cid, timedelta(0))
+            for start, end, _ in windows:
+                i = bisect.bisect_left(index, (start - max_len,))
+                while i < len(index) and index[i][0] < end:
+                    o_start, o_end, other = index[i]
+                    i += 1
+                    if o_end <= start or (other == name and o_start == start):
+                        continue
+                    first = max(start, o_start)
+                    for a, b in ((name, other), (other, name)):
+                        found = self._conflicts.setdefault(a, {})
+                        if (b, cid) not in found or first < found[(b, cid)]:
+                            found[(b, cid)] = first
+
+
+class EventTrigger(BaseTrigger):
+    """Fires `lead` ahead of each minute a compiled event matches.
+
+    Hours, minutes, weekdays, week-of-month and months all come from the
+    event's masks, so next_run_time is always a run that will execute.
+    """
+
+    __slots__ = ('event', 'lead', 'timezone')
+
+    def __init__(self, event: 'CompiledEvent', lead: Optional[timedelta] = None, timezone=None):
+        self.event = event
+        self.lead = lead if lead is not None else event.lead
+        self.timezone = astimezone(timezone) or local_timezone
+
+    def get_next_fire_time(self, previous_fire_time, now):
+        after = now
+        if previous_fire_time is not None:
+            after = max(now, previous_fire_time + timedelta(microseconds=1))
+        if self.timezone is not None:
+            after = after.astimezone(self.timezone)
+        target = self._next_target((after + self.lead).replace(tzinfo=None))
+        if target is None:
+            return None
+        fire_time = target - self.lead
+        if self.timezone is not None:
+            return localize(fire_time, self.timezone)
+        return fire_time.astimezone()
+
+    def _next_target(self, after: datetime) -> Optional[datetime]:
+        return self.event.next_target(after)
+
+    def __str__(self):
+        return f"event[{self.event.name}, lead={self.lead}]"
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} (event={self.event.name!r}, lead={self.lead}, timezone='{self.timezone}')>"
+
+
+class WaveTrigger(EventTrigger):
+    """Fires `lead` ahead of every minute at which any of `events` matches."""
+
+    __slots__ = ('events',)
+
+    def __init__(self, events: List['CompiledEvent'], lead: Optional[timedelta] = None, timezone=None):
+        if lead is None:
+            lead = max((e.lead for e in events), default=timedelta(seconds=DEFAULT_LEAD_SECONDS))
+        super().__init__(None, lead, timezone)
+        self.events = tuple(events)
+
+    def _next_target(self, after: datetime) -> Optional[datetime]:
+        targets = [t for t in (e.next_target(after) for e in self.events) if t is not None]
+        return min(targets) if targets else None
+
+    def __str__(self):
+        return f"wave[{len(self.events)} events, lead={self.lead}]"
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} (events={len(self.events)}, lead={self.lead}, timezone='{self.timezone}')>"
+
+
+class FileWatcher:
+    """Watches a set of files and calls back once per burst of changes.
+
+    Uses Linux inotify on the parent directories so atomic replaces and
+    editor save dances are seen; on other platforms it falls back to
+    stat polling. Callbacks run on the watcher thread.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_ATTRIB | IN_MODIFY
+    _EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, callbacks: Dict[str, Callable[[str], None]],
+                 debounce_ms: int = 100, poll_interval: float = 1.0):
+        self._callbacks = {os.path.abspath(p): cb for p, cb in callbacks.items()}
+        self._debounce = max(0, debounce_ms) / 1000.0
+        self._poll_interval = poll_interval
+        self._pending: Dict[str, float] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify_fd: Optional[int] = None
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+        self._wd_dirs: Dict[int, str] = {}
+        self.backend = "none"
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        target = self._run_polling
+        if self._init_inotify():
+            target = self._run_inotify
+            self.backend = "inotify"
+        else:
+            self.backend = "polling"
+        self._thread = threading.Thread(target=target, daemon=True, name="FileWatcher")
+        self._thread.start()
+        logger.info(f"File watcher started ({self.backend}) for {len(self._callbacks)} files")
+
     def stop(self):
-        self._running = False
-        if self._scheduler:
+        self._stop_event.set()
+        if self._wake_w is not None:
             try:
-                self._scheduler.shutdown(wait=False)
-            except Exception:
+                os.write(self._wake_w, b'\0')
+            except OSError:
                 pass
-        if self._loop:
-            self._loop.call_soon_threadsafe(self._loop.stop)
-        logger.info("APScheduler engine stopped")
-        
-    def _do_initial_setup(self):
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        for fd in (self._inotify_fd, self._wake_r, self._wake_w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._inotify_fd = self._wake_r = self._wake_w = None
+
+    def _init_inotify(self) -> bool:
+        if not sys.platform.startswith('linux'):
+            return False
         try:
-            self.controller.scheduler = self
-            self.controller.init_persistent_connections(self._loop)
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            self._wd_dirs = {}
+            for directory in {os.path.dirname(p) for p in self._callbacks}:
+                wd = libc.inotify_add_watch(fd, directory.encode(), self.WATCH_MASK)
+                if wd < 0:
+                    os.close(fd)
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+                self._wd_dirs[wd] = directory
+            self._inotify_fd = fd
+            self._wake_r, self._wake_w = os.pipe()
+            return True
         except Exception as e:
-            logger.warning(f"Failed to initialize persistent connections: {e}")
-        self._reload_events()
-        self._schedule_all_events()
-        if not self.startup_event_fired:
+            logger.warning(f"inotify unavailable, falling back to polling: {e}")
+            return False
+
+    def _run_inotify(self):
+        while not self._stop_event.is_set():
+            timeout = None
+            if self._pending:
+                timeout = max(0.0, min(self._pending.values()) - time.monotonic())
             try:
-                future = asyncio.run_coroutine_threadsafe(
-                    self._fire_startup_events(), 
-                    self._loop
-                )
-                future.result(timeout=30)
-            except Exception as e:
-                logger.error(f"Error firing startup events: {e}")
-            self.startup_event_fired = True
-            
-    async def _fire_startup_events(self):
-        events = self.grab_all_events()
-        tasks = []
-        for event in events:
-            if event.get('RunAtStartup', False) and event.get('Enabled', True):
-                logger.info(f"Firing startup event: {event.get('DisplayName')}")
-                target_time = datetime.now()
-                tasks.append(self._execute_event(event, target_time=target_time, is_startup=True))
-        
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
-            
-    def _check_timetable_changes(self):
-        try:
-            if os.path.exists(self.timetable_file):
-                current_mtime = os.path.getmtime(self.timetable_file)
-                if current_mtime != self._cached_mtime:
-                    logger.info("Timetable changed, reloading events...")
-                    self._reload_events()
-                    self._schedule_all_events()
-        except Exception as e:
-            logger.error(f"Error checking timetable changes: {e}")
-            
-    def _reload_events(self):
+                ready, _, _ = select.select([self._inotify_fd, self._wake_r], [], [], timeout)
+            except (OSError, ValueError):
+                break
+            if self._inotify_fd in ready:
+                try:
+                    buf = os.read(self._inotify_fd, 64 * 1024)
+                except BlockingIOError:
+                    buf = b''
+                offset = 0
+                while offset + self._EVENT_HEADER.size <= len(buf):
+                    wd, _mask, _cookie, length = self._EVENT_HEADER.unpack_from(buf, offset)
+                    offset += self._EVENT_HEADER.size
+                    name = buf[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+                    offset += length
+                    if wd in self._wd_dirs and name:
+                        self._mark_changed(os.path.join(self._wd_dirs[wd], name))
+            self._flush_due()
+
+    def _run_polling(self):
+        signatures = {p: self._signature(p) for p in self._callbacks}
+        while not self._stop_event.is_set():
+            wait = self._poll_interval
+            if self._pending:
+                wait = min(wait, max(0.0, min(self._pending.values()) - time.monotonic()))
+            if self._stop_event.wait(wait):
+                break
+            for path in self._callbacks:
+                sig = self._signature(path)
+                if sig != signatures[path]:
+                    signatures[path] = sig
+                    self._mark_changed(path)
+            self._flush_due()
+
+    @staticmethod
+    def _signature(path: str) -> Optional[tuple]:
         try:
-            if not os.path.exists(self.timetable_file):
-                with self._cache_lock:
-                    self._cached_events = []
-                return
-                
-            current_mtime = os.path.getmtime(self.timetable_file)
-            tree = ET.parse(self.timetable_file)
-            root = tree.getroot()
-            events = []
-            
-            for event_elem in root.findall('event'):
-                event = self._parse_event_element(event_elem)
-                events.append(event)
-                
-            with self._cache_lock:
-                self._cached_events = events
-                self._cached_mtime = current_mtime
-                
-            logger.debug(f"Loaded {len(events)} events from timetable")
-            
-        except Exception as e:
-            logger.error(f"Error loading timetable: {e}")
-            
-    def _parse_event_element(self, event_elem) -> Dict:
-        event = {}
-        for tag in ['DisplayName', 'CustomCommand', 'MinuteInterval', 'Category', 'TargetID']:
-            el = event_elem.find(tag)
+            st = os.stat(path)
+            return (st.st_ino, st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+
+    def _mark_changed(self, path: str):
+        if path in self._callbacks:
+            self._pending[path] = time.monotonic() + self._debounce
+
+    def _flush_due(self):
+        now = time.monotonic()
+        for path in [p for p, due in self._pending.items() if due <= now]:
+            del self._pending[path]
+            try:
+                self._callbacks[path](path)
+            except Exception as e:
+                logger.error(f"Error handling change to {path}: {e}")
+
+
+WAVE_JOB_ID = 'event_wave'
+
+
+class LatencyEstimator:
+    """Rolling (exponentially weighted) per-client command round-trip time."""
+
+    def __init__(self, alpha: float = 0.3, max_estimate: float = 30.0):
+        self.alpha = alpha
+        self.max_estimate = max_estimate
+        self._estimates: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def estimate(self, client_id: str) -> float:
+        with self._lock:
+            return self._estimates.get(client_id, 0.0)
+
+    def record(self, client_id: str, seconds: float):
+        seconds = min(max(seconds, 0.0), self.max_estimate)
+        with self._lock:
+            prev = self._estimates.get(client_id)
+            self._estimates[client_id] = seconds if prev is None else prev + self.alpha * (seconds - prev)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._estimates)
+
+
+class FireJournal:
+    """Append-only JSON-lines record of intended vs. actual fire times.
+
+    Records are queued and written by a background thread that flushes and
+    fsyncs once per `flush_interval`, so a burst of fires costs one fsync.
+    A heartbeat is appended when the journal has been idle for
+    `heartbeat_interval`, which lets the last line alone tell replay when
+    the engine was last alive. The file is rotated to `<path>.1` once it
+    grows past `max_bytes`.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.5, heartbeat_interval: float = 60.0,
+                 max_bytes: int = 8 * 1024 * 1024):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.max_bytes = max_bytes
+        self._pending: List[str] = []
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._last_write = time.monotonic()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._seal_torn_tail()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="FireJournal")
+        self._thread.start()
+
+    def stop(self):
+        self.record('stop')
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def record(self, kind: str, event: Optional[str] = None, intended: Optional[datetime] = None,
+               actual: Optional[datetime] = None):
+        entry = {'k': kind, 'w': round(time.time(), 3)}
+        if event is not None:
+            entry['e'] = event
+        if intended is not None:
+            entry['i'] = intended.isoformat()
+        if actual is not None:
+            entry['a'] = actual.isoformat()
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+        with self._cond:
+            self._pending.append(line)
+
+    def last_alive(self) -> Optional[datetime]:
+        """Wall-clock time of the newest intact record, reading only the end of the file."""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                end = f.tell()
+                block = 4096
+                while end > 0:
+                    start = max(0, end - block)
+                    f.seek(start)
+                    lines = f.read(end - start).splitlines()
+                    for raw in reversed(lines if start == 0 else lines[1:]):
+                        try:
+                            return datetime.fromtimestamp(json.loads(raw)['w'])
+                        except (ValueError, KeyError, TypeError):
+                            continue
+                    if start == 0:
+                        break
+                    block *= 2
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error reading fire journal: {e}")
+        return None
+
+    def _seal_torn_tail(self):
+        """Terminate a half-written last line so new records start on a line of their own."""
+        try:
+            with open(self.path, 'rb+') as f:
+                if f.seek(0, os.SEEK_END) == 0:
+                    return
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error opening fire journal: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._stopping:
+                    self._cond.wait(self.flush_interval)
+                stopping = self._stopping
+                if not self._pending and time.monotonic() - self._last_write >= self.heartbeat_interval:
+                    self._pending.append(json.dumps({'k': 'alive', 'w': round(time.time(), 3)}) + '\n')
+                batch, self._pending = self._pending, []
+            if batch:
+                self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, lines: List[str]):
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                os.replace(self.path, self.path + '.1')
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            self._last_write = time.monotonic()
+        except Exception as e:
+            logger.error(f"Error writing fire journal: {e}")
+
+
+class TimetableWriter:
+    """Write-behind persistence for the in-memory timetable.
+
+    mark_dirty() is cheap; a background thread waits `coalesce_delay` so a
+    burst of edits becomes one write, renders the current model and swaps
+    it in with temp-file-plus-rename, so the file on disk is always either
+    the old or the new timetable.
+    """
+
+    def __init__(self, path: str, render: Callable[[], str], coalesce_delay: float = 0.25,
+                 on_written: Optional[Callable[[], None]] = None):
+        self.path = path
+        self._render = render
+        self._on_written = on_written
+        self.coalesce_delay = coalesce_delay
+        self._dirty = False
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._last_signature: Optional[tuple] = None
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def mark_dirty(self):
+        with self._cond:
+            self._dirty = True
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True, name="TimetableWriter")
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self):
+        """Write now if anything is pending (used on shutdown)."""
+        if self._dirty:
+            self._write()
+
+    def is_own_write(self) -> bool:
+        """True if the file on disk is exactly the one this writer last produced."""
+        return self._last_signature is not None and FileWatcher._signature(self.path) == self._last_signature
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    self._cond.wait()
+            time.sleep(self.coalesce_delay)
+            self._write()
+
+    def _write(self):
+        with self._write_lock:
+            with self._cond:
+                if not self._dirty:
+                    return
+                self._dirty = False
+            tmp_path = f"{self.path}.tmp"
+            try:
+                content = self._render()
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+                self._last_signature = FileWatcher._signature(self.path)
+                logger.debug(f"Timetable written to {self.path}")
+                if self._on_written:
+                    self._on_written()
+            except Exception as e:
+                logger.error(f"Error writing timetable: {e}")
+                with self._cond:
+                    self._dirty = True
+
+
+class TimetableChangeJournal:
+    """Append-only log of timetable edits, one JSON object per line.
+
+    Tools that edit the timetable often can append records here instead of
+    rewriting timetable.xml:
+
+        {"op": "upsert", "event": {...}, "old_name": "previous name"}
+        {"op": "delete", "name": "DisplayName"}
+
+    `event` uses the same keys as an event parsed from timetable.xml and
+    old_name is optional (it renames). read_new() returns the complete
+    records appended since the last call; compact() drops records once the
+    timetable file holds their effect.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    @property
+    def offset(self) -> int:
+        """Bytes of the journal that have been read and applied."""
+        return self._offset
+
+    def append(self, op: str, event: Optional[Dict] = None, name: Optional[str] = None,
+               old_name: Optional[str] = None):
+        record = {'op': op}
+        if event is not None:
+            record['event'] = event
+        if name is not None:
+            record['name'] = name
+        if old_name is not None:
+            record['old_name'] = old_name
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def rewind(self):
+        """Replay from the start on the next read, e.g. after the timetable was reloaded from disk."""
+        with self._lock:
+            self._offset = 0
+
+    def read_new(self) -> List[Dict]:
+        with self._lock:
+            try:
+                with open(self.path, 'rb') as f:
+                    f.seek(0, os.SEEK_END)
+                    if f.tell() < self._offset:
+                        self._offset = 0
+                    f.seek(self._offset)
+                    data = f.read()
+            except FileNotFoundError:
+                self._offset = 0
+                return []
+            # A line without its newline is still being written; leave it for the next read.
+            complete = data[:data.rfind(b'\n') + 1]
+            self._offset += len(complete)
+        records = []
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                logger.warning(f"Skipping unreadable timetable journal record: {e}")
+        return records
+
+    def compact(self, upto: int):
+        """Drop the first `upto` bytes, keeping anything appended after them."""
+        if upto <= 0:
+            return
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(self.path, 'rb') as f:
+                    f.seek(upto)
+                    tail = f.read()
+                with open(tmp_path, 'wb') as f:
+                    f.write(tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+                self._offset = max(0, self._offset - upto)
+                logger.debug(f"Compacted timetable journal ({upto} bytes folded into the timetable)")
+            except FileNotFoundError:
+                self._offset = 0
+            except Exception as e:
+                logger.error(f"Error compacting timetable journal: {e}")
+
+
+class SQLiteTimetableStore:
+    """Timetable storage in SQLite, as an alternative to timetable.xml.
+
+    Each event is kept whole as JSON (so XML import/export is lossless) next
+    to indexed columns for display name, enabled flag and category, plus
+    child tables of client ids and firing hours for per-client and per-hour
+    lookups that do not touch the rest of the timetable.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY,
+            display_name TEXT NOT NULL UNIQUE,
+            category TEXT NOT NULL DEFAULT '',
+            enabled INTEGER NOT NULL DEFAULT 0,
+            position INTEGER NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_events_enabled ON events(enabled);
+        CREATE INDEX IF NOT EXISTS idx_events_category ON events(category);
+        CREATE INDEX IF NOT EXISTS idx_events_position ON events(position);
+        CREATE TABLE IF NOT EXISTS event_clients (
+            event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+            client_id TEXT NOT NULL,
+            PRIMARY KEY (event_id, client_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_event_clients_client ON event_clients(client_id);
+        CREATE TABLE IF NOT EXISTS event_hours (
+            event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+            hour INTEGER NOT NULL,
+            PRIMARY KEY (event_id, hour)
+        );
+        CREATE INDEX IF NOT EXISTS idx_event_hours_hour ON event_hours(hour);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._conn.executescript(self.SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM events').fetchone()[0]
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits to the database (not on our own commits)."""
+        with self._lock:
+            return self._conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def load_all(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute('SELECT data FROM events ORDER BY position').fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def upsert(self, event: 'CompiledEvent', old_name: Optional[str] = None):
+        """Insert or update an event; renaming onto another event's DisplayName raises sqlite3.IntegrityError."""
+        with self._lock, self._conn:
+            if old_name is not None and old_name != event.name:
+                # Rename the row in place so the event keeps its id and position; UNIQUE rejects collisions.
+                self._conn.execute('UPDATE events SET display_name = ? WHERE display_name = ?', (event.name, old_name))
+            self._upsert(event, None)
+
+    def delete(self, display_name: str):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM events WHERE display_name = ?', (display_name,))
+
+    def replace_all(self, events: List['CompiledEvent']):
+        """Swap the whole timetable in one transaction."""
+        self.apply_batch(events, replace=True)
+
+    def apply_batch(self, events, replace: bool = False):
+        """Upsert events (or replace everything with them) in one transaction."""
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute('DELETE FROM events')
+                for position, event in enumerate(events):
+                    self._upsert(event, position)
+            else:
+                for event in events:
+                    self._upsert(event, None)
+
+    def names_for_client(self, client_id: str) -> List[str]:
+        return self._names(
+            'SELECT e.display_name FROM event_clients c JOIN events e ON e.id = c.event_id '
+            'WHERE c.client_id = ? ORDER BY e.position', (client_id,))
+
+    def enabled_names_in_hour(self, hour: int) -> List[str]:
+        return self._names(
+            'SELECT e.display_name FROM event_hours h JOIN events e ON e.id = h.event_id '
+            'WHERE h.hour = ? AND e.enabled = 1 ORDER BY e.position', (hour,))
+
+    def names_in_category(self, category: str) -> List[str]:
+        return self._names('SELECT display_name FROM events WHERE category = ? ORDER BY position', (category,))
+
+    def import_xml(self, path: str, parse_event: Callable) -> int:
+        root = ET.parse(path).getroot()
+        events, seen = [], set()
+        for event_elem in root.findall('event'):
+            compiled = CompiledEvent(parse_event(event_elem))
+            if compiled.name not in seen:
+                seen.add(compiled.name)
+                events.append(compiled)
+        self.replace_all(events)
+        return len(events)
+
+    def export_xml(self, path: str, populate_event: Callable, indent: Callable) -> int:
+        events = self.load_all()
+        root = ET.Element('timetable')
+        for event in events:
+            populate_event(ET.SubElement(root, 'event'), event)
+        indent(root)
+        tmp_path = f"{path}.tmp"
+        ET.ElementTree(root).write(tmp_path, encoding='unicode', xml_declaration=True)
+        os.replace(tmp_path, path)
+        return len(events)
+
+    def _names(self, sql: str, params: tuple) -> List[str]:
+        with self._lock:
+            return [name for (name,) in self._conn.execute(sql, params)]
+
+    def _upsert(self, event: 'CompiledEvent', position: Optional[int]):
+        if position is None:
+            row = self._conn.execute('SELECT position FROM events WHERE display_name = ?', (event.name,)).fetchone()
+            if row is None:
+                row = self._conn.execute('SELECT IFNULL(MAX(position), -1) + 1 FROM events').fetchone()
+            position = row[0]
+        self._conn.execute(
+            'INSERT INTO events (display_name, category, enabled, position, data) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT(display_name) DO UPDATE SET category = excluded.category, enabled = excluded.enabled, '
+            'position = excluded.position, data = excluded.data',
+            (event.name, event.category or '', int(event.enabled), position, json.dumps(event.data, default=str))
+        )
+        event_id = self._conn.execute('SELECT id FROM events WHERE display_name = ?', (event.name,)).fetchone()[0]
+        self._conn.execute('DELETE FROM event_clients WHERE event_id = ?', (event_id,))
+        self._conn.execute('DELETE FROM event_hours WHERE event_id = ?', (event_id,))
+        self._conn.executemany('INSERT INTO event_clients (event_id, client_id) VALUES (?, ?)',
+                               [(event_id, cid) for cid in event.client_keys if cid])
+        self._conn.executemany('INSERT INTO event_hours (event_id, hour) VALUES (?, ?)',
+                               [(event_id, h) for h in event.hours])
+
+
+class TimetableSnapshotCache:
+    """Pickled CompiledEvent list for a timetable file, so a warm start skips XML parsing.
+
+    The snapshot is keyed by the timetable's path, size, mtime and a hash of
+    its bytes (plus a format version), and is ignored whenever any differ.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @classmethod
+    def key_for(cls, source_path: str) -> Optional[tuple]:
+        try:
+            st = os.stat(source_path)
+            with open(source_path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return None
+        return (cls.VERSION, os.path.abspath(source_path), st.st_size, st.st_mtime_ns, digest)
+
+    def load(self, source_path: str) -> Optional[List['CompiledEvent']]:
+        key = self.key_for(source_path)
+        if key is None:
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                cached_key, events = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable timetable snapshot: {e}")
+            return None
+        return events if cached_key == key else None
+
+    def save(self, source_path: str, events: List['CompiledEvent']):
+        key = self.key_for(source_path)
+        if key is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((key, list(events)), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save timetable snapshot: {e}")
+
+
+class SystemClock:
+    """Time source for the engine's dispatch timing; swap in a virtual clock to test it."""
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+
+class EventSchedulerEngine:
+
+    def __init__(self, controller, clock: Optional[SystemClock] = None):
+        self.controller = controller
+        self.clock = clock or SystemClock()
+        self.timetable_file = os.path.join(os.path.dirname(__file__), "user", "timetable.xml")
+        self.config_file = os.path.join(os.path.dirname(__file__), "user", "config.json")
+        self.journal = FireJournal(os.path.join(os.path.dirname(__file__), "user", "fire_journal.log"))
+        self._file_watcher: Optional[FileWatcher] = None
+        self._scheduler: Optional[BackgroundScheduler] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.catalog = EventCatalog()
+        self._cached_mtime: float = 0
+        self._timetable_writer = TimetableWriter(self.timetable_file, self._render_timetable,
+                                                 on_written=self._on_timetable_written)
+        self._snapshot = TimetableSnapshotCache(os.path.join(os.path.dirname(__file__), "user", ".timetable.snapshot"))
+        self._rendered_events: List[CompiledEvent] = []
+        self.change_journal = TimetableChangeJournal(os.path.join(os.path.dirname(__file__), "user", "timetable.journal"))
+        self._journal_lock = threading.Lock()
+        self._journal_mark = 0
+        self._store: Optional[SQLiteTimetableStore] = None
+        self._store_version = 0
+        system_config = controller.config.get('system', {}) if controller is not None else {}
+        if system_config.get('timetableBackend', 'xml') == 'sqlite':
+            db_path = system_config.get('timetableDatabase') or os.path.join(os.path.dirname(__file__), "user", "timetable.db")
+            try:
+                self._store = SQLiteTimetableStore(db_path)
+                logger.info(f"Using SQLite timetable backend at {db_path}")
+            except Exception as e:
+                logger.error(f"Could not open SQLite timetable {db_path}, falling back to XML: {e}")
+        self.last_event_name = "None"
+        self.last_event_time = "N/A"
+        self.last_event_offset = 0.0
+        self.last_event_offsets: Dict[str, float] = {}
+        self.latency = LatencyEstimator()
+        self.next_event_name = "None"
+        self.next_event_time = "N/A"
+        self.next_event_countdown = "00:00:00"
+        self.next_event_dt: Optional[datetime] = None
+        self.next_check_time = "Scanning..."
+        self.startup_event_fired = False
+        self.total_client_warnings = 0
+        self._event_jobs: Dict[str, List[str]] = {}
+        self._event_hashes: Dict[str, str] = {}
+        self._schedule_lock = threading.RLock()
+        self._wave_events: List[CompiledEvent] = []
+        self._wave_plan: Optional[ScheduleMatrix] = None
+        self._wave_lead = timedelta(seconds=DEFAULT_LEAD_SECONDS)
+        self.playout_index = PlayoutIndex()
+        self._action_plans: Dict[str, tuple] = {}
+        self._countdown_job_id: Optional[str] = None
+        
+    def start(self):
+        if self._running:
+            logger.warning("Scheduler already running")
+            return
+            
+        self._running = True
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            daemon=True,
+            name="SchedulerEventLoop"
+        )
+        self._thread.start()
+        self._scheduler = BackgroundScheduler(
+            timezone=local_timezone,
+            job_defaults={
+                'coalesce': True,
+                'max_instances': 1,
+                'misfire_grace_time': 30
+            }
+        )
+        self._scheduler.add_listener(
+            self._on_job_event,
+            EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED
+        )
+        self._scheduler.start()
+        self._event_jobs = {}
+        self._event_hashes = {}
+        last_alive = self.journal.last_alive()
+        self.journal.start()
+        self.journal.record('start')
+        self._do_initial_setup()
+        self._catch_up_missed(last_alive)
+        perf = get_perf_config()
+        self._scheduler.add_job(
+            self._refresh_playout_index, 'interval', hours=1,
+            id='playout_reanchor', replace_existing=True
+        )
+        watched = {
+            self.config_file: self._on_config_file_changed,
+            self.change_journal.path: self._on_change_journal_appended,
+        }
+        if self._store is None:
+            watched[self.timetable_file] = self._on_timetable_file_changed
+            self._scheduler.add_job(
+                self._compact_change_journal, 'interval',
+                seconds=perf['timetableJournalCompactSec'],
+                id='timetable_journal_compact', replace_existing=True
+            )
+        else:
+            # SQLite has no file to watch; imports from another process show up as a new data_version.
+            self._scheduler.add_job(
+                self._poll_timetable_store, 'interval',
+                seconds=perf['fileWatchPollIntervalSec'],
+                id='timetable_store_poll', replace_existing=True
+            )
+        self._file_watcher = FileWatcher(
+            watched,
+            debounce_ms=perf['fileWatchDebounceMs'],
+            poll_interval=perf['fileWatchPollIntervalSec']
+        )
+        self._file_watcher.start()
+        self._countdown_job_id = None
+        atexit.register(self._timetable_writer.flush)
+        
+        logger.info("APScheduler engine started")
+        
+    def stop(self):
+        self._running = False
+        if self._file_watcher:
+            self._file_watcher.stop()
+            self._file_watcher = None
+        if self._scheduler:
+            try:
+                self._scheduler.shutdown(wait=False)
+            except Exception:
+                pass
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self.journal.stop()
+        atexit.unregister(self._timetable_writer.flush)
+        self._timetable_writer.flush()
+        logger.info("APScheduler engine stopped")
+        
+    def _do_initial_setup(self):
+        try:
+            self.controller.scheduler = self
+            self.controller.init_persistent_connections(self._loop)
+        except Exception as e:
+            logger.warning(f"Failed to initialize persistent connections: {e}")
+        self._reload_events()
+        self._schedule_all_events()
+        if not self.startup_event_fired:
+            try:
+                future = asyncio.run_coroutine_threadsafe(
+                    self._fire_startup_events(), 
+                    self._loop
+                )
+                future.result(timeout=30)
+            except Exception as e:
+                logger.error(f"Error firing startup events: {e}")
+            self.startup_event_fired = True
+            
+    async def _fire_startup_events(self):
+        events = self.grab_compiled_events()
+        tasks = []
+        for event in events:
+            if event.run_at_startup and event.enabled:
+                logger.info(f"Firing startup event: {event.name}")
+                target_time = datetime.now()
+                tasks.append(self._execute_event(event, target_time=target_time, is_startup=True))
+        
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            
+    def _on_timetable_file_changed(self, path: str):
+        if self._timetable_writer.is_own_write():
+            return
+        if self._timetable_writer.dirty:
+            logger.warning("Timetable changed on disk while edits are pending; keeping in-memory timetable")
+            return
+        logger.info("Timetable changed, reloading events...")
+        self._reload_events()
+        self._schedule_all_events()
+
+    def _on_change_journal_appended(self, path: str):
+        if self._apply_change_journal():
+            self._schedule_all_events()
+
+    def _apply_change_journal(self) -> int:
+        """Apply records appended to the change journal since the last call; returns how many."""
+        with self._journal_lock:
+            records = self.change_journal.read_new()
+            applied = 0
+            for record in records:
+                try:
+                    applied += self._apply_change_record(record)
+                except Exception as e:
+                    logger.warning(f"Skipping timetable journal record {record!r:.80}: {e}")
+            mark = self.change_journal.offset
+        if not applied:
+            return 0
+        compiled = self.grab_compiled_events()
+        self._sync_playout_index(compiled)
+        self._prepare_action_plans(compiled)
+        if self._store is not None:
+            self.change_journal.compact(mark)
+        logger.info(f"Applied {applied} timetable change(s) from {self.change_journal.path}")
+        return applied
+
+    def _apply_change_record(self, record: Dict) -> int:
+        op = record.get('op')
+        if op == 'delete':
+            name = record.get('name', '')
+            if self.catalog.remove(name) is None:
+                return 0
+            if self._store is not None:
+                self._store.delete(name)
+            return 1
+        if op != 'upsert':
+            raise ValueError(f"unknown op {op!r}")
+        event = record.get('event') or {}
+        problems = validate_event(event)
+        if problems:
+            raise ValueError(', '.join(problems))
+        compiled = CompiledEvent(event)
+        old_name = record.get('old_name')
+        # Replays after a crash or reload may see a rename that already happened, with
+        # the old name re-created by an earlier record; either way the record's outcome wins.
+        if not (old_name and self.catalog.upsert(compiled, old_name=old_name)):
+            if old_name and old_name != compiled.name and self.catalog.remove(old_name) is not None \
+                    and self._store is not None:
+                self._store.delete(old_name)
+            self.catalog.upsert(compiled)
+            old_name = None
+        if self._store is not None:
+            self._store.upsert(compiled, old_name=old_name)
+        return 1
+
+    def _compact_change_journal(self):
+        """Fold applied journal records into timetable.xml; the journal is trimmed once the write lands."""
+        if self.change_journal.offset > 0 and not self._timetable_writer.dirty:
+            self._timetable_writer.mark_dirty()
+
+    def _on_config_file_changed(self, path: str):
+        logger.info("Config changed, reloading...")
+        self.controller.reload_config()
+
+    def clients_changed(self):
+        """Re-project playout windows and recompile action plans for a new client directory."""
+        compiled = self.grab_compiled_events()
+        self._sync_playout_index(compiled)
+        self._prepare_action_plans(compiled)
+            
+    def _reload_events(self):
+        if self._store is not None:
+            self._reload_events_from_store()
+        else:
+            self._reload_events_from_xml()
+        # Records not yet compacted into the timetable are replayed on top of it.
+        self.change_journal.rewind()
+        self._apply_change_journal()
+
+    def _reload_events_from_xml(self):
+        try:
+            if not os.path.exists(self.timetable_file):
+                self.catalog.apply((), replace=True)
+                return
+                
+            current_mtime = os.path.getmtime(self.timetable_file)
+            by_name: Dict[str, CompiledEvent] = {}
+            cached = self._snapshot.load(self.timetable_file)
+            if cached is not None:
+                by_name = {c.name: c for c in cached}
+                logger.debug("Loaded compiled timetable from snapshot")
+            else:
+                tree = ET.parse(self.timetable_file)
+                root = tree.getroot()
+                for event_elem in root.findall('event'):
+                    compiled = CompiledEvent(self._parse_event_element(event_elem))
+                    if compiled.name in by_name:
+                        logger.warning(f"Duplicate event '{compiled.name}' in timetable; keeping the first")
+                        continue
+                    by_name[compiled.name] = compiled
+                self._snapshot.save(self.timetable_file, list(by_name.values()))
+                
+            self.catalog.apply(by_name.values(), replace=True)
+            self._cached_mtime = current_mtime
+            self._sync_playout_index(list(by_name.values()))
+            self._prepare_action_plans(list(by_name.values()))
+                
+            logger.debug(f"Loaded {len(by_name)} events from timetable")
+            
+        except Exception as e:
+            logger.error(f"Error loading timetable: {e}")
+            
+    def _reload_events_from_store(self):
+        try:
+            if self._store.count() == 0 and os.path.exists(self.timetable_file):
+                imported = self._store.import_xml(self.timetable_file, self._parse_event_element)
+                logger.info(f"Imported {imported} events from {self.timetable_file} into the SQLite timetable")
+            self._store_version = self._store.data_version()
+            by_name: Dict[str, CompiledEvent] = {}
+            for event in self._store.load_all():
+                compiled = CompiledEvent(event)
+                by_name[compiled.name] = compiled
+            self.catalog.apply(by_name.values(), replace=True)
+            self._sync_playout_index(list(by_name.values()))
+            self._prepare_action_plans(list(by_name.values()))
+            logger.debug(f"Loaded {len(by_name)} events from SQLite timetable")
+        except Exception as e:
+            logger.error(f"Error loading SQLite timetable: {e}")
+
+    def _poll_timetable_store(self):
+        """Reload the SQLite timetable when another process has committed to it."""
+        if self._store.data_version() == self._store_version:
+            return
+        logger.info("SQLite timetable changed, reloading events...")
+        self._reload_events()
+        self._schedule_all_events()
+
+    def import_timetable_xml(self, path: str) -> int:
+        """Replace the SQLite timetable with the events in an XML timetable."""
+        count = self._store.import_xml(path, self._parse_event_element)
+        self._reload_events_from_store()
+        self._schedule_all_events()
+        return count
+
+    def export_timetable_xml(self, path: str) -> int:
+        """Write the SQLite timetable out in timetable.xml format."""
+        return self._store.export_xml(path, self._populate_event_element, self._indent)
+
+    def events_for_client(self, client_id: str) -> List[CompiledEvent]:
+        if self._store is not None:
+            return self._resolve_names(self._store.names_for_client(client_id))
+        return self.catalog.for_client_id(client_id)
+
+    def enabled_events_in_hour(self, hour: int) -> List[CompiledEvent]:
+        if self._store is not None:
+            return self._resolve_names(self._store.enabled_names_in_hour(hour))
+        return [e for e in self.grab_compiled_events() if e.enabled and hour in e.hours]
+
+    def _resolve_names(self, names: List[str]) -> List[CompiledEvent]:
+        return self.catalog.resolve(names)
+
+    def _sync_playout_index(self, compiled: List[CompiledEvent], names: Optional[List[str]] = None):
+        if self.controller is None:
+            return
+        clients = self.controller.get_client_directory()
+        if names is not None and self.playout_index.needs_rebuild(clients):
+            compiled, names = self.catalog.all(), None
+        try:
+            changed = self.playout_index.sync(compiled, clients, names=names)
+        except Exception as e:
+            logger.error(f"Error indexing playout windows: {e}")
+            return
+        reported = set()
+        for name in changed:
+            for c in self.playout_index.conflicts_for(name):
+                pair = (frozenset((c['event'], c['other'])), c['client_id'])
+                if pair in reported:
+                    continue
+                reported.add(pair)
+                logger.warning(f"Playout conflict on {c['client_id']}: '{c['event']}' overlaps "
+                               f"'{c['other']}' at {c['start']:%a %I:%M:%S %p}")
+
+    def _refresh_playout_index(self):
+        """Re-project playout windows once today has slid past the middle of the index's window."""
+        if self.playout_index.is_stale():
+            self._sync_playout_index(self.catalog.all())
+
+    def playout_conflicts(self, display_name: Optional[str] = None):
+        """Overlapping playout windows, for one event or as {event name: conflicts}."""
+        if display_name is not None:
+            return self.playout_index.conflicts_for(display_name)
+        return self.playout_index.all_conflicts()
+
+    def _parse_event_element(self, event_elem) -> Dict:
+        event = {}
+        for tag in ['DisplayName', 'CustomCommand', 'MinuteInterval', 'Category', 'TargetID']:
+            el = event_elem.find(tag)
             event[tag] = el.text if el is not None and el.text else ""
+        second_el = event_elem.find('Second')
+        event['Second'] = (_int_or_none(second_el.text) or 0) if second_el is not None and second_el.text else 0
+        catch_up_el = event_elem.find('CatchUp')
+        event['CatchUp'] = catch_up_el.text if catch_up_el is not None and catch_up_el.text else 'skip'
+        window_el = event_elem.find('CatchUpWindow')
+        event['CatchUpWindow'] = (_int_or_none(window_el.text) or DEFAULT_CATCH_UP_WINDOW) if window_el is not None and window_el.text else DEFAULT_CATCH_UP_WINDOW
         for tag, default in [('Enabled', False), ('RunAtStartup', False)]:
             el = event_elem.find(tag)
             event[tag] = (el.text.lower() == 'true') if el is not None and el.text else default
@@ -3850,123 +5708,150 @@ class EventSchedulerEngine:
                     
         return event
         
-    def _schedule_all_events(self):
+    def _schedule_all_events(self, names: Optional[List[str]] = None) -> int:
+        """Bring the scheduler's jobs in line with the cached timetable.
+
+        Only events whose content hash changed are touched: new events are
+        added, edited ones have their jobs replaced in place and removed or
+        disabled ones are unscheduled. With names, only those events are
+        diffed. Returns the number of jobs touched.
+        """
         if not self._scheduler:
-            return
-        for job_ids in self._event_jobs.values():
-            for job_id in job_ids:
+            return 0
+
+        # Edits, file and config watchers and scheduler jobs all reschedule from their own threads.
+        with self._schedule_lock:
+            wave = get_perf_config()['waveDispatch']
+            if wave:
+                names = None
+            desired: Dict[str, CompiledEvent] = {}
+            for event in (self.grab_compiled_events() if names is None else self.catalog.resolve(names)):
+                if event.enabled:
+                    desired[event.name or 'Unnamed'] = event
+            if wave:
+                return self._schedule_wave(desired)
+
+            added = replaced = removed = 0
+            for display_name in list(self._event_jobs if names is None else names):
+                if display_name not in desired:
+                    removed += self._unschedule_event(display_name)
+
+            for display_name, event in desired.items():
+                if self._event_hashes.get(display_name) == event.content_hash:
+                    continue
+                old_ids = self._event_jobs.get(display_name, [])
+                job_ids = self._schedule_event(event)
+                for job_id in old_ids:
+                    if job_id not in job_ids:
+                        self._remove_job(job_id)
+                        removed += 1
+                replaced += sum(1 for job_id in job_ids if job_id in old_ids)
+                added += sum(1 for job_id in job_ids if job_id not in old_ids)
+                if job_ids:
+                    self._event_jobs[display_name] = job_ids
+                    self._event_hashes[display_name] = event.content_hash
+                else:
+                    self._event_jobs.pop(display_name, None)
+                    self._event_hashes.pop(display_name, None)
+
+            touched = added + replaced + removed
+            if touched:
+                logger.info(f"Rescheduled {touched} jobs (+{added} ~{replaced} -{removed}); "
+                            f"{sum(len(ids) for ids in self._event_jobs.values())} jobs for {len(self._event_jobs)} events")
+            else:
+                logger.debug("Timetable reload left all scheduled jobs unchanged")
+            self._update_next_event()
+            return touched
+
+    def _schedule_wave(self, desired: Dict[str, CompiledEvent]) -> int:
+        """Wave mode: one job fires per minute any event is due and dispatches them together."""
+        touched = 0
+        for display_name in list(self._event_jobs):
+            touched += self._unschedule_event(display_name)
+
+        hashes = {name: event.content_hash for name, event in desired.items()}
+        if hashes != self._event_hashes or not self._scheduler.get_job(WAVE_JOB_ID):
+            self._wave_events = list(desired.values())
+            self._wave_plan = None
+            self._event_hashes = hashes
+            if self._wave_events:
+                trigger = WaveTrigger(self._wave_events, timezone=local_timezone)
+                self._wave_lead = trigger.lead
                 try:
-                    self._scheduler.remove_job(job_id)
-                except Exception:
-                    pass
-        self._event_jobs.clear()
-        
-        events = self.grab_all_events()
-        scheduled_count = 0
-        
-        for event in events:
-            if not event.get('Enabled', False):
-                continue
-                
-            display_name = event.get('DisplayName', 'Unnamed')
-            job_ids = self._schedule_event(event)
-            
-            if job_ids:
-                self._event_jobs[display_name] = job_ids
-                scheduled_count += len(job_ids)
-                
-        logger.info(f"Scheduled {scheduled_count} jobs for {len(self._event_jobs)} events")
+                    self._scheduler.add_job(
+                        self._trigger_wave_wrapper,
+                        trigger,
+                        id=WAVE_JOB_ID,
+                        replace_existing=True,
+                        name="Wave"
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to schedule wave job: {e}")
+            else:
+                self._remove_job(WAVE_JOB_ID)
+            touched += 1
+            logger.info(f"Rescheduled wave job for {len(self._wave_events)} events")
         self._update_next_event()
+        return touched
+
+    def _wave_plan_for(self, day) -> ScheduleMatrix:
+        plan = self._wave_plan
+        if plan is None or plan.day != day:
+            plan = ScheduleMatrix(self._wave_events, [], day)
+            self._wave_plan = plan
+        return plan
+
+    def _wave_members(self, reference: datetime) -> tuple:
+        """(target_time, events) for the latest wave slot at or before reference."""
+        best = None
+        members: List[CompiledEvent] = []
+        minute_start = reference.replace(second=0, microsecond=0)
+        for start in (minute_start, minute_start - timedelta(minutes=1)):
+            plan = self._wave_plan_for(start.date())
+            for i in plan.firing_events(start.hour * 60 + start.minute):
+                event = plan.events[i]
+                slot = start + timedelta(seconds=event.second)
+                if slot > reference:
+                    continue
+                if best is None or slot > best:
+                    best, members = slot, [event]
+                elif slot == best:
+                    members.append(event)
+        return best, members
+
+    def _unschedule_event(self, display_name: str) -> int:
+        job_ids = self._event_jobs.pop(display_name, [])
+        self._event_hashes.pop(display_name, None)
+        for job_id in job_ids:
+            self._remove_job(job_id)
+        return len(job_ids)
+
+    def _remove_job(self, job_id: str):
+        try:
+            self._scheduler.remove_job(job_id)
+        except Exception:
+            pass
         
-    def _schedule_event(self, event: Dict) -> List[str]:
-        display_name = event.get('DisplayName', 'Unknown')
-        job_ids = []
-        cron_kwargs = self._build_cron_kwargs(event)
-        if not cron_kwargs:
-            return []
-
+    def _schedule_event(self, event: CompiledEvent) -> List[str]:
+        display_name = event.name or 'Unknown'
         job_id = f"event_{display_name}"
         try:
             self._scheduler.add_job(
                 self._trigger_event_wrapper,
-                CronTrigger(second=0, **cron_kwargs),
+                EventTrigger(event, timezone=local_timezone),
                 id=job_id,
                 args=[event],
                 replace_existing=True,
                 name=display_name
             )
-            job_ids.append(job_id)
         except Exception as e:
             logger.error(f"Failed to schedule job for {display_name}: {e}")
-            
-        return job_ids
-        
-    def _build_cron_kwargs(self, event: Dict) -> Optional[Dict]:
-        hours = set()
-        for h_rule in event.get('Hours', []):
-            try:
-                rule_h = int(h_rule.get('hour', 0))
-                rule_p = h_rule.get('period', 'AM')
-                
-                if rule_p == 'AM/PM':
-                    hours.add(rule_h % 12)
-                    hours.add((rule_h % 12) + 12 if rule_h != 12 else 12)
-                elif rule_p == 'PM' and rule_h != 12:
-                    hours.add(rule_h + 12)
-                elif rule_p == 'AM' and rule_h == 12:
-                    hours.add(0)
-                else:
-                    hours.add(rule_h)
-            except ValueError:
-                continue
-                
-        if not hours:
-            hours = set(range(24))
-        tm_vals = event.get('TenMinuteInterval', [])
-        m_val_str = str(event.get('MinuteInterval', '')).strip()
-        m_val = int(m_val_str) if m_val_str and m_val_str.isdigit() else 0
-        
-        bases = [int(x) for x in tm_vals if x.isdigit()] if tm_vals else [0]
-        minutes = set((b + m_val) % 60 for b in bases)
-        adjusted_minutes = set((m - 1) % 60 for m in minutes)
-        adjusted_hours = set()
-        for m in minutes:
-            adj_m = (m - 1) % 60
-            for h in hours:
-                if m == 0:
-                    adjusted_hours.add((h - 1) % 24)
-                else:
-                    adjusted_hours.add(h)
-                    
-        if not adjusted_hours:
-            adjusted_hours = hours
-            
-        day_map = {
-            'Sunday': 'sun', 'Monday': 'mon', 'Tuesday': 'tue',
-            'Wednesday': 'wed', 'Thursday': 'thu', 'Friday': 'fri', 'Saturday': 'sat'
-        }
-        days = event.get('Days', [])
-        day_of_week = ','.join(day_map.get(d, d.lower()[:3]) for d in days) if days else '*'
-        months = event.get('Months', [])
-        month_str = ','.join(months) if months else '*'
-        weeks = event.get('Weeks', [])
-        
-        return {
-            'hour': ','.join(str(h) for h in sorted(adjusted_hours)),
-            'minute': ','.join(str(m) for m in sorted(adjusted_minutes)),
-            'day_of_week': day_of_week,
-            'month': month_str,
-        }
-        
-    def _trigger_event_wrapper(self, event: Dict):
+            return []
+        return [job_id]
+
+    def _trigger_event_wrapper(self, event: CompiledEvent):
         try:
-            now = datetime.now()
-            target_time = (now + timedelta(minutes=1)).replace(second=0, microsecond=0)
-            weeks = event.get('Weeks', [])
-            if weeks:
-                week_num = (target_time.day - 1) // 7 + 1
-                if str(week_num) not in weeks:
-                    return
+            target_time = event.align(self.clock.now() + event.lead)
 
             if self._loop and self._loop.is_running():
                 asyncio.run_coroutine_threadsafe(
@@ -3979,58 +5864,111 @@ class EventSchedulerEngine:
         except Exception as e:
             logger.error(f"Error in trigger wrapper: {e}")
             
-    async def _execute_event(self, event: Dict, target_time: Optional[datetime] = None, is_startup: bool = False):
+    def _trigger_wave_wrapper(self):
+        try:
+            target_time, events = self._wave_members(self.clock.now() + self._wave_lead)
+            if not events:
+                return
+
+            if self._loop and self._loop.is_running():
+                asyncio.run_coroutine_threadsafe(
+                    self._execute_wave(events, target_time),
+                    self._loop
+                )
+            else:
+                logger.warning("Event loop not running, cannot execute wave")
+
+        except Exception as e:
+            logger.error(f"Error in wave trigger wrapper: {e}")
+
+    async def _execute_wave(self, events: List[CompiledEvent], target_time: datetime):
+        """Dispatch every event due at target_time, one ordered batch per client."""
+        try:
+            names = [e.name or 'Unknown' for e in events]
+            self.last_event_name = names[0] if len(names) == 1 else f"{names[0]} (+{len(names) - 1})"
+            now = self.clock.now()
+            self.last_event_time = now.strftime("%I:%M:%S %p")
+            self.last_event_offset = (now - target_time).total_seconds()
+            for name in names:
+                self.journal.record('fire', name, target_time, now)
+
+            if not self.controller.get_client_directory():
+                logger.warning("No configured clients to dispatch event to")
+                return
+
+            batches: Dict[str, List[ActionPlan]] = {}
+            for event in events:
+                for plan in self._plans_for(event):
+                    batches.setdefault(plan.cid, []).append(plan)
+
+            logger.info(f"Dispatching wave of {len(events)} events to {len(batches)} clients: {', '.join(names)}")
+            await asyncio.gather(
+                *[self._dispatch_client_batch(plans, target_time) for plans in batches.values()],
+                return_exceptions=True
+            )
+
+        except Exception as e:
+            logger.error(f"Error executing wave: {e}")
+
+    async def _dispatch_client_batch(self, plans: List[ActionPlan], target_time: datetime):
+        for plan in plans:
+            await self._dispatch_client_action(plan, target_time, False)
+
+    def _plans_for(self, event: CompiledEvent) -> tuple:
+        """The event's action plans for the current client list, compiling them if they are stale."""
+        clients = self.controller.get_client_directory()
+        entry = self._action_plans.get(event.name)
+        if entry is None or entry[0] != event.content_hash or entry[1] is not clients:
+            plans = []
+            for key, conf in event.client_configs:
+                client = clients.get(conf['client_id'])
+                if client is None:
+                    continue
+                try:
+                    plans.append(ActionPlan.compile(client, conf, event.data))
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Skipping client config {key} of event '{event.name}': {e}")
+            entry = (event.content_hash, clients, tuple(plans))
+            self._action_plans[event.name] = entry
+        return entry[2]
+
+    def _prepare_action_plans(self, events: List[CompiledEvent], names: Optional[List[str]] = None):
+        """Compile action plans for a freshly loaded timetable so fires never have to.
+
+        With names, only those events' plans are refreshed and any of them
+        missing from `events` are dropped.
+        """
+        if self.controller is None:
+            return
+        present = set()
+        for event in events:
+            present.add(event.name)
+            self._plans_for(event)
+        for name in [n for n in (self._action_plans if names is None else names) if n not in present]:
+            self._action_plans.pop(name, None)
+
+    async def _execute_event(self, event, target_time: Optional[datetime] = None, is_startup: bool = False):
         try:
-            self.last_event_name = event.get('DisplayName', 'Unknown')
-            now = datetime.now()
+            compiled = self._compiled_for(event)
+            self.last_event_name = compiled.name or 'Unknown'
+            now = self.clock.now()
             self.last_event_time = now.strftime("%I:%M:%S %p")
             if target_time:
                 diff = (now - target_time).total_seconds()
                 self.last_event_offset = diff
+                if not is_startup:
+                    self.journal.record('fire', self.last_event_name, target_time, now)
             else:
                 self.last_event_offset = 0.0
-            client_configs = event.get('client_config', {})
-            if not client_configs:
-                legacy_clients = event.get('clients', [])
-                legacy_flavor = event.get('flavor', {})
-                global_pid = event.get('TargetID', '').strip()
-                
-                for cid in (legacy_clients or list(legacy_flavor.keys())):
-                    client_configs[cid] = {
-                        'action': 'LoadRun',
-                        'flavor': legacy_flavor.get(cid, ''),
-                        'presentation_id': global_pid,
-                        'duration': '60'
-                    }
-                    
-            if not client_configs:
+            if not compiled.client_configs:
                 logger.warning(f"No client configs for event {self.last_event_name}")
                 return
                 
-            clients = self.controller.get_configured_clients()
-            if not clients:
+            if not self.controller.get_client_directory():
                 logger.warning("No configured clients to dispatch event to")
                 return
             is_manual = (target_time is None and not is_startup)
-            tasks = []
-            
-            client_map = {}
-            for c in clients:
-                c_id = c.get('id')
-                c_star = c.get('star')
-                if c_id: client_map[c_id] = c
-                if c_star and c_star not in client_map: client_map[c_star] = c
-
-            for key, conf in client_configs.items():
-                target_cid = conf.get('client_id')
-                if not target_cid:
-                    target_cid = key
-                    
-                client = client_map.get(target_cid)
-                if not client:
-                    continue
-
-                tasks.append(self._dispatch_client_action(client, conf, event, target_time, is_manual))
+            tasks = [self._dispatch_client_action(plan, target_time, is_manual) for plan in self._plans_for(compiled)]
                 
             if tasks:
                 await asyncio.gather(*tasks, return_exceptions=True)
@@ -4038,299 +5976,153 @@ class EventSchedulerEngine:
         except Exception as e:
             logger.error(f"Error executing event: {e}")
             
-    async def _dispatch_client_action(self, client: Dict, conf: Dict, event: Dict, target_time: Optional[datetime], is_manual: bool):
-        creds = client.get('credentials', {})
-        cid = client.get('id') or client.get('star')
-        star_type = client.get('star', 'unknown')
-        is_i1 = star_type == 'i1'
-        normalized_star = star_type.removesuffix('xd').removesuffix('jr')
-        protocol = client.get('protocol', 'ssh')
-        hostname = creds.get('hostname')
-        user = creds.get('user')
-        password = creds.get('password')
-        port = creds.get('port', 22)
-        su = creds.get('su', 'dgadmin' if is_i1 else None)
+    async def _dispatch_client_action(self, plan: ActionPlan, target_time: Optional[datetime], is_manual: bool):
+        cid = plan.cid
         use_persistent = provision.get_connection_registry().get_session(cid) is not None
-        action = conf.get('action', 'LoadRun')
-        flavor = conf.get('flavor', '')
-        pres_id = conf.get('presentation_id', '') or event.get('TargetID', '')
-        duration_seconds = int(conf.get('duration', 60)) if str(conf.get('duration', 60)).isdigit() else 60
-        duration_frames = duration_seconds * 30
-        ldl_state = conf.get('ldl_state', '1')
-        cmd = conf.get('command', '') or event.get('CustomCommand', '')
-        separate_load_run = conf.get('separate_load_run', False)
-        load_offset = int(conf.get('load_offset', -20))
-        run_offset = int(conf.get('run_offset', -12))
+        compensate = target_time is not None and not is_manual
 
-        if action == "LoadRun" and target_time and not is_manual and separate_load_run:
-            load_time = target_time + timedelta(seconds=load_offset)
-            run_time = target_time + timedelta(seconds=run_offset)
+        if plan.action == "LoadRun" and compensate and plan.separate_load_run:
+            load_time = target_time + plan.load_offset
+            run_time = target_time + plan.run_offset
             
-            load_details = {
-                "i2": f"load(flavor='{flavor}',presentationId='{pres_id}',duration={duration_frames}) with load_offset={load_offset}, run_offset={run_offset}",
-                "i1": f"flavor='{flavor}'"
-            }.get(normalized_star, '')
-            
-            run_details = {
-                "i2": f"run(presentationId='{pres_id}') with offset {run_offset}",
-                "i1": f"presentationId='{pres_id}'"
-            }.get(normalized_star, '')
-            
-            load_delay = (load_time - datetime.now()).total_seconds()
-            if load_delay > 0:
-                await asyncio.sleep(load_delay)
-            
-            logger.info(f"Dispatching Load to {protocol.upper()} {star_type.upper()} client {cid} with {load_details}")
-            await self._execute_load_action(client, conf, event, flavor, pres_id, duration_frames, is_i1, su, use_persistent)
-            
-            run_delay = (run_time - datetime.now()).total_seconds()
-            if run_delay > 0:
-                await asyncio.sleep(run_delay)
-            
-            logger.info(f"Dispatching Run to {protocol.upper()} {star_type.upper()} client {cid} with {run_details}")
-            await self._execute_run_action(client, conf, event, pres_id, is_i1, su, use_persistent)
+            try:
+                await self._sleep_until(load_time - timedelta(seconds=self.latency.estimate(cid)))
+                logger.info(plan.load_message)
+                rtt = await self._execute_presentation_action(plan, "Load", use_persistent)
+                if rtt is not None:
+                    self.latency.record(cid, rtt)
+
+                await self._sleep_until(run_time - timedelta(seconds=self.latency.estimate(cid)))
+                logger.info(plan.run_message)
+                rtt = await self._execute_presentation_action(plan, "Run", use_persistent)
+                if rtt is not None:
+                    self._record_landing(cid, run_time, rtt)
+            except Exception as e:
+                logger.error(f"Error dispatching split Load/Run to {cid}: {e}", exc_info=True)
             return
         
-        logger.info(f"Dispatching action '{action}' to {protocol.upper()} {star_type.upper()} client {cid}")
+        if compensate:
+            await self._sleep_until(target_time - timedelta(seconds=self.latency.estimate(cid)))
+        logger.info(plan.dispatch_message)
         
         try:
-            if action == "Custom Command":
-                if not cmd:
+            # rtt stays None when nothing is sent, so no-op paths never feed the latency estimate.
+            rtt = None
+            if plan.action == "Custom Command":
+                if not plan.command:
                     logger.warning(f"Empty custom command for client {cid}")
                     return
                 
-                logger.info(f"Dispatching Custom Command to {protocol.upper()} {star_type.upper()} client {cid} with command {cmd[:50]}")
-                res = await self._execute_command(protocol, cid, hostname, user, password, port, cmd, su, use_persistent)
-                self._log_result(cid, res, f"{protocol.upper()} Custom: {cmd[:50]}")
+                logger.info(plan.action_message)
+                send_start = self.clock.monotonic()
+                res = await self._execute_command(plan, plan.command, use_persistent)
+                rtt = self.clock.monotonic() - send_start
+                self._log_result(cid, res, plan.result_label)
             
-            elif action == "Cancel":
-                final_id = pres_id or ('local' if is_i1 else '1')
-                
-                if protocol == 'ssh' and star_type.startswith('i2'):
-                    cancel_cmd = f'"{provision.i2exec}" cancelPres(PresentationId="{final_id}")'
-                    res = await self._execute_command(protocol, cid, hostname, user, password, port, cancel_cmd, su, use_persistent)
-                    self._log_result(cid, res, f"{protocol.upper()} Cancel pres_id={final_id}")
+            elif plan.action == "Cancel":
+                if plan.protocol == 'ssh' and plan.star_type.startswith('i2'):
+                    send_start = self.clock.monotonic()
+                    res = await self._execute_command(plan, plan.command, use_persistent)
+                    rtt = self.clock.monotonic() - send_start
+                    self._log_result(cid, res, plan.result_label)
                 
-                elif protocol == 'subprocess':
-                    res = await provision.subproc_cancel_i2_pres(PresentationId=final_id)
-                    self._log_result(cid, res, f"Subprocess Cancel pres_id={final_id}")
+                elif plan.protocol == 'subprocess':
+                    send_start = self.clock.monotonic()
+                    res = await provision.execute_local_command(plan.command, timeout=15.0)
+                    rtt = self.clock.monotonic() - send_start
+                    self._log_result(cid, res, plan.result_label)
             
-            elif action == "LDL (On/Off)" and is_i1:
-                target_state = int(ldl_state) if str(ldl_state).isdigit() else 1
-                ldl_cmd = f'runomni /twc/util/toggleNationalLDL.pyc {target_state}'
-                
-                logger.info(f"Dispatching LDL command to {protocol.upper()} {star_type.upper()} client {cid} with state={target_state}")
-                res = await self._execute_command(protocol, cid, hostname, user, password, port, ldl_cmd, su, use_persistent)
-                self._log_result(cid, res, f"{protocol.upper()} i1 LDL state={target_state}")
+            elif plan.action == "LDL (On/Off)" and plan.is_i1:
+                logger.info(plan.action_message)
+                send_start = self.clock.monotonic()
+                res = await self._execute_command(plan, plan.command, use_persistent)
+                rtt = self.clock.monotonic() - send_start
+                self._log_result(cid, res, plan.result_label)
             
-            elif action == "LoadRun":
-                load_details = {
-                    "i2": f"load(flavor='{flavor}',presentationId='{pres_id}',duration={duration_frames})",
-                    "i1": f"flavor='{flavor}'"
-                }.get(normalized_star, '')
-                
-                logger.info(f"Dispatching LoadRun to {protocol.upper()} {star_type.upper()} client {cid} with {load_details}")
-                await self._execute_loadrun_action(client, conf, event, flavor, pres_id, duration_frames, is_i1, su, use_persistent)
+            elif plan.action == "LoadRun":
+                logger.info(plan.action_message)
+                rtt = await self._execute_presentation_action(plan, "LoadRun", use_persistent)
+
+            if compensate and rtt is not None:
+                self._record_landing(cid, target_time, rtt)
         
         except Exception as e:
-            logger.error(f"Error dispatching action '{action}' to {cid}: {e}", exc_info=True)
-
-    async def _execute_loadrun_action(self, client, conf, event, flavor, pres_id, duration, is_i1, su, use_persistent):
-        await self._execute_presentation_action(client, conf, event, "LoadRun", flavor, pres_id, duration, is_i1, su, use_persistent)
-
-    async def _execute_load_action(self, client, conf, event, flavor, pres_id, duration, is_i1, su, use_persistent):
-        await self._execute_presentation_action(client, conf, event, "Load", flavor, pres_id, duration, is_i1, su, use_persistent)
-
-    async def _execute_run_action(self, client, conf, event, pres_id, is_i1, su, use_persistent):
-        await self._execute_presentation_action(client, conf, event, "Run", None, pres_id, 0, is_i1, su, use_persistent)
+            logger.error(f"Error dispatching action '{plan.action}' to {cid}: {e}", exc_info=True)
+
+    async def _sleep_until(self, when: datetime):
+        delay = (when - self.clock.now()).total_seconds()
+        if delay > 0:
+            await self.clock.sleep(delay)
+
+    def _record_landing(self, cid: str, target_time: datetime, elapsed: float):
+        """Feed a send's round trip into the latency estimate and note how far it landed from target."""
+        self.latency.record(cid, elapsed)
+        residual = (self.clock.now() - target_time).total_seconds()
+        self.last_event_offsets[cid] = residual
+        self.last_event_offset = residual
+        logger.debug(f"Client {cid} landed {residual:+.3f}s from target (rtt {elapsed:.3f}s, "
+                     f"estimate {self.latency.estimate(cid):.3f}s)")
             
-    async def _execute_command(self, protocol: str, cid: str, hostname: str, 
-                                user: str, password: str, port: int, 
-                                cmd: str, su: str, use_persistent: bool):
-        if protocol == 'ssh':
+    async def _execute_command(self, plan: ActionPlan, cmd: str, use_persistent: bool):
+        if plan.protocol == 'ssh':
             if use_persistent:
-                return await provision.execute_ssh_persistent(cid, cmd, timeout=10.0, use_shell=bool(su))
+                return await provision.execute_ssh_persistent(plan.cid, cmd, timeout=10.0, use_shell=bool(plan.su))
             else:
                 return await provision.execute_ssh_command(
-                    hostname=hostname, user=user, password=password, port=port,
-                    command=cmd, su=su
+                    hostname=plan.hostname, user=plan.user, password=plan.password, port=plan.port,
+                    command=cmd, su=plan.su
                 )
-        elif protocol == 'telnet':
-            telnet_port = int(port) if port else 23
+        elif plan.protocol == 'telnet':
             if use_persistent:
-                return await provision.execute_telnet_persistent(cid, cmd, timeout=10.0)
+                return await provision.execute_telnet_persistent(plan.cid, cmd, timeout=10.0)
             else:
                 return await provision.execute_telnet_command(
-                    hostname=hostname, port=telnet_port, command=cmd
+                    hostname=plan.hostname, port=plan.command_port, command=cmd
                 )
-        elif protocol == 'udp':
-            udp_port = int(port) if port else 7787
-            await provision.execute_udp_message(hostname=hostname, port=udp_port, message=cmd)
+        elif plan.protocol == 'udp':
+            await provision.execute_udp_message(hostname=plan.hostname, port=plan.command_port, message=cmd)
             return ("", "")
         return None
         
-    async def _execute_presentation_action(self, client, conf, event, action, flavor,
-                                            pres_id, duration, is_i1, su, use_persistent):
-        cid = client.get('id') or client.get('star')
-        creds = client.get('credentials', {})
-        hostname = creds.get('hostname')
-        user = creds.get('user')
-        password = creds.get('password')
-        port = creds.get('port', 22)
-        protocol = client.get('protocol', 'ssh')
-        star_type = client.get('star', 'unknown')
-        
-        final_id = pres_id if pres_id else ('local' if is_i1 else '1')
-        
-        if is_i1:
-            if action == "LoadRun":
-                if protocol == 'ssh':
-                    if use_persistent:
-                        load_cmd = f'runomni /twc/util/load.pyc {final_id} {flavor.capitalize()}'
-                        run_cmd = f'runomni /twc/util/run.pyc {final_id}'
-                        res1 = await provision.execute_ssh_persistent(cid, load_cmd, timeout=10.0, use_shell=True)
-                        self._log_result(cid, res1, f"i1 Load {flavor}")
-                        await asyncio.sleep(2)
-                        res = await provision.execute_ssh_persistent(cid, run_cmd, timeout=10.0, use_shell=True)
-                        self._log_result(cid, res, f"i1 Run {final_id}")
-                    else:
-                        res = await provision.ssh_loadrun_i1_pres(
-                            hostname=hostname, user=user, password=password, port=port,
-                            flavor=flavor, PresentationId=final_id, su=su
-                        )
-                        self._log_result(cid, res, f"i1 LoadRun {flavor}")
-                elif protocol == 'telnet':
-                    res = await provision.telnet_loadrun_i1_pres(
-                        hostname=hostname, port=port,
-                        flavor=flavor, PresentationId=final_id, su=su,
-                        user=user, password=password
-                    )
-                    self._log_result(cid, res, f"i1 Telnet LoadRun {flavor}")
-            elif action == "Load":
-                if protocol == 'ssh':
-                    if use_persistent:
-                        load_cmd = f'runomni /twc/util/load.pyc {final_id} {flavor.capitalize()}'
-                        res = await provision.execute_ssh_persistent(cid, load_cmd, timeout=10.0, use_shell=True)
-                    else:
-                        res = await provision.ssh_load_i1_pres(
-                            hostname=hostname, user=user, password=password, port=port,
-                            flavor=flavor, PresentationId=final_id, su=su
-                        )
-                    self._log_result(cid, res, f"i1 Load {flavor}")
-                elif protocol == 'telnet':
-                    res = await provision.telnet_load_i1_pres(
-                        hostname=hostname, port=port,
-                        flavor=flavor, PresentationId=final_id, su=su,
-                        user=user, password=password
-                    )
-                    self._log_result(cid, res, f"i1 Telnet Load {flavor}")
-            elif action == "Run":
-                if protocol == 'ssh':
-                    if use_persistent:
-                        run_cmd = f'runomni /twc/util/run.pyc {final_id}'
-                        res = await provision.execute_ssh_persistent(cid, run_cmd, timeout=10.0, use_shell=True)
-                    else:
-                        res = await provision.ssh_run_i1_pres(
-                            hostname=hostname, user=user, password=password, port=port,
-                            PresentationId=final_id, su=su
-                        )
-                    self._log_result(cid, res, f"i1 Run {final_id}")
-                elif protocol == 'telnet':
-                    res = await provision.telnet_run_i1_pres(
-                        hostname=hostname, port=port,
-                        PresentationId=final_id, su=su,
-                        user=user, password=password
-                    )
-                    self._log_result(cid, res, f"i1 Telnet Run {final_id}")
-        else:
-            if action == "LoadRun":
-                if protocol == 'ssh':
-                    if use_persistent:
-                        i2_cmd = f'"{provision.i2exec}" loadRunPres(Flavor="{flavor}",Duration={duration},PresentationId="{final_id}")'
-                        res = await provision.execute_ssh_persistent(cid, i2_cmd, timeout=10.0, use_shell=False)
-                    else:
-                        res = await provision.ssh_loadrun_i2_pres(
-                            hostname=hostname, user=user, password=password, port=port,
-                            flavor=flavor, PresentationId=final_id, duration=duration, su=su
-                        )
-                    self._log_result(cid, res, f"i2 LoadRun flavor={flavor} pres={final_id} dur={duration}")
-                elif protocol == 'subprocess':
-                    res = await provision.subproc_loadrun_i2_pres(
-                        flavor=flavor, PresentationId=final_id, duration=duration
-                    )
-                    self._log_result(cid, res, f"i2 Subprocess LoadRun flavor={flavor} pres={final_id}")
-                elif protocol == 'telnet':
-                    res = await provision.telnet_loadrun_i2_pres(
-                        hostname=hostname, port=port,
-                        flavor=flavor, PresentationId=final_id, duration=duration,
-                        user=user, password=password
-                    )
-                    self._log_result(cid, res, f"i2 Telnet LoadRun flavor={flavor} pres={final_id}")
-                elif protocol == 'udp':
-                    udp_port = port if port else 7787
-                    await provision.udp_loadrun_i2_pres(
-                        hostname=hostname, port=udp_port,
-                        flavor=flavor, PresentationId=final_id, duration=duration
-                    )
-                    self._log_result(cid, None, f"i2 UDP LoadRun flavor={flavor} pres={final_id}")
-            elif action == "Load":
-                if protocol == 'ssh':
-                    if use_persistent:
-                        i2_cmd = f'"{provision.i2exec}" loadPres(Flavor="{flavor}",Duration={duration},PresentationId="{final_id}")'
-                        res = await provision.execute_ssh_persistent(cid, i2_cmd, timeout=10.0, use_shell=False)
-                    else:
-                        res = await provision.ssh_load_i2_pres(
-                            hostname=hostname, user=user, password=password, port=port,
-                            flavor=flavor, PresentationId=final_id, duration=duration, su=su
-                        )
-                    self._log_result(cid, res, f"i2 Load flavor={flavor} pres={final_id}")
-                elif protocol == 'subprocess':
-                    res = await provision.subproc_load_i2_pres(
-                        flavor=flavor, PresentationId=final_id, duration=duration
-                    )
-                    self._log_result(cid, res, f"i2 Subprocess Load flavor={flavor} pres={final_id}")
-                elif protocol == 'telnet':
-                    res = await provision.telnet_load_i2_pres(
-                        hostname=hostname, port=port,
-                        flavor=flavor, PresentationId=final_id, duration=duration,
-                        user=user, password=password
-                    )
-                    self._log_result(cid, res, f"i2 Telnet Load flavor={flavor} pres={final_id}")
-                elif protocol == 'udp':
-                    udp_port = port if port else 7787
-                    await provision.udp_load_i2_pres(
-                        hostname=hostname, port=udp_port,
-                        flavor=flavor, PresentationId=final_id, duration=duration
-                    )
-                    self._log_result(cid, None, f"i2 UDP Load flavor={flavor} pres={final_id}")
-            elif action == "Run":
-                if protocol == 'ssh':
-                    if use_persistent:
-                        i2_cmd = f'"{provision.i2exec}" runPres(PresentationId="{final_id}")'
-                        res = await provision.execute_ssh_persistent(cid, i2_cmd, timeout=10.0, use_shell=False)
-                    else:
-                        res = await provision.ssh_run_i2_pres(
-                            hostname=hostname, user=user, password=password, port=port,
-                            PresentationId=final_id, su=su
-                        )
-                    self._log_result(cid, res, f"i2 Run pres={final_id}")
-                elif protocol == 'subprocess':
-                    res = await provision.subproc_run_i2_pres(PresentationId=final_id)
-                    self._log_result(cid, res, f"i2 Subprocess Run pres={final_id}")
-                elif protocol == 'telnet':
-                    res = await provision.telnet_run_i2_pres(
-                        hostname=hostname, port=port,
-                        PresentationId=final_id,
-                        user=user, password=password
-                    )
-                    self._log_result(cid, res, f"i2 Telnet Run pres={final_id}")
-                elif protocol == 'udp':
-                    udp_port = port if port else 7787
-                    await provision.udp_run_i2_pres(
-                        hostname=hostname, port=udp_port,
-                        PresentationId=final_id
-                    )
-                    self._log_result(cid, None, f"i2 UDP Run pres={final_id}")
+    async def _execute_presentation_action(self, plan: ActionPlan, action: str, use_persistent: bool) -> Optional[float]:
+        """Send a presentation action; returns the round trip of the send that lands it, or None if nothing went out.
+
+        The plan's pre-rendered steps are sent in order with the i1/i2 two-second
+        pause between a Load and its Run; only the last send is timed.
+        """
+        persistent = use_persistent and plan.protocol == 'ssh'
+        steps = (plan.persistent_steps if persistent else plan.steps).get(action)
+        if not steps:
+            return None
+        send_start = self.clock.monotonic()
+        for i, (command, label) in enumerate(steps):
+            if i:
+                await asyncio.sleep(2)
+                send_start = self.clock.monotonic()
+            if persistent:
+                res = await provision.execute_ssh_persistent(plan.cid, command, timeout=10.0, use_shell=plan.is_i1)
+            else:
+                res = await self._send_oneshot(plan, command)
+            self._log_result(plan.cid, res, label)
+        return self.clock.monotonic() - send_start
+
+    async def _send_oneshot(self, plan: ActionPlan, command: str):
+        """Send one pre-rendered command over the plan's transport without a persistent session."""
+        if plan.protocol == 'ssh':
+            return await provision.execute_ssh_command(
+                hostname=plan.hostname, user=plan.user, password=plan.password, port=plan.port,
+                command=command, su=plan.su
+            )
+        if plan.protocol == 'telnet':
+            return await provision.execute_telnet_command(
+                hostname=plan.hostname, port=plan.command_port, command=command,
+                su=plan.su, user=plan.user, password=plan.password
+            )
+        if plan.protocol == 'subprocess':
+            return await provision.execute_local_command(command, timeout=15.0)
+        if plan.protocol == 'udp':
+            return await provision.execute_udp_message(hostname=plan.hostname, port=plan.command_port, message=command)
+        return None
                 
     def _log_result(self, client_id: str, res, command_info: str):
         if hasattr(self.controller, 'client_manager'):
@@ -4370,21 +6162,26 @@ class EventSchedulerEngine:
         next_run = None
         next_name = None
         
+        next_job = None
+        
         for job in jobs:
-            if job.id.startswith('event_') and job.id != 'timetable_watcher':
+            if job.id.startswith('event_'):
                 if job.next_run_time:
                     if next_run is None or job.next_run_time < next_run:
                         next_run = job.next_run_time
-                        next_name = job.id.replace('event_', '')
+                        next_name = job.name
+                        next_job = job
                         
         if next_run:
-            actual_time = next_run.replace(second=0, microsecond=0) + timedelta(minutes=1)
+            actual_time = next_run.replace(microsecond=0) + getattr(next_job.trigger, 'lead', timedelta(minutes=1))
 
             if hasattr(actual_time, 'tzinfo') and actual_time.tzinfo is not None:
                 actual_time = actual_time.replace(tzinfo=None)
+            if next_job.id == WAVE_JOB_ID:
+                next_name = ", ".join(e.name or 'Unknown' for e in self._wave_members(actual_time)[1])
             
             self.next_event_dt = actual_time
-            self.next_event_time = actual_time.strftime("%a %I:%M %p")
+            self.next_event_time = actual_time.strftime("%a %I:%M:%S %p" if actual_time.second else "%a %I:%M %p")
             self.next_event_name = next_name or "Unknown"
         else:
             self.next_event_dt = None
@@ -4392,10 +6189,59 @@ class EventSchedulerEngine:
             self.next_event_name = "None"
             
     def _on_job_event(self, event: JobExecutionEvent):
-        if event.exception:
+        if event.code == EVENT_JOB_MISSED:
+            self._on_job_missed(event)
+        elif event.exception:
             logger.error(f"Job {event.job_id} failed: {event.exception}")
         elif hasattr(event, 'retval'):
             logger.debug(f"Job {event.job_id} completed successfully")
+
+    def _on_job_missed(self, event: JobExecutionEvent):
+        job = self._scheduler.get_job(event.job_id) if self._scheduler else None
+        if job is None or not event.scheduled_run_time:
+            logger.warning(f"Job {event.job_id} missed its run time")
+            return
+        lead = getattr(job.trigger, 'lead', timedelta(minutes=1))
+        target_time = (event.scheduled_run_time + lead).replace(tzinfo=None)
+        if job.id == WAVE_JOB_ID:
+            events = self._wave_members(target_time)[1]
+        else:
+            events = list(job.args[:1])
+        now = self.clock.now()
+        for compiled in events:
+            logger.warning(f"Missed '{compiled.name}' due at {target_time:%I:%M:%S %p} (catch-up: {compiled.catch_up})")
+            self.journal.record('missed', compiled.name, target_time)
+            if compiled.catch_up != 'skip' and now - target_time <= compiled.catch_up_window:
+                self._dispatch_catch_up(compiled, [target_time])
+
+    def _catch_up_missed(self, since: Optional[datetime]):
+        """Apply each event's catch-up policy to the firings due while the engine was down."""
+        if since is None:
+            return
+        now = self.clock.now()
+        for event in self.grab_compiled_events():
+            if not event.enabled or event.catch_up == 'skip':
+                continue
+            window_start = max(since, now - event.catch_up_window) + timedelta(microseconds=1)
+            missed = list(event.iter_targets(window_start, now + event.lead))
+            if not missed:
+                continue
+            if event.catch_up == 'latest':
+                missed = missed[-1:]
+            logger.info(f"Catching up {len(missed)} missed firing(s) of '{event.name}' since {since:%Y-%m-%d %I:%M:%S %p}")
+            self._dispatch_catch_up(event, missed)
+
+    def _dispatch_catch_up(self, event: CompiledEvent, targets: List[datetime]):
+        async def run_in_order():
+            for intended in targets:
+                now = self.clock.now()
+                self.journal.record('catchup', event.name, intended, now)
+                await self._execute_event(event, target_time=max(intended, now), is_startup=True)
+
+        if self._loop and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(run_in_order(), self._loop)
+        else:
+            logger.warning("Event loop not running, cannot catch up missed events")
             
     @property
     def loop(self) -> Optional[asyncio.AbstractEventLoop]:
@@ -4406,139 +6252,194 @@ class EventSchedulerEngine:
         await self._execute_event(event_data, target_time=target_time, is_startup=False)
     
     def grab_all_events(self) -> List[Dict]:
-        with self._cache_lock:
-            return list(self._cached_events)
+        return [c.data for c in self.catalog.all()]
+
+    def grab_compiled_events(self) -> List[CompiledEvent]:
+        return self.catalog.all()
+
+    def get_event(self, display_name: str) -> Optional[CompiledEvent]:
+        return self.catalog.get(display_name)
+
+    def build_schedule_matrix(self, day=None, clients: Optional[List[Dict]] = None, enabled_only: bool = True) -> ScheduleMatrix:
+        if day is None:
+            day = datetime.now().date()
+        if clients is None:
+            clients = self.controller.get_configured_clients()
+        return ScheduleMatrix(self.grab_compiled_events(), clients, day, enabled_only=enabled_only)
+
+    def iter_horizon(self, start: Optional[datetime] = None, hours: float = 24,
+                     enabled_only: bool = True) -> Iterator[tuple]:
+        """Upcoming (fire_time, event, client, action) tuples over the next `hours`, in time order.
+
+        Each event contributes its own ordered stream of firing times and the
+        streams are heap-merged, so cost scales with the number of firings
+        rather than the number of minutes in the horizon.
+        """
+        start = start or self.clock.now()
+        end = start + timedelta(hours=hours)
+        events = [e for e in self.grab_compiled_events() if e.enabled or not enabled_only]
+        clients = self.controller.get_client_directory()
+        streams = [
+            ((t, idx) for t in event.iter_targets(start, end))
+            for idx, event in enumerate(events)
+        ]
+        for fire_time, idx in heapq.merge(*streams):
+            event = events[idx]
+            for key, conf in event.client_configs:
+                client = clients.get(conf['client_id'])
+                if client is not None:
+                    yield fire_time, event, client, conf.get('action', 'LoadRun')
+
+    def _compiled_for(self, event) -> CompiledEvent:
+        if isinstance(event, CompiledEvent):
+            return event
+        compiled = self.catalog.get(event.get('DisplayName', ''))
+        if compiled is not None and compiled.data is event:
+            return compiled
+        return CompiledEvent(event)
             
-    def write_event(self, event_data: Dict):
+    def write_event(self, event_data: Dict) -> bool:
         try:
-            if os.path.exists(self.timetable_file):
-                tree = ET.parse(self.timetable_file)
-                root = tree.getroot()
-            else:
-                root = ET.Element('timetable')
-                tree = ET.ElementTree(root)
-
-            display_name = event_data.get('DisplayName', '')
-            existing = None
-            for ev in root.findall('event'):
-                dn = ev.find('DisplayName')
-                if dn is not None and dn.text == display_name:
-                    existing = ev
-                    break
-                    
-            if existing is not None:
-                root.remove(existing)
-            new_elem = ET.SubElement(root, 'event')
-            self._populate_event_element(new_elem, event_data)
-            self._indent(root)
-            tree.write(self.timetable_file, encoding='unicode', xml_declaration=True)
-            self._reload_events()
-            self._schedule_all_events()
+            compiled = CompiledEvent(event_data)
+            self.catalog.upsert(compiled)
+            if self._store is not None:
+                self._store.upsert(compiled)
+            self._timetable_changed([compiled.name])
+            return True
             
         except Exception as e:
             logger.error(f"Error writing event: {e}")
-            
-    def delete_event(self, display_name: str) -> bool:
-        try:
-            if not os.path.exists(self.timetable_file):
-                return False
-                
-            tree = ET.parse(self.timetable_file)
-            root = tree.getroot()
-            
-            for ev in root.findall('event'):
-                dn = ev.find('DisplayName')
-                if dn is not None and dn.text == display_name:
-                    root.remove(ev)
-                    self._indent(root)
-                    tree.write(self.timetable_file, encoding='unicode', xml_declaration=True)
-                    
-                    self._reload_events()
-                    self._schedule_all_events()
-                    return True
-                    
             return False
             
-        except Exception as e:
-            logger.error(f"Error deleting event: {e}")
+    def delete_event(self, display_name: str) -> bool:
+        if self.catalog.remove(display_name) is None:
             return False
+        if self._store is not None:
+            self._store.delete(display_name)
+        self._timetable_changed([display_name])
+        return True
             
     def edit_event(self, old_display_name: str, new_event_data: Dict) -> bool:
         try:
-            if not os.path.exists(self.timetable_file):
+            compiled = CompiledEvent(new_event_data)
+            if not self.catalog.upsert(compiled, old_name=old_display_name):
                 return False
-                
-            tree = ET.parse(self.timetable_file)
-            root = tree.getroot()
-            
-            for ev in root.findall('event'):
-                dn = ev.find('DisplayName')
-                if dn is not None and dn.text == old_display_name:
-                    root.remove(ev)
-                    new_elem = ET.SubElement(root, 'event')
-                    self._populate_event_element(new_elem, new_event_data)
-                    
-                    self._indent(root)
-                    tree.write(self.timetable_file, encoding='unicode', xml_declaration=True)
-                    
-                    self._reload_events()
-                    self._schedule_all_events()
-                    return True
-                    
-            return False
+            if self._store is not None:
+                self._store.upsert(compiled, old_name=old_display_name)
+            self._timetable_changed(list(dict.fromkeys([old_display_name, compiled.name])))
+            return True
             
         except Exception as e:
             logger.error(f"Error editing event: {e}")
             return False
+
+    def _timetable_changed(self, names: Optional[List[str]] = None):
+        """Propagate an in-memory edit: reindex, reschedule the diff and queue an XML write.
+
+        names limits the work to the events an edit touched; without it the
+        whole timetable is diffed, as after an import.
+        """
+        compiled = self.grab_compiled_events() if names is None else self.catalog.resolve(names)
+        self._sync_playout_index(compiled, names)
+        self._prepare_action_plans(compiled, names)
+        self._schedule_all_events(names)
+        if self._store is None:
+            self._timetable_writer.mark_dirty()
+
+    def _render_timetable(self) -> str:
+        with self._journal_lock:
+            self._rendered_events = self.grab_compiled_events()
+            self._journal_mark = self.change_journal.offset
+        buf = StringIO()
+        self._write_timetable_xml(buf, self._rendered_events)
+        return buf.getvalue()
+
+    def _write_timetable_xml(self, out, events: List[CompiledEvent]):
+        """Serialize events one element at a time, in the same layout as an indented ElementTree."""
+        out.write("<?xml version='1.0' encoding='utf-8'?>\n")
+        if not events:
+            out.write("<timetable />\n")
+            return
+        out.write("<timetable>")
+        for event in events:
+            elem = ET.Element('event')
+            self._populate_event_element(elem, event.data)
+            self._indent(elem, 1)
+            elem.tail = None
+            out.write("\n    ")
+            out.write(ET.tostring(elem, encoding='unicode'))
+        out.write("\n</timetable>\n")
+
+    def import_timetable(self, path: str, merge: bool = False) -> int:
+        """Stream events from an XML timetable and apply them as a single batch.
+
+        The file is read with iterparse and each event is validated as it
+        arrives; if any is invalid nothing is applied and TimetableImportError
+        lists them all. Otherwise the timetable is replaced (or, with merge,
+        upserted by DisplayName) in one step, followed by one reindex, one
+        incremental reschedule and one write.
+        """
+        imported: Dict[str, CompiledEvent] = {}
+        seen = set()
+        errors: List[str] = []
+        root = None
+        depth = 0
+        position = 0
+        for kind, elem in ET.iterparse(path, events=('start', 'end')):
+            if kind == 'start':
+                depth += 1
+                if root is None:
+                    root = elem
+                continue
+            depth -= 1
+            if depth != 1 or elem.tag != 'event':
+                continue
+            position += 1
+            event = self._parse_event_element(elem)
+            root.clear()
+            name = event.get('DisplayName', '')
+            problems = validate_event(event)
+            if name in seen:
+                problems.append("duplicate DisplayName")
+            seen.add(name)
+            if problems:
+                errors.append(f"event #{position} '{name}': {', '.join(problems)}")
+            elif not errors:
+                imported[name] = CompiledEvent(event)
+        if errors:
+            raise TimetableImportError(errors)
+
+        self.catalog.apply(imported.values(), replace=not merge)
+        if self._store is not None:
+            self._store.apply_batch(imported.values(), replace=not merge)
+        self._timetable_changed()
+        logger.info(f"Imported {len(imported)} events from {path} ({'merged' if merge else 'replaced timetable'})")
+        return len(imported)
+
+    def export_timetable(self, path: str) -> int:
+        """Stream the current timetable to an XML file, swapped in with temp-file-plus-rename."""
+        events = self.grab_compiled_events()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            self._write_timetable_xml(f, events)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return len(events)
             
-    def does_event_match_time(self, event: Dict, target_time: datetime) -> bool:
-        if not event.get('Enabled', False):
-            return False
-        event_days = event.get('Days', [])
-        if event_days and target_time.strftime("%A") not in event_days:
-            return False
-        event_months = event.get('Months', [])
-        if event_months and str(target_time.month) not in event_months:
-            return False
-        event_weeks = event.get('Weeks', [])
-        if event_weeks:
-            week_num = (target_time.day - 1) // 7 + 1
-            if str(week_num) not in event_weeks:
-                return False
-        event_hours = event.get('Hours', [])
-        if event_hours:
-            match_hour = False
-            for h_rule in event_hours:
-                try:
-                    rule_h = int(h_rule.get('hour', 0))
-                    rule_p = h_rule.get('period', 'AM')
-                    
-                    if rule_p == 'PM' and rule_h != 12:
-                        rule_h += 12
-                    elif rule_p == 'AM' and rule_h == 12:
-                        rule_h = 0
-                        
-                    if rule_h == target_time.hour:
-                        match_hour = True
-                        break
-                except ValueError:
-                    continue
-                    
-            if not match_hour:
-                return False
-        tm_vals = event.get('TenMinuteInterval', [])
-        m_val_str = str(event.get('MinuteInterval', '')).strip()
-        m_val = int(m_val_str) if m_val_str and m_val_str.isdigit() else 0
-        bases = [int(x) for x in tm_vals if x.isdigit()] if tm_vals else [0]
-        allowed_minutes = [(b + m_val) % 60 for b in bases]
-        if target_time.minute not in allowed_minutes:
-            return False
-        return True
+    def _on_timetable_written(self):
+        self._snapshot.save(self.timetable_file, self._rendered_events)
+        self.change_journal.compact(self._journal_mark)
+
+    def does_event_match_time(self, event, target_time: datetime) -> bool:
+        return self._compiled_for(event).matches(target_time)
         
     def _populate_event_element(self, event_elem, event_data):
         for key in ['DisplayName', 'Category', 'TargetID', 'CustomCommand', 'MinuteInterval']:
             sub = ET.SubElement(event_elem, key)
             sub.text = str(event_data.get(key, ''))
+        second_elem = ET.SubElement(event_elem, 'Second')
+        second_elem.text = str(_int_or_none(event_data.get('Second', 0)) or 0)
         tm = ET.SubElement(event_elem, 'TenMinuteInterval')
         for val in event_data.get('TenMinuteInterval', []):
             s = ET.SubElement(tm, 'TenMinute')
@@ -4564,6 +6465,10 @@ class EventSchedulerEngine:
         ras_elem.text = str(event_data.get('RunAtStartup', False))
         en_elem = ET.SubElement(event_elem, 'Enabled')
         en_elem.text = str(event_data.get('Enabled', True))
+        cu_elem = ET.SubElement(event_elem, 'CatchUp')
+        cu_elem.text = str(event_data.get('CatchUp', 'skip') or 'skip')
+        cuw_elem = ET.SubElement(event_elem, 'CatchUpWindow')
+        cuw_elem.text = str(_int_or_none(event_data.get('CatchUpWindow', '')) or DEFAULT_CATCH_UP_WINDOW)
         cc_container = ET.SubElement(event_elem, 'ClientConfigs')
         c_configs = event_data.get('client_config', {})
         for cid, config in c_configs.items():
@@ -4588,7 +6493,8 @@ class EventSchedulerEngine:
             for key, tag in tag_map.items():
                 default = 'LoadRun' if key == 'action' else ''
                 elem = ET.SubElement(cc, tag)
-                elem.text = str(config.get(key, default))
+                value = config.get(key, default)
+                elem.text = '' if value is None else str(value)
             
             sep_elem = ET.SubElement(cc, 'SeparateLoadRun')
             sep_elem.text = str(config.get('separate_load_run', False))
@@ -4625,6 +6531,41 @@ class EventSchedulerEngine:
                 elem.tail = i
 
 
+def benchmark_startup(count: int = 5000) -> Dict[str, float]:
+    """Time a cold (XML parse) and a warm (snapshot) timetable load of `count` synthetic events."""
+    import tempfile
+    engine = EventSchedulerEngine(None)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine.timetable_file = os.path.join(tmp, "timetable.xml")
+        engine._snapshot = TimetableSnapshotCache(os.path.join(tmp, ".timetable.snapshot"))
+        root = ET.Element('timetable')
+        for i in range(count):
+            engine._populate_event_element(ET.SubElement(root, 'event'), {
+                'DisplayName': f"Benchmark {i}",
+                'Category': 'Cue Presentation',
+                'TenMinuteInterval': [str(i % 6 * 10)],
+                'MinuteInterval': str(i % 10),
+                'Hours': [{'hour': str(i % 12 + 1), 'period': 'AM/PM'}],
+                'Days': WEEKDAY_NAMES[:i % 7 + 1],
+                'Enabled': True,
+                'client_config': {
+                    f"client_{c}": {'client_id': f"client_{c}", 'action': 'LoadRun', 'flavor': 'domestic/V',
+                                    'presentation_id': '1', 'duration': '60'}
+                    for c in range(i % 3 + 1)
+                },
+            })
+        engine._indent(root)
+        ET.ElementTree(root).write(engine.timetable_file, encoding='unicode', xml_declaration=True)
+
+        results = {}
+        for label in ('cold', 'warm'):
+            start = time.perf_counter()
+            engine._reload_events()
+            results[label] = time.perf_counter() - start
+        results['events'] = len(engine.grab_compiled_events())
+    return results
+
+
 if __name__ == "__main__":
     controller = star_controller()
     parser = argparse.ArgumentParser(description="StarScheduler Application")
@@ -4632,6 +6573,11 @@ if __name__ == "__main__":
     parser.add_argument('-t', '--test-outputs', action='store_true', help='Test connection to all output clients and exit.')
     parser.add_argument('-s', '--say-something', action='store_true', help='Say something dumb, play Russian Roulette, and exit.')
     parser.add_argument('-q', '--force-qt5-compat', action='store_true', help='Force Qt5 compatibility mode.')
+    parser.add_argument('-H', '--horizon', type=float, metavar='HOURS', help='Print every firing in the next HOURS hours and exit.')
+    parser.add_argument('--import-timetable', metavar='PATH', help='Validate and import an XML timetable in one batch, then exit.')
+    parser.add_argument('--merge', action='store_true', help='With --import-timetable, upsert events by name instead of replacing the timetable.')
+    parser.add_argument('--export-timetable', metavar='PATH', help='Write the current timetable to PATH as XML and exit.')
+    parser.add_argument('--benchmark-startup', type=int, nargs='?', const=5000, metavar='EVENTS', help='Time cold vs. snapshot timetable loading for EVENTS synthetic events (default 5000) and exit.')
     args = parser.parse_args()
 
     if args.force_qt5_compat:
@@ -4649,6 +6595,40 @@ if __name__ == "__main__":
         asyncio.run(controller.get_all_output_clients())
         sys.exit(0)
 
+    if args.import_timetable or args.export_timetable:
+        engine = EventSchedulerEngine(controller)
+        engine._reload_events()
+        if args.import_timetable:
+            try:
+                count = engine.import_timetable(args.import_timetable, merge=args.merge)
+            except (TimetableImportError, ET.ParseError, OSError) as e:
+                for line in getattr(e, 'errors', [str(e)]):
+                    print(line)
+                sys.exit(1)
+            engine._timetable_writer.flush()
+            print(f"Imported {count} events from {args.import_timetable}")
+        if args.export_timetable:
+            count = engine.export_timetable(args.export_timetable)
+            print(f"Exported {count} events to {args.export_timetable}")
+        sys.exit(0)
+
+    if args.benchmark_startup:
+        results = benchmark_startup(args.benchmark_startup)
+        print(f"{results['events']} events: cold load {results['cold'] * 1000:.1f} ms, "
+              f"warm load {results['warm'] * 1000:.1f} ms ({results['cold'] / max(results['warm'], 1e-9):.1f}x)")
+        sys.exit(0)
+
+    if args.horizon is not None:
+        engine = EventSchedulerEngine(controller)
+        engine._reload_events()
+        count = 0
+        for fire_time, event, client, action in engine.iter_horizon(hours=args.horizon):
+            client_name = client.get('displayName') or client.get('id') or client.get('star')
+            print(f"{fire_time:%Y-%m-%d %H:%M:%S}  {event.name:<30}  {client_name:<24}  {action}")
+            count += 1
+        print(f"{count} firings in the next {args.horizon:g} hours")
+        sys.exit(0)
+
     if args.say_something:
         random_dumbass_phrases_lol = [
             "hi",
@@ -4773,10 +6753,9 @@ if __name__ == "__main__":
             asyncio.set_event_loop(loop)
             try:
                 tasks = []
+                clients = controller.get_client_directory()
                 for client_info in connected_outputs_data:
-                    hostname = client_info.get("hostname")
-                    found_client = next((c for c in controller.get_configured_clients() 
-                                       if c.get('credentials', {}).get('hostname') == hostname), None)
+                    found_client = clients.by_hostname(client_info.get("hostname"))
                     if found_client:
                         tasks.append(_shutdown_client_task_async(found_client))
                 
@@ -12,33 +12,38 @@ import subprocess
 import uuid
 import threading
 import atexit
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 
+try:
+    import asyncssh
+except ImportError:
+    asyncssh = None
+
 logger = logging.getLogger("starscheduler.provision")
 
 i2exec = "C:\\Program Files (x86)\\TWC\\I2\\exec.exe"
 
+EXECUTOR_THREAD_CEILING = 64
+
 def _get_optimal_thread_count(max_threads: int = 4) -> int:
-    """Calculate optimal thread count based on CPU cores and config limit.
-    Uses minimal allocation for I/O-bound work.
+    """Calculate the worker count from SSH channel demand: every host can fill its channel slots.
+    max_threads (maxThreads) is the floor kept for telnet, UDP and subprocess work;
+    the work is I/O-bound, so only EXECUTOR_THREAD_CEILING bounds it.
     """
-    try:
-        cpu_count = os.cpu_count() or 2
-        optimal = min(cpu_count, max_threads, 4)
-        return max(1, optimal)
-    except Exception:
-        return 2
+    demand = _ssh_channels_per_host * len(_ssh_backends)
+    return max(1, min(EXECUTOR_THREAD_CEILING, max(int(max_threads), demand)))
 
 _executor: Optional[ThreadPoolExecutor] = None
 _executor_max_workers: int = 4
+_executor_workers: int = 0
 
 def _get_executor() -> ThreadPoolExecutor:
     """Get or create the shared thread pool executor (lazy initialization)."""
-    global _executor
+    global _executor, _executor_workers
     if _executor is None:
-        worker_count = _get_optimal_thread_count(_executor_max_workers)
+        worker_count = _executor_workers = _get_optimal_thread_count(_executor_max_workers)
         _executor = ThreadPoolExecutor(
             max_workers=worker_count,
             thread_name_prefix="provision_worker"
@@ -46,11 +51,16 @@ def _get_executor() -> ThreadPoolExecutor:
         logger.info(f"Initialized provision executor with {worker_count} workers")
     return _executor
 
-def configure_executor(max_threads: int = 16) -> None:
+def configure_executor(max_threads: int = 4) -> None:
     """Configure the executor max threads before first use."""
-    global _executor_max_workers, _executor
+    global _executor_max_workers
     _executor_max_workers = max_threads
-    if _executor is not None:
+    _resize_executor()
+
+def _resize_executor() -> None:
+    """Replace a running executor whose worker count no longer matches the SSH host and channel settings."""
+    global _executor
+    if _executor is not None and _executor_workers != _get_optimal_thread_count(_executor_max_workers):
         _executor.shutdown(wait=False)
         _executor = None
         _get_executor()
@@ -59,6 +69,156 @@ def generate_session_uuid() -> str:
     """Generate a 16-character hex UUID for session identification."""
     return uuid.uuid4().hex[:16]
 
+SSH_BACKENDS = ('paramiko', 'asyncssh')
+_ssh_backends: Dict[Tuple[Any, int], str] = {}
+
+def _ssh_host_key(hostname: Any, port: Any) -> Tuple[Any, int]:
+    try:
+        return hostname, int(port or 22)
+    except (TypeError, ValueError):
+        return hostname, 22
+
+def client_ssh_backend(client: dict) -> str:
+    """SSH backend a client is configured for (`sshBackend`), falling back to paramiko."""
+    backend = client.get('sshBackend') or 'paramiko'
+    if backend not in SSH_BACKENDS:
+        logger.warning(f"Unknown sshBackend '{backend}' for client {client.get('id')}, using paramiko")
+        return 'paramiko'
+    if backend == 'asyncssh' and asyncssh is None:
+        logger.warning(f"asyncssh is not installed; client {client.get('id')} uses paramiko")
+        return 'paramiko'
+    return backend
+
+def configure_ssh_backends(clients: list) -> None:
+    """Record which SSH backend each configured host uses, for the one-shot helpers."""
+    backends = {}
+    for client in clients:
+        if client.get('protocol', 'ssh') != 'ssh':
+            continue
+        creds = client.get('credentials') or {}
+        backends[_ssh_host_key(creds.get('hostname'), creds.get('port', 22))] = client_ssh_backend(client)
+    _ssh_backends.clear()
+    _ssh_backends.update(backends)
+    _resize_executor()
+
+def ssh_backend_for(hostname: str, port: int) -> str:
+    return _ssh_backends.get(_ssh_host_key(hostname, port), 'paramiko')
+
+_ssh_channels_per_host: int = 4
+_channel_slots: Dict[Tuple[Any, int], threading.BoundedSemaphore] = {}
+_async_channel_slots: Dict[Tuple[Any, int], asyncio.Semaphore] = {}
+_channel_slots_lock = threading.Lock()
+
+def configure_ssh_channels(per_host: int = 4) -> None:
+    """Set how many exec channels may run at once on each host's persistent SSH transport."""
+    global _ssh_channels_per_host
+    per_host = max(1, int(per_host))
+    with _channel_slots_lock:
+        if per_host != _ssh_channels_per_host:
+            _ssh_channels_per_host = per_host
+            _channel_slots.clear()
+            _async_channel_slots.clear()
+    _resize_executor()
+
+def _host_channel_slots(hostname: Any, port: Any) -> threading.BoundedSemaphore:
+    key = _ssh_host_key(hostname, port)
+    with _channel_slots_lock:
+        slots = _channel_slots.get(key)
+        if slots is None:
+            slots = _channel_slots[key] = threading.BoundedSemaphore(_ssh_channels_per_host)
+        return slots
+
+def _async_host_channel_slots(hostname: Any, port: Any) -> asyncio.Semaphore:
+    key = _ssh_host_key(hostname, port)
+    with _channel_slots_lock:
+        slots = _async_channel_slots.get(key)
+        if slots is None:
+            slots = _async_channel_slots[key] = asyncio.Semaphore(_ssh_channels_per_host)
+        return slots
+
+def _sentinel_command(command: str) -> Tuple[bytes, Any, bytes]:
+    """Wrap a shell command between `__SS_<uuid>_B` and `__SS_<uuid>_E<exit status>` marker lines.
+    
+    The markers are assembled by printf, so they never appear literally in the
+    terminal's echo of the typed line, even when the echo wraps.
+    """
+    tag = f"__SS_{uuid.uuid4().hex}".encode()
+    done = re.compile(re.escape(tag) + rb"_E(\d+)")
+    wire = f"printf '%s_B\\n' {tag.decode()}; {command}; printf '%s_E%d\\n' {tag.decode()} $?\n"
+    return tag, done, wire.encode("utf-8", errors="replace")
+
+def _sentinel_output(buf: bytes, tag: bytes, match) -> str:
+    """Output between the begin marker line and the end marker."""
+    begin_at = buf.find(tag + b"_B")
+    start = buf.find(b"\n", begin_at) + 1 if begin_at >= 0 else 0
+    end = match.start() if match else len(buf)
+    return bytes(buf[start:max(start, end)]).decode('utf-8', errors='replace')
+
+def _run_in_shell(shell, command: str, timeout: float) -> Tuple[str, str, Optional[int]]:
+    """Run a command in an interactive paramiko shell and return as soon as its end marker arrives.
+    
+    The end marker line carries the exit status. Everything up to the begin
+    marker (stale output, the echoed command line) and the end marker line
+    are stripped. Returns (stdout, stderr, exit status); the status is None
+    on timeout.
+    """
+    while shell.recv_ready():
+        shell.recv(65536)
+    
+    tag, done, wire = _sentinel_command(command)
+    shell.send(wire)
+    
+    buf = bytearray()
+    deadline = time.time() + timeout
+    match = None
+    try:
+        while True:
+            match = done.search(buf)
+            if match:
+                break
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            shell.settimeout(remaining)
+            try:
+                data = shell.recv(65536)
+            except socket.timeout:
+                break
+            if not data:
+                raise EOFError("shell channel closed")
+            buf += data
+    finally:
+        shell.settimeout(None)
+    
+    output = _sentinel_output(buf, tag, match)
+    if not match:
+        return output, f"Timed out after {timeout}s waiting for command to finish", None
+    
+    status = int(match.group(1))
+    if status != 0:
+        return output, f"Command exited with status {status}", status
+    return output, "", status
+
+def _run_exec(client: paramiko.SSHClient, command: str, timeout: float) -> Tuple[str, str, Optional[int]]:
+    """Run a command on its own exec channel and return (stdout, stderr, exit status)."""
+    stdin, stdout, stderr = client.exec_command(command, timeout=timeout)
+    return _finish_exec(stdout, stderr, timeout)
+
+def _finish_exec(stdout, stderr, timeout: float) -> Tuple[str, str, Optional[int]]:
+    """Wait for a started exec command and collect its output.
+    
+    If the command has not exited within timeout the channel is closed and
+    TimeoutError is raised, so the caller's channel slot is freed.
+    """
+    channel = stdout.channel
+    if not channel.status_event.wait(timeout):
+        channel.close()
+        raise TimeoutError(f"Timed out after {timeout}s waiting for command to finish")
+    status = channel.recv_exit_status()
+    stdout_str = stdout.read().decode('utf-8', errors='replace')
+    stderr_str = stderr.read().decode('utf-8', errors='replace')
+    return stdout_str, stderr_str, status
+
 @dataclass
 class SessionInfo:
     """Holds metadata about a persistent session."""
@@ -66,6 +226,7 @@ class SessionInfo:
     client_id: str
     protocol: str
     credentials: Dict[str, Any]
+    backend: str = 'paramiko'
     connected: bool = False
     last_activity: float = field(default_factory=time.time)
     error_count: int = 0
@@ -87,12 +248,24 @@ class PersistentSSHSession:
     def connect(self) -> bool:
         """Establish SSH connection and open interactive shell."""
         with self._lock:
-            if self._connected and self.client and self.client.get_transport():
-                if self.client.get_transport().is_active():
-                    return True
-            
-            try:
-                creds = self.info.credentials
+            return self._connect()
+    
+    def _connect(self) -> bool:
+        if self._connected and self.client and self.client.get_transport():
+            if self.client.get_transport().is_active():
+                return True
+        
+        try:
+            creds = self.info.credentials
+            su_user = creds.get('su')
+            if su_user:
+                # Take an elevated shell from the pool (warm for i1 hosts) instead of su-ing here.
+                pool = get_ssh_pool()
+                conn = pool.acquire(
+                    creds.get('hostname'), creds.get('port', 22), creds.get('user'), creds.get('password'), su_user
+                )
+                self.client, self.shell = conn.client, conn.shell
+            else:
                 self.client = paramiko.SSHClient()
                 self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
                 self.client.connect(
@@ -109,35 +282,21 @@ class PersistentSSHSession:
                 time.sleep(0.5)
                 while self.shell.recv_ready():
                     self.shell.recv(4096)
-                su_user = creds.get('su')
-                if su_user:
-                    self.shell.send(f"su -l {su_user}\n".encode())
-                    time.sleep(0.8)
-                    su_output = ""
-                    start = time.time()
-                    while time.time() - start < 3:
-                        if self.shell.recv_ready():
-                            data = self.shell.recv(4096).decode('utf-8', errors='replace')
-                            su_output += data
-                            if '$' in data or '#' in data or '>' in data:
-                                break
-                        time.sleep(0.1)
-                    logger.debug(f"SSH persistent session su output: {su_output[:200]}")
-                
-                self._connected = True
-                self.info.connected = True
-                self.info.last_activity = time.time()
-                self.info.error_count = 0
-                logger.info(f"SSH persistent session established: {self.info.session_uuid} -> {creds.get('hostname')}")
-                return True
-                
-            except Exception as e:
-                logger.error(f"SSH persistent connect failed for {self.info.client_id}: {e}")
-                self.info.error_count += 1
-                self._connected = False
-                self.info.connected = False
-                return False
-    
+            
+            self._connected = True
+            self.info.connected = True
+            self.info.last_activity = time.time()
+            self.info.error_count = 0
+            logger.info(f"SSH persistent session established: {self.info.session_uuid} -> {creds.get('hostname')}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"SSH persistent connect failed for {self.info.client_id}: {e}")
+            self.info.error_count += 1
+            self._connected = False
+            self.info.connected = False
+            return False
+
     def is_alive(self) -> bool:
         """Check if connection is still alive."""
         if not self.client:
@@ -147,45 +306,46 @@ class PersistentSSHSession:
     
     def execute(self, command: str, timeout: float = 10.0, use_shell: bool = True) -> Tuple[str, str]:
         """Execute command on persistent session."""
+        stdout_str, stderr_str, _ = self.execute_with_status(command, timeout, use_shell)
+        return stdout_str, stderr_str
+    
+    def execute_with_status(self, command: str, timeout: float = 10.0,
+                            use_shell: bool = True) -> Tuple[str, str, Optional[int]]:
+        """Execute command on persistent session and return (stdout, stderr, exit status).
+        
+        Shell commands take turns on the interactive shell. Exec commands each
+        open their own channel on the shared transport, so several can run at
+        once, up to the per-host channel cap. The status is None if the command
+        failed or timed out.
+        """
         with self._lock:
             if not self.is_alive():
-                if not self.connect():
-                    return "", "Session disconnected and reconnect failed"
-            
+                if not self._connect():
+                    return "", "Session disconnected and reconnect failed", None
+            if use_shell and self.shell:
+                try:
+                    self.info.last_activity = time.time()
+                    return _run_in_shell(self.shell, command, timeout)
+                except Exception as e:
+                    return self._execute_failed(e)
+            client = self.client
+        
+        creds = self.info.credentials
+        with _host_channel_slots(creds.get('hostname'), creds.get('port', 22)):
             try:
                 self.info.last_activity = time.time()
-                
-                if use_shell and self.shell:
-                    cmd_bytes = (command + "\n").encode("utf-8", errors="replace")
-                    self.shell.send(cmd_bytes)
-                    
-                    output = ""
-                    start = time.time()
-                    time.sleep(0.2)
-                    while (time.time() - start) < timeout:
-                        if self.shell.recv_ready():
-                            data = self.shell.recv(4096).decode('utf-8', errors='replace')
-                            output += data
-                            start = time.time()
-                        else:
-                            time.sleep(0.1)
-                            if output and (time.time() - start) > 1.5:
-                                break
-                    
-                    return output, ""
-                else:
-                    stdin, stdout, stderr = self.client.exec_command(command, timeout=timeout)
-                    stdout.channel.recv_exit_status()
-                    stdout_str = stdout.read().decode('utf-8', errors='replace')
-                    stderr_str = stderr.read().decode('utf-8', errors='replace')
-                    return stdout_str, stderr_str
-                    
+                return _run_exec(client, command, timeout)
+            except TimeoutError as e:
+                return "", str(e), None
             except Exception as e:
-                logger.error(f"SSH persistent execute error: {e}")
-                self.info.error_count += 1
-                self._connected = False
-                self.info.connected = False
-                return "", str(e)
+                return self._execute_failed(e)
+    
+    def _execute_failed(self, e: Exception) -> Tuple[str, str, None]:
+        logger.error(f"SSH persistent execute error: {e}")
+        self.info.error_count += 1
+        self._connected = False
+        self.info.connected = False
+        return "", str(e), None
     
     def close(self):
         """Close the persistent connection."""
@@ -327,6 +487,189 @@ class PersistentTelnetSession:
                 self.info.connected = False
 
 
+class _AsyncShellChannel:
+    """Interactive asyncssh shell that runs commands with the same end-marker protocol as the paramiko shell."""
+    
+    def __init__(self, process):
+        self.process = process
+    
+    async def _recv(self, timeout: float) -> Optional[bytes]:
+        try:
+            data = await asyncio.wait_for(self.process.stdout.read(65536), timeout=max(timeout, 0.01))
+        except asyncio.TimeoutError:
+            return None
+        if not data:
+            raise EOFError("shell channel closed")
+        return data
+    
+    async def settle(self, quiet: float = 0.5):
+        """Discard the banner and prompt, returning once the shell has been quiet for `quiet` seconds."""
+        while await self._recv(quiet) is not None:
+            pass
+    
+    async def su(self, su_user: str) -> bool:
+        """Switch the shell to su_user; like _open_su_shell, the sentinel `id -un` check confirms it."""
+        self.process.stdin.write(f"su -l {su_user}\n".encode())
+        return await self.verify(su_user, timeout=5.0)
+    
+    async def verify(self, su_user: str, timeout: float = 1.0) -> bool:
+        """Cheap sentinel check that the shell still answers and runs as su_user."""
+        try:
+            output, _, status = await self.run('id -un', timeout)
+        except Exception:
+            return False
+        return status == 0 and output.strip() == su_user
+    
+    async def run(self, command: str, timeout: float) -> Tuple[str, str, Optional[int]]:
+        """Run a command and return (stdout, stderr, exit status); the status is None on timeout."""
+        tag, done, wire = _sentinel_command(command)
+        self.process.stdin.write(wire)
+        
+        buf = bytearray()
+        deadline = time.time() + timeout
+        match = None
+        while True:
+            match = done.search(buf)
+            if match:
+                break
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            data = await self._recv(remaining)
+            if data is None:
+                break
+            buf += data
+        
+        output = _sentinel_output(buf, tag, match)
+        if not match:
+            return output, f"Timed out after {timeout}s waiting for command to finish", None
+        status = int(match.group(1))
+        if status != 0:
+            return output, f"Command exited with status {status}", status
+        return output, "", status
+    
+    def close(self):
+        self.process.close()
+
+
+async def _asyncssh_connect(hostname: str, port: int, user: str, password: str, timeout: float = 10):
+    return await asyncssh.connect(
+        hostname, port=port, username=user, password=password,
+        known_hosts=None, connect_timeout=timeout
+    )
+
+
+async def _asyncssh_run(conn, command: str, timeout: float) -> Tuple[str, str, Optional[int]]:
+    try:
+        result = await asyncio.wait_for(
+            conn.run(command, check=False, encoding='utf-8', errors='replace'), timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        return "", f"Timed out after {timeout}s waiting for command to finish", None
+    return result.stdout or "", result.stderr or "", result.exit_status
+
+
+class AsyncSSHPersistentSession:
+    """Persistent SSH connection on the asyncssh backend; runs on the registry's event loop without a worker thread."""
+    
+    def __init__(self, session_info: SessionInfo):
+        self.info = session_info
+        self.conn = None
+        self.shell: Optional[_AsyncShellChannel] = None
+        self._lock = asyncio.Lock()
+        self._connected = False
+    
+    async def connect(self) -> bool:
+        """Establish the SSH connection and open an interactive shell."""
+        async with self._lock:
+            return await self._connect()
+    
+    async def _connect(self) -> bool:
+        if self._connected and self.is_alive():
+            return True
+        try:
+            creds = self.info.credentials
+            self._discard()
+            self.conn = await _asyncssh_connect(
+                creds.get('hostname'), creds.get('port', 22), creds.get('user'), creds.get('password'), timeout=15
+            )
+            self.shell = _AsyncShellChannel(await self.conn.create_process(term_type='vt100', encoding=None))
+            await self.shell.settle()
+            su_user = creds.get('su')
+            if su_user and not await self.shell.su(su_user):
+                raise RuntimeError(f"su -l {su_user} did not give an elevated shell")
+            
+            self._connected = True
+            self.info.connected = True
+            self.info.last_activity = time.time()
+            self.info.error_count = 0
+            logger.info(f"SSH persistent session established (asyncssh): {self.info.session_uuid} -> {creds.get('hostname')}")
+            return True
+        except Exception as e:
+            logger.error(f"SSH persistent connect failed for {self.info.client_id}: {e}")
+            self.info.error_count += 1
+            self._connected = False
+            self.info.connected = False
+            return False
+    
+    def is_alive(self) -> bool:
+        """Check if connection is still alive."""
+        return self.conn is not None and not self.conn.is_closed()
+    
+    async def execute(self, command: str, timeout: float = 10.0, use_shell: bool = True) -> Tuple[str, str]:
+        """Execute command on persistent session."""
+        stdout_str, stderr_str, _ = await self.execute_with_status(command, timeout, use_shell)
+        return stdout_str, stderr_str
+    
+    async def execute_with_status(self, command: str, timeout: float = 10.0,
+                                  use_shell: bool = True) -> Tuple[str, str, Optional[int]]:
+        """Like PersistentSSHSession.execute_with_status; only the shell is serialized."""
+        async with self._lock:
+            if not self.is_alive():
+                if not await self._connect():
+                    return "", "Session disconnected and reconnect failed", None
+            if use_shell and self.shell:
+                try:
+                    self.info.last_activity = time.time()
+                    return await self.shell.run(command, timeout)
+                except Exception as e:
+                    return self._execute_failed(e)
+            conn = self.conn
+        
+        creds = self.info.credentials
+        async with _async_host_channel_slots(creds.get('hostname'), creds.get('port', 22)):
+            try:
+                self.info.last_activity = time.time()
+                return await _asyncssh_run(conn, command, timeout)
+            except Exception as e:
+                return self._execute_failed(e)
+    
+    def _execute_failed(self, e: Exception) -> Tuple[str, str, None]:
+        logger.error(f"SSH persistent execute error: {e}")
+        self.info.error_count += 1
+        self._connected = False
+        self.info.connected = False
+        return "", str(e) or type(e).__name__, None
+    
+    def _discard(self):
+        try:
+            if self.shell:
+                self.shell.close()
+            if self.conn:
+                self.conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing SSH session: {e}")
+        self.shell = None
+        self.conn = None
+    
+    async def close(self):
+        """Close the persistent connection."""
+        async with self._lock:
+            self._discard()
+            self._connected = False
+            self.info.connected = False
+
+
 class ConnectionRegistry:
     """
     Central registry for all persistent connections.
@@ -349,6 +692,7 @@ class ConnectionRegistry:
         self._sessions: Dict[str, SessionInfo] = {}
         self._uuid_map: Dict[str, str] = {}
         self._ssh_sessions: Dict[str, PersistentSSHSession] = {}
+        self._async_ssh_sessions: Dict[str, AsyncSSHPersistentSession] = {}
         self._telnet_sessions: Dict[str, PersistentTelnetSession] = {}
         self._registry_lock = threading.Lock()
         self._heartbeat_thread: Optional[threading.Thread] = None
@@ -364,42 +708,8 @@ class ConnectionRegistry:
         logger.info(f"ConnectionRegistry: Initializing {len(clients)} client connections...")
         
         for client in clients:
-            client_id = client.get('id', '')
-            protocol = client.get('protocol', 'ssh')
-            creds = client.get('credentials', {})
-            
-            if not client_id:
-                continue
-            
-            session_uuid = generate_session_uuid()
-            
-            session_info = SessionInfo(
-                session_uuid=session_uuid,
-                client_id=client_id,
-                protocol=protocol,
-                credentials=creds,
-                connected=False
-            )
-            
-            with self._registry_lock:
-                self._sessions[client_id] = session_info
-                self._uuid_map[session_uuid] = client_id
-            if protocol == 'ssh':
-                ssh_session = PersistentSSHSession(session_info)
-                self._ssh_sessions[client_id] = ssh_session
-                threading.Thread(
-                    target=ssh_session.connect,
-                    daemon=True,
-                    name=f"SSHConnect-{client_id}"
-                ).start()
-                
-            elif protocol == 'telnet':
-                telnet_session = PersistentTelnetSession(session_info)
-                self._telnet_sessions[client_id] = telnet_session
-                if self._async_loop:
-                    asyncio.run_coroutine_threadsafe(telnet_session.connect(), self._async_loop)
-            
-            logger.debug(f"Registered session {session_uuid} for client {client_id} ({protocol})")
+            if client.get('id'):
+                self._open_session(client)
         self._heartbeat_thread = threading.Thread(
             target=self._heartbeat_loop,
             daemon=True,
@@ -409,11 +719,117 @@ class ConnectionRegistry:
         
         logger.info(f"ConnectionRegistry: Started with {len(self._sessions)} sessions")
     
+    def _session_backend(self, client: dict) -> str:
+        """SSH backend for a client's persistent session; asyncssh needs the registry's event loop."""
+        if client.get('protocol', 'ssh') != 'ssh':
+            return 'paramiko'
+        backend = client_ssh_backend(client)
+        if backend == 'asyncssh' and self._async_loop is None:
+            return 'paramiko'
+        return backend
+    
+    def _open_session(self, client: dict):
+        """Register a session for one client and start connecting it in the background."""
+        client_id = client.get('id', '')
+        protocol = client.get('protocol', 'ssh')
+        creds = dict(client.get('credentials') or {})
+        
+        session_uuid = generate_session_uuid()
+        
+        session_info = SessionInfo(
+            session_uuid=session_uuid,
+            client_id=client_id,
+            protocol=protocol,
+            credentials=creds,
+            backend=self._session_backend(client),
+            connected=False
+        )
+        
+        with self._registry_lock:
+            self._sessions[client_id] = session_info
+            self._uuid_map[session_uuid] = client_id
+        if protocol == 'ssh' and session_info.backend == 'asyncssh':
+            async_session = AsyncSSHPersistentSession(session_info)
+            self._async_ssh_sessions[client_id] = async_session
+            asyncio.run_coroutine_threadsafe(async_session.connect(), self._async_loop)
+            
+        elif protocol == 'ssh':
+            ssh_session = PersistentSSHSession(session_info)
+            self._ssh_sessions[client_id] = ssh_session
+            threading.Thread(
+                target=ssh_session.connect,
+                daemon=True,
+                name=f"SSHConnect-{client_id}"
+            ).start()
+            
+        elif protocol == 'telnet':
+            telnet_session = PersistentTelnetSession(session_info)
+            self._telnet_sessions[client_id] = telnet_session
+            if self._async_loop:
+                asyncio.run_coroutine_threadsafe(telnet_session.connect(), self._async_loop)
+        
+        logger.debug(f"Registered session {session_uuid} for client {client_id} ({protocol})")
+    
+    def _close_session(self, client_id: str):
+        """Unregister one client's session and close its connection."""
+        with self._registry_lock:
+            session_info = self._sessions.pop(client_id, None)
+            if session_info:
+                self._uuid_map.pop(session_info.session_uuid, None)
+            ssh_sess = self._ssh_sessions.pop(client_id, None)
+            async_ssh_sess = self._async_ssh_sessions.pop(client_id, None)
+            telnet_sess = self._telnet_sessions.pop(client_id, None)
+        try:
+            if ssh_sess:
+                ssh_sess.close()
+            if async_ssh_sess and self._async_loop and self._async_loop.is_running():
+                asyncio.run_coroutine_threadsafe(async_ssh_sess.close(), self._async_loop)
+            if telnet_sess and self._async_loop and self._async_loop.is_running():
+                asyncio.run_coroutine_threadsafe(telnet_sess.close(), self._async_loop)
+            logger.debug(f"Closed session for client {client_id}")
+        except Exception as e:
+            logger.debug(f"Error closing session {client_id}: {e}")
+    
+    def reconcile(self, clients: list) -> Dict[str, list]:
+        """Bring sessions in line with an updated client list.
+        
+        Clients are matched by id. Sessions are opened for new clients, closed
+        for deleted ones, and rebuilt only when a client's protocol, SSH
+        backend or credentials changed; every other session stays connected.
+        """
+        if not self._running:
+            return {'added': [], 'removed': [], 'rebuilt': []}
+        desired = {c['id']: c for c in clients if c.get('id')}
+        with self._registry_lock:
+            current = dict(self._sessions)
+        
+        added = [cid for cid in desired if cid not in current]
+        removed = [cid for cid in current if cid not in desired]
+        rebuilt = [
+            cid for cid, info in current.items()
+            if cid in desired and (
+                info.protocol != desired[cid].get('protocol', 'ssh')
+                or info.backend != self._session_backend(desired[cid])
+                or info.credentials != (desired[cid].get('credentials') or {})
+            )
+        ]
+        
+        for client_id in removed + rebuilt:
+            self._close_session(client_id)
+        for client_id in rebuilt + added:
+            self._open_session(desired[client_id])
+        
+        if added or removed or rebuilt:
+            logger.info(f"ConnectionRegistry: Reconciled config - {len(added)} added, {len(removed)} removed, "
+                        f"{len(rebuilt)} rebuilt, {len(current) - len(removed) - len(rebuilt)} unchanged")
+        return {'added': added, 'removed': removed, 'rebuilt': rebuilt}
+    
     def _heartbeat_loop(self):
         """Periodically check and reconnect dead connections using absolute wall-clock timing."""
         from datetime import datetime, timedelta
         heartbeat_interval_sec = 5
         last_heartbeat_second = -1
+        last_pool_totals = None
         
         while self._running:
             now = datetime.now()
@@ -422,6 +838,15 @@ class ConnectionRegistry:
             
             if aligned_second != last_heartbeat_second and current_second % heartbeat_interval_sec == 0:
                 last_heartbeat_second = aligned_second
+                get_ssh_pool().prune()
+                if current_second == 0:
+                    # Once a minute, and only when something moved, so an idle pool stays quiet.
+                    stats = get_ssh_pool().stats()
+                    totals = (stats['hits'], stats['misses'], stats['idle'])
+                    if totals != last_pool_totals:
+                        last_pool_totals = totals
+                        logger.info(f"SSH pool: {stats['hits']} hits, {stats['misses']} misses, "
+                                    f"{stats['idle']} idle across {len(stats['keys'])} keys")
 
                 with self._registry_lock:
                     sessions_snapshot = list(self._sessions.items())
@@ -439,6 +864,14 @@ class ConnectionRegistry:
                                     daemon=True
                                 ).start()
                         
+                        elif session_info.protocol == 'ssh' and client_id in self._async_ssh_sessions:
+                            async_ssh_sess = self._async_ssh_sessions[client_id]
+                            is_alive = async_ssh_sess.is_alive()
+                            session_info.connected = is_alive
+                            if not is_alive and self._async_loop:
+                                logger.debug(f"Heartbeat: Reconnecting SSH session {client_id}")
+                                asyncio.run_coroutine_threadsafe(async_ssh_sess.connect(), self._async_loop)
+                        
                         elif session_info.protocol == 'telnet' and client_id in self._telnet_sessions:
                             telnet_sess = self._telnet_sessions[client_id]
                             is_alive = telnet_sess.is_alive()
@@ -483,6 +916,10 @@ class ConnectionRegistry:
         """Get SSH session wrapper by client ID."""
         return self._ssh_sessions.get(client_id)
     
+    def get_async_ssh_session(self, client_id: str) -> Optional[AsyncSSHPersistentSession]:
+        """Get asyncssh session wrapper by client ID."""
+        return self._async_ssh_sessions.get(client_id)
+    
     def get_telnet_session(self, client_id: str) -> Optional[PersistentTelnetSession]:
         """Get Telnet session wrapper by client ID."""
         return self._telnet_sessions.get(client_id)
@@ -495,6 +932,17 @@ class ConnectionRegistry:
             return "", f"No persistent session for {client_id}"
         return ssh_sess.execute(command, timeout, use_shell)
     
+    async def execute_async_ssh(self, client_id: str, command: str, timeout: float = 10.0, use_shell: bool = True) -> Tuple[str, str]:
+        """Execute command on persistent asyncssh session, hopping onto the registry loop if called from another one."""
+        ssh_sess = self.get_async_ssh_session(client_id)
+        if not ssh_sess:
+            return "", f"No persistent session for {client_id}"
+        if asyncio.get_running_loop() is self._async_loop:
+            return await ssh_sess.execute(command, timeout, use_shell)
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(ssh_sess.execute(command, timeout, use_shell), self._async_loop)
+        )
+    
     async def execute_telnet(self, client_id: str, command: str, timeout: float = 10.0) -> Tuple[str, str]:
         """Execute command on persistent Telnet session."""
         telnet_sess = self.get_telnet_session(client_id)
@@ -539,6 +987,14 @@ class ConnectionRegistry:
             except Exception as e:
                 logger.debug(f"Error closing SSH session {client_id}: {e}")
 
+        for client_id, async_ssh_sess in self._async_ssh_sessions.items():
+            try:
+                if self._async_loop and self._async_loop.is_running():
+                    asyncio.run_coroutine_threadsafe(async_ssh_sess.close(), self._async_loop)
+                logger.debug(f"Closed SSH session: {client_id}")
+            except Exception as e:
+                logger.debug(f"Error closing SSH session {client_id}: {e}")
+
         for client_id, telnet_sess in self._telnet_sessions.items():
             try:
                 if self._async_loop and self._async_loop.is_running():
@@ -555,6 +1011,7 @@ class ConnectionRegistry:
         self._sessions.clear()
         self._uuid_map.clear()
         self._ssh_sessions.clear()
+        self._async_ssh_sessions.clear()
         self._telnet_sessions.clear()
         
         logger.info("ConnectionRegistry: Shutdown complete")
@@ -563,10 +1020,413 @@ def get_connection_registry() -> ConnectionRegistry:
     """Get the global connection registry instance."""
     return ConnectionRegistry.get_instance()
 
+@dataclass(eq=False)
+class PooledSSHConnection:
+    """A one-shot SSH connection on loan from the pool; su connections carry their elevated shell."""
+    key: Tuple[Any, int, Any, Optional[str]]
+    client: Any
+    shell: Any = None
+    elevated: bool = False
+    created: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    reused: bool = False
+
+
+class SSHConnectionPool:
+    """
+    Idle SSH connections for the one-shot helpers, keyed by (host, port, user, su).
+    Borrowed connections skip key exchange, authentication and, for su keys, elevation.
+    Keys registered with set_warm_targets (the IntelliStar 1 hosts) are kept stocked
+    with verified su shells by a background refill thread.
+    """
+    
+    REFILL_INTERVAL = 5.0
+    
+    def __init__(self, max_size: int = 8, idle_ttl: float = 60.0, warm_per_host: int = 2):
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.warm_per_host = warm_per_host
+        self._idle: Dict[Tuple[Any, int, Any, Optional[str]], List[PooledSSHConnection]] = {}
+        self._warm: Dict[Tuple[Any, int, Any, Optional[str]], str] = {}
+        self._warm_backoff: Dict[Tuple[Any, int, Any, Optional[str]], Tuple[float, int]] = {}
+        self._hits: Dict[Tuple[Any, int, Any, Optional[str]], int] = {}
+        self._misses: Dict[Tuple[Any, int, Any, Optional[str]], int] = {}
+        self._lock = threading.Lock()
+        self._refill_wake = threading.Event()
+        self._refill_thread: Optional[threading.Thread] = None
+    
+    def configure(self, max_size: int, idle_ttl: float, warm_per_host: int = 2):
+        self.max_size = max(0, int(max_size))
+        self.idle_ttl = float(idle_ttl)
+        self.warm_per_host = max(0, int(warm_per_host))
+        self.prune()
+        self._refill_wake.set()
+    
+    def set_warm_targets(self, targets: Dict[Tuple[Any, int, Any, Optional[str]], str]):
+        """Replace the keys (with their passwords) that should always have warm su shells ready."""
+        with self._lock:
+            self._warm = dict(targets)
+            self._warm_backoff = {k: v for k, v in self._warm_backoff.items() if k in self._warm}
+            start = bool(self._warm) and self._refill_thread is None
+            if start:
+                self._refill_thread = threading.Thread(target=self._refill_loop, daemon=True, name="SSHShellRefill")
+        if start:
+            self._refill_thread.start()
+        self._refill_wake.set()
+    
+    def acquire(self, hostname: str, port: int, user: str, password: str, su: Optional[str] = None) -> PooledSSHConnection:
+        """Borrow a healthy idle connection for the key, or open a new one.
+        
+        Idle su shells are checked with a sentinel `id -un` before they are
+        handed out, so a shell that dropped its elevation is never reused.
+        """
+        key = (hostname, int(port or 22), user, su or None)
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                conn = idle.pop() if idle else None
+                if idle == []:
+                    del self._idle[key]
+                warm = key in self._warm
+            if conn is None:
+                break
+            fresh = warm or time.time() - conn.last_used <= self.idle_ttl
+            if fresh and self._healthy(conn) and (conn.shell is None or _verify_su_shell(conn.shell, su)):
+                conn.reused = True
+                self._count(self._hits, key)
+                if warm:
+                    self._refill_wake.set()
+                return conn
+            self._close(conn)
+        self._count(self._misses, key)
+        if warm:
+            self._refill_wake.set()
+        return self._open(key, password)
+    
+    def release(self, conn: PooledSSHConnection, reusable: bool = True):
+        """Return a connection after use; pass reusable=False when its state is unknown (timeouts, errors)."""
+        if not reusable or self.max_size <= 0 or not self._healthy(conn) or (conn.shell is not None and not conn.elevated):
+            self._close(conn)
+            return
+        conn.last_used = time.time()
+        evicted = []
+        with self._lock:
+            self._idle.setdefault(conn.key, []).append(conn)
+            idle = sorted((c for key, conns in self._idle.items() if key not in self._warm for c in conns),
+                          key=lambda c: c.last_used)
+            for old in idle[:max(0, len(idle) - self.max_size)]:
+                self._idle[old.key].remove(old)
+                if not self._idle[old.key]:
+                    del self._idle[old.key]
+                evicted.append(old)
+        for old in evicted:
+            self._close(old)
+    
+    def prune(self):
+        """Close idle connections that outlived the TTL; warm su shells are kept."""
+        cutoff = time.time() - self.idle_ttl
+        expired = []
+        with self._lock:
+            for key in list(self._idle):
+                if key in self._warm:
+                    continue
+                keep = [c for c in self._idle[key] if c.last_used >= cutoff]
+                expired.extend(c for c in self._idle[key] if c.last_used < cutoff)
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+        for conn in expired:
+            self._close(conn)
+    
+    def clear(self):
+        """Close every idle connection and stop keeping shells warm."""
+        with self._lock:
+            idle = [c for conns in self._idle.values() for c in conns]
+            self._idle.clear()
+            self._warm.clear()
+        for conn in idle:
+            self._close(conn)
+    
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(conns) for conns in self._idle.values())
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counters and idle counts, in total and per (host, port, user, su) key."""
+        with self._lock:
+            keys = set(self._hits) | set(self._misses) | set(self._idle) | set(self._warm)
+            per_key = {
+                key: {
+                    'hits': self._hits.get(key, 0),
+                    'misses': self._misses.get(key, 0),
+                    'idle': len(self._idle.get(key, ())),
+                    'warm': key in self._warm
+                }
+                for key in keys
+            }
+        return {
+            'hits': sum(s['hits'] for s in per_key.values()),
+            'misses': sum(s['misses'] for s in per_key.values()),
+            'idle': sum(s['idle'] for s in per_key.values()),
+            'keys': per_key
+        }
+    
+    def _count(self, counter: Dict[Tuple[Any, int, Any, Optional[str]], int], key: Tuple[Any, int, Any, Optional[str]]):
+        with self._lock:
+            counter[key] = counter.get(key, 0) + 1
+    
+    def _refill_loop(self):
+        while True:
+            self._refill_wake.wait(self.REFILL_INTERVAL)
+            self._refill_wake.clear()
+            with self._lock:
+                warm = dict(self._warm)
+            for key, password in warm.items():
+                try:
+                    self._refill(key, password)
+                except Exception as e:
+                    logger.debug(f"Warm su shell refill error for {key[0]}: {e}")
+    
+    def _refill(self, key: Tuple[Any, int, Any, Optional[str]], password: str):
+        """Top the key up to warm_per_host healthy idle shells, backing off after failures."""
+        with self._lock:
+            until, failures = self._warm_backoff.get(key, (0.0, 0))
+            if time.time() < until:
+                return
+            idle = self._idle.pop(key, [])
+            keep = [c for c in idle if self._healthy(c)]
+            surplus = keep[:max(0, len(keep) - self.warm_per_host)]
+            keep = keep[len(surplus):]
+            if keep:
+                self._idle[key] = keep
+            missing = self.warm_per_host - len(keep)
+        for conn in idle:
+            if conn not in keep:
+                self._close(conn)
+        
+        for _ in range(missing):
+            try:
+                conn = self._open(key, password)
+            except Exception as e:
+                failures += 1
+                with self._lock:
+                    if key in self._warm:
+                        self._warm_backoff[key] = (time.time() + min(300.0, self.REFILL_INTERVAL * 2 ** failures), failures)
+                logger.warning(f"Could not warm su shell for {key[2]}@{key[0]}:{key[1]}: {e}")
+                return
+            with self._lock:
+                if key in self._warm:
+                    self._idle.setdefault(key, []).append(conn)
+                    conn = None
+            if conn is not None:
+                self._close(conn)
+                return
+            logger.debug(f"Warmed su shell for {key[2]}@{key[0]}:{key[1]} as {key[3]}")
+        with self._lock:
+            self._warm_backoff.pop(key, None)
+    
+    def _open(self, key: Tuple[Any, int, Any, Optional[str]], password: str) -> PooledSSHConnection:
+        hostname, port, user, su = key
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        try:
+            client.connect(
+                hostname=hostname, port=port, username=user, password=password,
+                timeout=10, look_for_keys=False, allow_agent=False
+            )
+            shell = _open_su_shell(client, su) if su else None
+        except Exception:
+            client.close()
+            raise
+        return PooledSSHConnection(key=key, client=client, shell=shell, elevated=shell is not None)
+    
+    @staticmethod
+    def _healthy(conn: PooledSSHConnection) -> bool:
+        transport = conn.client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        if conn.shell is not None and (conn.shell.closed or conn.shell.exit_status_ready()):
+            return False
+        return True
+    
+    @staticmethod
+    def _close(conn: PooledSSHConnection):
+        try:
+            if conn.shell is not None:
+                conn.shell.close()
+            conn.client.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled SSH connection: {e}")
+
+
+_ssh_pool = SSHConnectionPool()
+atexit.register(_ssh_pool.clear)
+
+def get_ssh_pool() -> SSHConnectionPool:
+    """Get the shared pool behind the one-shot SSH helpers."""
+    return _ssh_pool
+
+
+@dataclass(eq=False)
+class PooledAsyncSSHConnection:
+    """An asyncssh connection (and for su keys, its elevated shell) owned by AsyncSSHConnectionPool."""
+    key: Tuple[Any, int, Any, Optional[str]]
+    loop: asyncio.AbstractEventLoop
+    conn: Any
+    shell: Optional[_AsyncShellChannel] = None
+    elevated: bool = False
+    last_used: float = field(default_factory=time.time)
+    reused: bool = False
+
+
+class AsyncSSHConnectionPool:
+    """
+    Idle asyncssh connections for the one-shot helpers, keyed by (host, port, user, su).
+    asyncssh connections belong to the event loop that opened them, so each loop
+    keeps its own idle lists; size and idle TTL follow the paramiko pool's settings.
+    """
+    
+    def __init__(self, settings: SSHConnectionPool):
+        self._settings = settings
+        self._idle: Dict[asyncio.AbstractEventLoop, Dict[Tuple[Any, int, Any, Optional[str]], List[PooledAsyncSSHConnection]]] = {}
+        self._lock = threading.Lock()
+    
+    async def acquire(self, hostname: str, port: int, user: str, password: str, su: Optional[str] = None) -> PooledAsyncSSHConnection:
+        """Borrow a live idle connection for the key on the running loop, or open a new one.
+        
+        Idle su shells are checked with a sentinel `id -un` before they are reused.
+        """
+        loop = asyncio.get_running_loop()
+        key = (hostname, int(port or 22), user, su or None)
+        while True:
+            with self._lock:
+                idle = self._idle.get(loop, {}).get(key)
+                conn = idle.pop() if idle else None
+            if conn is None:
+                break
+            fresh = time.time() - conn.last_used <= self._settings.idle_ttl
+            if fresh and not conn.conn.is_closed() and (conn.shell is None or await conn.shell.verify(su)):
+                conn.reused = True
+                return conn
+            self._close(conn)
+        return await self._open(loop, key, password)
+    
+    def release(self, conn: PooledAsyncSSHConnection, reusable: bool = True):
+        """Return a connection after use; pass reusable=False when its state is unknown (timeouts, errors)."""
+        if (not reusable or self._settings.max_size <= 0 or conn.conn.is_closed()
+                or (conn.shell is not None and not conn.elevated)):
+            self._close(conn)
+            return
+        conn.last_used = time.time()
+        cutoff = conn.last_used - self._settings.idle_ttl
+        dropped = []
+        with self._lock:
+            for loop in [l for l in self._idle if l.is_closed()]:
+                # Connections of a finished loop cannot be closed from here; let them be collected.
+                del self._idle[loop]
+            per_loop = self._idle.setdefault(conn.loop, {})
+            per_loop.setdefault(conn.key, []).append(conn)
+            idle = sorted((c for conns in per_loop.values() for c in conns), key=lambda c: c.last_used)
+            excess = max(0, len(idle) - self._settings.max_size)
+            for old in idle:
+                if excess <= 0 and old.last_used >= cutoff:
+                    break
+                excess -= 1
+                per_loop[old.key].remove(old)
+                if not per_loop[old.key]:
+                    del per_loop[old.key]
+                dropped.append(old)
+        for old in dropped:
+            self._close(old)
+    
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(conns) for per_loop in self._idle.values() for conns in per_loop.values())
+    
+    async def _open(self, loop: asyncio.AbstractEventLoop, key: Tuple[Any, int, Any, Optional[str]],
+                    password: str) -> PooledAsyncSSHConnection:
+        hostname, port, user, su = key
+        conn = await _asyncssh_connect(hostname, port, user, password)
+        shell, elevated = None, False
+        if su:
+            try:
+                shell = _AsyncShellChannel(await conn.create_process(term_type='vt100', encoding=None))
+                elevated = await shell.su(su)
+                if not elevated:
+                    raise RuntimeError(f"su -l {su} did not give an elevated shell")
+            except Exception:
+                if shell is not None:
+                    shell.close()
+                conn.close()
+                raise
+        return PooledAsyncSSHConnection(key=key, loop=loop, conn=conn, shell=shell, elevated=elevated)
+    
+    @staticmethod
+    def _close(conn: PooledAsyncSSHConnection):
+        try:
+            if conn.shell is not None:
+                conn.shell.close()
+            conn.conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled SSH connection: {e}")
+
+
+_async_ssh_pool = AsyncSSHConnectionPool(_ssh_pool)
+
+def get_async_ssh_pool() -> AsyncSSHConnectionPool:
+    """Get the shared pool behind the one-shot helpers on the asyncssh backend."""
+    return _async_ssh_pool
+
+def configure_ssh_pool(max_size: int = 8, idle_ttl: float = 60.0, warm_per_host: int = 2) -> None:
+    _ssh_pool.configure(max_size, idle_ttl, warm_per_host)
+
+def configure_warm_shells(clients: list) -> None:
+    """Keep su shells warm for every IntelliStar 1 client that talks to its host over paramiko SSH."""
+    targets = {}
+    for client in clients:
+        if client.get('star') != 'i1' or client.get('protocol', 'ssh') != 'ssh':
+            continue
+        if client_ssh_backend(client) != 'paramiko':
+            continue
+        creds = client.get('credentials') or {}
+        su = creds.get('su', 'dgadmin')
+        if not su or not creds.get('hostname'):
+            continue
+        hostname, port = _ssh_host_key(creds.get('hostname'), creds.get('port', 22))
+        targets[(hostname, port, creds.get('user'), su)] = creds.get('password')
+    _ssh_pool.set_warm_targets(targets)
+
+def _verify_su_shell(shell, su: str, timeout: float = 1.0) -> bool:
+    """Cheap sentinel check that a shell still answers and runs as the su user."""
+    try:
+        output, _, status = _run_in_shell(shell, 'id -un', timeout)
+    except Exception:
+        return False
+    return status == 0 and output.strip() == su
+
+def _open_su_shell(client: paramiko.SSHClient, su: str):
+    """Open an interactive shell on the client and switch it to the su user.
+    
+    The `id -un` check is typed straight after `su -l`, so the elevated shell
+    runs it as soon as it starts; there is no fixed wait or prompt sniffing.
+    Raises RuntimeError if elevation cannot be confirmed, so su commands never
+    run in the login shell.
+    """
+    shell = client.invoke_shell()
+    shell.send(f"su -l {su}\n".encode())
+    if not _verify_su_shell(shell, su, timeout=5.0):
+        shell.close()
+        raise RuntimeError(f"su -l {su} did not give an elevated shell")
+    return shell
+
+
 async def execute_ssh_persistent(client_id: str, command: str, timeout: float = 10.0, use_shell: bool = True) -> Tuple[str, str]:
-    """Execute SSH command on persistent session (async wrapper for sync call)."""
+    """Execute SSH command on persistent session (native on asyncssh, thread pool for paramiko)."""
     loop = asyncio.get_event_loop()
     registry = get_connection_registry()
+    if registry.get_async_ssh_session(client_id):
+        return await registry.execute_async_ssh(client_id, command, timeout, use_shell)
     
     def _exec():
         return registry.execute_ssh(client_id, command, timeout, use_shell)
@@ -659,81 +1519,87 @@ async def execute_udp_message(hostname: str, port: int, message: str, timeout: f
     await loop.run_in_executor(_get_executor(), _udp_send)
 
 
-async def execute_ssh_command(hostname: str, user: str, password: str, port: int, command: str, su: Optional[str] = None, timeout: float = 5.0) -> tuple[str, str]:
-    """Execute SSH command asynchronously using paramiko in executor (blocking I/O)."""
-    loop = asyncio.get_event_loop()
-    
-    def _ssh_exec():
-        ssh_client = paramiko.SSHClient()
-        ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        stdout_str = ""
-        stderr_str = ""
-        
+async def _asyncssh_exec(hostname: str, user: str, password: str, port: int, command: str, su: Optional[str], timeout: float) -> tuple[str, str]:
+    """One-shot SSH command on the asyncssh backend, entirely on the calling event loop, over a pooled connection."""
+    if dangerous_commands.search(command):
+        logger.error(f"Attention! Dangerous command detected in SSH execution on {hostname}: {command}. Exiting...")
+        sys.exit(1)
+    pool = get_async_ssh_pool()
+    while True:
+        try:
+            conn = await pool.acquire(hostname, port, user, password, su)
+        except Exception as e:
+            logger.error(f"SSH error on {hostname}: {e or type(e).__name__}")
+            return "", str(e) or type(e).__name__
+        reusable = True
         try:
-            ssh_client.connect(
-                hostname=hostname, port=port, username=user, password=password,
-                timeout=10, look_for_keys=False, allow_agent=False
-            )
-            
             if su:
-                shell = ssh_client.invoke_shell()
-                time.sleep(0.3)
-                while shell.recv_ready():
-                    shell.recv(4096)
-                
-                shell.send(f"su -l {su}\n".encode())
-
-                su_wait_start = time.time()
-                su_output = ""
-                while time.time() - su_wait_start < 3:
-                    if shell.recv_ready():
-                        data = shell.recv(4096).decode('utf-8', errors='replace')
-                        su_output += data
-                        if '$' in data or '#' in data or '>' in data:
-                            break
-                    time.sleep(0.1)
-                
-                logger.debug(f"SSH su output: {su_output}")
-                
-                cmd_encode = (command + "\n").encode("utf-8", errors="replace")
-                if dangerous_commands.search(command):
-                    logger.error(f"Attention! Dangerous command detected in SSH execution on {hostname}: {command}. Exiting...")
-                    sys.exit(1)
-                shell.send(cmd_encode)
                 logger.info(f"SSH (Shell): Executing on {hostname} as {su}: {command}")
-                time.sleep(0.5)
-                output = ""
-                start_time = time.time()
-                while (time.time() - start_time) < timeout:
-                    if shell.recv_ready():
-                        data = shell.recv(4096).decode('utf-8', errors='replace')
-                        output += data
-                        start_time = time.time()
-                    else:
-                        time.sleep(0.1)
-                        if output and (time.time() - start_time) > 1.0:
-                            break
-                shell.close()
-                logger.debug(f"SSH (Shell) output from {hostname}: {output}")
-                stdout_str = output
+                stdout_str, stderr_str, status = await conn.shell.run(command, timeout)
+                logger.debug(f"SSH (Shell) output from {hostname}: {stdout_str}")
             else:
                 logger.info(f"SSH (Exec): Executing on {hostname}: {command}")
-                if dangerous_commands.search(command):
-                    logger.error(f"Attention! Dangerous command detected in SSH execution on {hostname}: {command}. Exiting...")
-                    sys.exit(1)
-                stdin, stdout, stderr = ssh_client.exec_command(command, timeout=timeout)
-                exit_status = stdout.channel.recv_exit_status()
-                stdout_str = stdout.read().decode('utf-8', errors='replace')
-                stderr_str = stderr.read().decode('utf-8', errors='replace')
+                stdout_str, stderr_str, status = await _asyncssh_run(conn.conn, command, timeout)
                 logger.debug(f"SSH (Exec) output from {hostname}: {stdout_str}")
                 if stderr_str:
                     logger.debug(f"SSH (Exec) stderr from {hostname}: {stderr_str}")
+            reusable = status is not None
             return stdout_str, stderr_str
         except Exception as e:
-            logger.error(f"SSH error on {hostname}: {e}")
-            return "", str(e)
+            reusable = False
+            if conn.reused and isinstance(e, asyncssh.ChannelOpenError):
+                logger.debug(f"Pooled SSH connection to {hostname} went stale, reconnecting: {e}")
+                continue
+            logger.error(f"SSH error on {hostname}: {e or type(e).__name__}")
+            return "", str(e) or type(e).__name__
         finally:
-            ssh_client.close()
+            pool.release(conn, reusable)
+
+async def execute_ssh_command(hostname: str, user: str, password: str, port: int, command: str, su: Optional[str] = None, timeout: float = 5.0) -> tuple[str, str]:
+    """Execute SSH command asynchronously, on asyncssh if the host is configured for it, else paramiko in executor (blocking I/O) over a pooled connection."""
+    if ssh_backend_for(hostname, port) == 'asyncssh':
+        return await _asyncssh_exec(hostname, user, password, port, command, su, timeout)
+    loop = asyncio.get_event_loop()
+    
+    def _ssh_exec():
+        if dangerous_commands.search(command):
+            logger.error(f"Attention! Dangerous command detected in SSH execution on {hostname}: {command}. Exiting...")
+            sys.exit(1)
+        pool = get_ssh_pool()
+        while True:
+            try:
+                conn = pool.acquire(hostname, port, user, password, su)
+            except Exception as e:
+                logger.error(f"SSH error on {hostname}: {e}")
+                return "", str(e)
+            started = False
+            reusable = True
+            try:
+                if su:
+                    logger.info(f"SSH (Shell): Executing on {hostname} as {su}: {command}")
+                    started = True
+                    stdout_str, stderr_str, status = _run_in_shell(conn.shell, command, timeout)
+                    reusable = status is not None
+                    logger.debug(f"SSH (Shell) output from {hostname}: {stdout_str}")
+                else:
+                    logger.info(f"SSH (Exec): Executing on {hostname}: {command}")
+                    stdin, stdout, stderr = conn.client.exec_command(command, timeout=timeout)
+                    started = True
+                    # A timeout closes the channel and raises, so the connection is discarded below.
+                    stdout_str, stderr_str, _ = _finish_exec(stdout, stderr, timeout)
+                    logger.debug(f"SSH (Exec) output from {hostname}: {stdout_str}")
+                    if stderr_str:
+                        logger.debug(f"SSH (Exec) stderr from {hostname}: {stderr_str}")
+                return stdout_str, stderr_str
+            except Exception as e:
+                reusable = False
+                if conn.reused and not started:
+                    logger.debug(f"Pooled SSH connection to {hostname} went stale, reconnecting: {e}")
+                    continue
+                logger.error(f"SSH error on {hostname}: {e}")
+                return "", str(e)
+            finally:
+                pool.release(conn, reusable)
     
     return await loop.run_in_executor(_get_executor(), _ssh_exec)
 
@@ -0,0 +1,181 @@
+"""Transport helpers checked against in-process fakes instead of live hosts."""
+import re
+import socket
+
+import provision
+
+
+class FakeShell:
+    """Interactive channel that echoes what is typed, wrapped like a narrow terminal, then runs it."""
+
+    def __init__(self, output=b"", status=0, width=40, finish=True):
+        self.output = output
+        self.status = status
+        self.width = width
+        self.finish = finish
+        self.closed = False
+        self.pending = bytearray(b"stale prompt output\r\n$ ")
+
+    def recv_ready(self):
+        return bool(self.pending)
+
+    def recv(self, size):
+        if not self.pending:
+            raise socket.timeout()
+        data = bytes(self.pending[:size])
+        del self.pending[:size]
+        return data
+
+    def settimeout(self, timeout):
+        pass
+
+    def exit_status_ready(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+    def send(self, data):
+        line = data.rstrip(b"\n")
+        self.pending += b"\r\n".join(line[i:i + self.width] for i in range(0, len(line), self.width)) + b"\r\n"
+        tag = re.search(rb"(__SS_[0-9a-f]+)", data).group(1)
+        self.pending += tag + b"_B\r\n" + self.output
+        if self.finish:
+            self.pending += tag + b"_E%d\r\n$ " % self.status
+
+
+def test_run_in_shell_strips_wrapped_echo():
+    shell = FakeShell(output=b"hello\r\nworld\r\n", width=7)
+    assert provision._run_in_shell(shell, 'echo hello; echo world', timeout=1) == ("hello\r\nworld\r\n", "", 0)
+
+
+def test_run_in_shell_reports_exit_status():
+    shell = FakeShell(output=b"no such file\r\n", status=2)
+    assert provision._run_in_shell(shell, 'ls /missing', timeout=1) == \
+        ("no such file\r\n", "Command exited with status 2", 2)
+
+
+def test_run_in_shell_times_out_without_end_marker():
+    shell = FakeShell(output=b"partial\r\n", finish=False)
+    output, error, status = provision._run_in_shell(shell, 'sleep 60', timeout=0.05)
+    assert (output, status) == ("partial\r\n", None)
+    assert error.startswith("Timed out")
+
+
+def test_sentinel_markers_never_appear_in_the_typed_line():
+    tag, done, wire = provision._sentinel_command('echo "__SS_x_E0"')
+    assert tag + b"_B" not in wire
+    assert done.search(wire) is None
+    buf = b"echo\r\n" + tag + b"_B\r\nok\r\n" + tag + b"_E0\r\n"
+    assert provision._sentinel_output(buf, tag, done.search(buf)) == "ok\r\n"
+
+
+class FakeTransport:
+    def __init__(self):
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+
+class FakeClient:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.closed = False
+
+    def get_transport(self):
+        return None if self.closed else self.transport
+
+    def close(self):
+        self.closed = True
+
+
+def fake_pool(monkeypatch, **settings):
+    pool = provision.SSHConnectionPool(**settings)
+    opened = []
+
+    def open_conn(key, password):
+        conn = provision.PooledSSHConnection(key=key, client=FakeClient())
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(pool, '_open', open_conn)
+    return pool, opened
+
+
+def test_pool_reuses_released_connection(monkeypatch):
+    pool, opened = fake_pool(monkeypatch)
+    first = pool.acquire('host', 22, 'u', 'pw')
+    pool.release(first)
+    second = pool.acquire('host', '22', 'u', 'pw')
+    assert second is first and second.reused
+    assert len(opened) == 1
+    stats = pool.stats()
+    assert (stats['hits'], stats['misses'], stats['idle']) == (1, 1, 0)
+
+
+def test_pool_closes_unreusable_and_dead_connections(monkeypatch):
+    pool, opened = fake_pool(monkeypatch)
+    conn = pool.acquire('host', 22, 'u', 'pw')
+    pool.release(conn, reusable=False)
+    assert conn.client.closed and pool.idle_count() == 0
+
+    conn = pool.acquire('host', 22, 'u', 'pw')
+    pool.release(conn)
+    conn.client.transport.active = False
+    replacement = pool.acquire('host', 22, 'u', 'pw')
+    assert replacement is not conn and conn.client.closed
+    assert len(opened) == 3
+
+
+def test_pool_evicts_oldest_over_max_size(monkeypatch):
+    pool, _ = fake_pool(monkeypatch, max_size=2)
+    conns = [pool.acquire(f'host{i}', 22, 'u', 'pw') for i in range(3)]
+    for age, conn in enumerate(conns):
+        pool.release(conn)
+        conn.last_used -= 10 - age
+    pool.release(pool.acquire('host3', 22, 'u', 'pw'))
+    assert pool.idle_count() == 2
+    assert conns[0].client.closed and conns[1].client.closed and not conns[2].client.closed
+
+
+def test_pool_prune_closes_expired_connections(monkeypatch):
+    pool, _ = fake_pool(monkeypatch, idle_ttl=30)
+    old, recent = pool.acquire('a', 22, 'u', 'pw'), pool.acquire('b', 22, 'u', 'pw')
+    pool.release(old)
+    pool.release(recent)
+    old.last_used -= 60
+    pool.prune()
+    assert old.client.closed and not recent.client.closed
+    assert pool.idle_count() == 1
+
+
+def test_pool_rechecks_su_shell_before_reuse(monkeypatch):
+    pool, opened = fake_pool(monkeypatch)
+    verified = []
+    monkeypatch.setattr(provision, '_verify_su_shell', lambda shell, su, timeout=1.0: verified.append(su) or False)
+    conn = pool.acquire('host', 22, 'u', 'pw', su='root')
+    conn.shell, conn.elevated = FakeShell(), True
+    pool.release(conn)
+    assert pool.acquire('host', 22, 'u', 'pw', su='root') is not conn
+    assert verified == ['root'] and len(opened) == 2
+    assert conn.shell.closed and conn.client.closed
+
+
+def test_registry_reconcile_touches_only_changed_clients():
+    def client(cid, protocol, **creds):
+        return {'id': cid, 'protocol': protocol, 'credentials': dict({'hostname': f'{cid}.local'}, **creds)}
+
+    registry = provision.ConnectionRegistry()
+    registry.start([client('a', 'udp'), client('b', 'telnet'), client('c', 'subprocess')])
+    try:
+        kept, changed = registry.get_session('a'), registry.get_session('b')
+        result = registry.reconcile([client('a', 'udp'), client('b', 'telnet', port=2323), client('d', 'udp')])
+        assert result == {'added': ['d'], 'removed': ['c'], 'rebuilt': ['b']}
+        assert registry.get_session('a') is kept
+        assert registry.get_session('b') is not changed and registry.get_session('b').credentials['port'] == 2323
+        assert registry.get_session('c') is None and registry.get_session('d') is not None
+        assert registry.reconcile([client('a', 'udp'), client('b', 'telnet', port=2323), client('d', 'udp')]) == \
+            {'added': [], 'removed': [], 'rebuilt': []}
+    finally:
+        registry.shutdown()
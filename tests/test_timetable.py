@@ -0,0 +1,244 @@
+"""In-memory timetable model and its persistence, checked without a running scheduler."""
+import os
+import sqlite3
+import threading
+
+import pytest
+
+import main
+
+
+def event(name, **fields):
+    data = {'DisplayName': name, 'Enabled': True, 'Hours': [], 'Days': [], 'Weeks': [], 'Months': [],
+            'MinuteInterval': '0', 'TenMinuteInterval': ['00']}
+    data.update(fields)
+    return data
+
+
+def compiled(name, **fields):
+    return main.CompiledEvent(event(name, **fields))
+
+
+def names(events):
+    return [e.name for e in events]
+
+
+def test_catalog_rename_keeps_position():
+    catalog = main.EventCatalog([compiled('a'), compiled('b'), compiled('c')])
+    assert catalog.upsert(compiled('b2'), old_name='b')
+    assert names(catalog.all()) == ['a', 'b2', 'c']
+    assert 'b' not in catalog and catalog.get('b2') is not None
+
+
+def test_catalog_rename_onto_existing_name_fails():
+    catalog = main.EventCatalog([compiled('a'), compiled('b')])
+    original = catalog.get('b')
+    assert not catalog.upsert(compiled('b', Category='Other'), old_name='a')
+    assert not catalog.upsert(compiled('x'), old_name='missing')
+    assert names(catalog.all()) == ['a', 'b']
+    assert catalog.get('b') is original
+
+
+
+def test_catalog_keeps_timetable_order_across_edits():
+    catalog = main.EventCatalog([compiled('a'), compiled('b'), compiled('c')])
+    catalog.upsert(compiled('a', MinuteInterval='5'))
+    catalog.remove('b')
+    catalog.upsert(compiled('b'))
+    assert names(catalog.all()) == ['a', 'c', 'b']
+    catalog.apply([compiled('z'), compiled('y')], replace=True)
+    assert names(catalog.all()) == ['z', 'y']
+
+
+def test_catalog_lookups_follow_edits():
+    catalog = main.EventCatalog([
+        compiled('one', client_config={'c1': {'flavor': 'domestic/Local', 'presentation_id': ' p1 '}}),
+        compiled('two', clients=['c2'], flavor={'c2': 'domestic/Local'}, TargetID='p2'),
+        compiled('none'),
+    ])
+    assert names(catalog.for_client_id('c1')) == ['one']
+    assert names(catalog.for_flavor('domestic/Local')) == ['one', 'two']
+    assert names(catalog.for_presentation('p1')) == ['one']
+    assert names(catalog.untargeted()) == ['none']
+    assert names(catalog.targeting({'id': 'c2', 'star': 'i2xd'})) == ['two']
+
+    catalog.upsert(compiled('none', clients=['c1']))
+    catalog.upsert(compiled('one2', client_config={'c3': {'flavor': 'national'}}), old_name='one')
+    assert names(catalog.for_client_id('c1')) == ['none']
+    assert names(catalog.for_client_id('c3')) == ['one2']
+    assert names(catalog.for_flavor('domestic/Local')) == ['two']
+    assert catalog.for_presentation('p1') == [] and catalog.untargeted() == []
+
+def test_edit_event_rejects_rename_onto_existing_event(monkeypatch):
+    engine = main.EventSchedulerEngine(None)
+    monkeypatch.setattr(engine._timetable_writer, 'mark_dirty', lambda: None)
+    assert engine.write_event(event('a')) and engine.write_event(event('b'))
+    assert not engine.edit_event('a', event('b'))
+    assert names(engine.grab_compiled_events()) == ['a', 'b']
+
+
+def test_writer_coalesces_a_burst_into_one_atomic_write(tmp_path):
+    path = tmp_path / 'timetable.xml'
+    renders = []
+    written = threading.Event()
+
+    def render():
+        renders.append(len(renders))
+        return f"<timetable>{len(renders)}</timetable>"
+
+    writer = main.TimetableWriter(str(path), render, coalesce_delay=0.05, on_written=written.set)
+    for _ in range(5):
+        writer.mark_dirty()
+    assert written.wait(2)
+    assert renders == [0]
+    assert path.read_text() == "<timetable>1</timetable>"
+    assert not (tmp_path / 'timetable.xml.tmp').exists()
+    assert writer.is_own_write() and not writer.dirty
+
+
+def test_writer_keeps_old_file_when_render_fails(tmp_path):
+    path = tmp_path / 'timetable.xml'
+    path.write_text("<timetable />")
+
+    def render():
+        raise RuntimeError("boom")
+
+    writer = main.TimetableWriter(str(path), render, coalesce_delay=60)
+    writer.mark_dirty()
+    writer.flush()
+    assert path.read_text() == "<timetable />"
+    assert writer.dirty and not writer.is_own_write()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = main.SQLiteTimetableStore(str(tmp_path / 'timetable.db'))
+    yield store
+    store.close()
+
+
+def test_store_rename_keeps_row_position(store):
+    store.apply_batch([compiled('a'), compiled('b'), compiled('c')], replace=True)
+    store.upsert(compiled('b2'), old_name='b')
+    assert [e['DisplayName'] for e in store.load_all()] == ['a', 'b2', 'c']
+
+
+def test_store_rename_onto_existing_name_raises(store):
+    store.apply_batch([compiled('a'), compiled('b', Category='Custom Command')], replace=True)
+    with pytest.raises(sqlite3.IntegrityError):
+        store.upsert(compiled('b'), old_name='a')
+    assert [(e['DisplayName'], e.get('Category')) for e in store.load_all()] == \
+        [('a', None), ('b', 'Custom Command')]
+
+
+def test_store_secondary_indexes(store):
+    store.apply_batch([
+        compiled('morning', Hours=[{'hour': '7', 'period': 'AM'}], clients=['c1'], Category='Custom Command'),
+        compiled('evening', Hours=[{'hour': '7', 'period': 'PM'}], clients=['c1', 'c2']),
+        compiled('off', Enabled=False, Hours=[{'hour': '7', 'period': 'AM'}], clients=['c2']),
+    ], replace=True)
+    assert store.names_for_client('c1') == ['morning', 'evening']
+    assert store.names_for_client('c2') == ['evening', 'off']
+    assert store.enabled_names_in_hour(7) == ['morning']
+    assert store.names_in_category('Custom Command') == ['morning']
+    store.delete('morning')
+    assert store.names_for_client('c1') == ['evening'] and store.enabled_names_in_hour(7) == []
+
+
+def test_store_data_version_tracks_other_connections(store):
+    version = store.data_version()
+    store.upsert(compiled('own'))
+    assert store.data_version() == version
+    other = main.SQLiteTimetableStore(store.path)
+    try:
+        other.upsert(compiled('theirs'))
+    finally:
+        other.close()
+    assert store.data_version() != version
+    assert [e['DisplayName'] for e in store.load_all()] == ['own', 'theirs']
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    source = tmp_path / 'timetable.xml'
+    source.write_text("<timetable>aaaa</timetable>")
+    cache = main.TimetableSnapshotCache(str(tmp_path / '.timetable.snapshot'))
+    cache.save(str(source), [compiled('a'), compiled('b')])
+    return cache, source
+
+
+def test_snapshot_round_trip(snapshot):
+    cache, source = snapshot
+    assert names(cache.load(str(source))) == ['a', 'b']
+
+
+def test_snapshot_ignored_when_bytes_change_under_same_size_and_mtime(snapshot):
+    cache, source = snapshot
+    st = source.stat()
+    source.write_text("<timetable>bbbb</timetable>")
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert cache.load(str(source)) is None
+
+
+def test_snapshot_ignored_on_mtime_or_format_change(snapshot, monkeypatch):
+    cache, source = snapshot
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cache.load(str(source)) is None
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert cache.load(str(source)) is not None
+    monkeypatch.setattr(main.TimetableSnapshotCache, 'VERSION', main.TimetableSnapshotCache.VERSION + 1)
+    assert cache.load(str(source)) is None
+
+
+def test_snapshot_unreadable_file_is_a_miss(snapshot):
+    cache, source = snapshot
+    with open(cache.path, 'wb') as f:
+        f.write(b"not a pickle")
+    assert cache.load(str(source)) is None
+
+
+@pytest.fixture
+def journaled(tmp_path):
+    engine = main.EventSchedulerEngine(None)
+    engine.change_journal = main.TimetableChangeJournal(str(tmp_path / 'timetable.journal'))
+    return engine
+
+
+def test_journal_round_trip(journaled):
+    journal = journaled.change_journal
+    journal.append('upsert', event=event('a'))
+    journal.append('upsert', event=event('b'))
+    journal.append('upsert', event=event('a2', MinuteInterval='5'), old_name='a')
+    journal.append('delete', name='b')
+    assert journaled._apply_change_journal() == 4
+    assert names(journaled.grab_compiled_events()) == ['a2']
+    assert journaled.get_event('a2').data['MinuteInterval'] == '5'
+
+    # Replaying from the start (as after a reload) lands on the same timetable.
+    journal.rewind()
+    journaled._apply_change_journal()
+    assert names(journaled.grab_compiled_events()) == ['a2']
+
+
+def test_journal_leaves_partial_line_for_next_read(tmp_path):
+    journal = main.TimetableChangeJournal(str(tmp_path / 'timetable.journal'))
+    journal.append('delete', name='a')
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "delete", ')
+    assert journal.read_new() == [{'op': 'delete', 'name': 'a'}]
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('"name": "b"}\n')
+    assert journal.read_new() == [{'op': 'delete', 'name': 'b'}]
+
+
+def test_journal_compact_keeps_unapplied_tail(tmp_path):
+    journal = main.TimetableChangeJournal(str(tmp_path / 'timetable.journal'))
+    journal.append('delete', name='a')
+    journal.read_new()
+    mark = journal.offset
+    journal.append('delete', name='b')
+    journal.compact(mark)
+    assert journal.offset == 0
+    assert journal.read_new() == [{'op': 'delete', 'name': 'b'}]
+    assert journal.read_new() == []
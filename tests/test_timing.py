@@ -0,0 +1,190 @@
+"""Fire-time and dispatch alignment checks, run against a virtual clock."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import main
+import provision
+
+
+class FakeClock(main.SystemClock):
+    """SystemClock whose time only moves when the engine sleeps or a fake send takes time."""
+
+    def __init__(self, start: datetime):
+        self.start = start
+        self.elapsed = 0.0
+        self.sleeps = []
+
+    def now(self) -> datetime:
+        return self.start + timedelta(seconds=self.elapsed)
+
+    def monotonic(self) -> float:
+        return self.elapsed
+
+    def advance(self, seconds: float):
+        self.elapsed += seconds
+
+    async def sleep(self, seconds: float):
+        self.sleeps.append(round(seconds, 6))
+        self.advance(seconds)
+        await asyncio.sleep(0)
+
+
+def compiled(**fields):
+    event = {'DisplayName': 'test', 'Enabled': True, 'Hours': [], 'Days': [], 'Weeks': [], 'Months': []}
+    event.update(fields)
+    return main.CompiledEvent(event)
+
+
+MONDAY = datetime(2026, 10, 19)
+UTC = timezone.utc
+
+
+@pytest.mark.parametrize('rule, hours', [
+    ({'hour': '12', 'period': 'AM'}, [0]),
+    ({'hour': '12', 'period': 'PM'}, [12]),
+    ({'hour': '7', 'period': 'PM'}, [19]),
+    ({'hour': '7', 'period': 'AM/PM'}, [7, 19]),
+    ({'hour': '7'}, [7]),
+])
+def test_hour_rules(rule, hours):
+    event = compiled(Hours=[rule], MinuteInterval='0', TenMinuteInterval=['00'])
+    targets = []
+    after = MONDAY
+    for _ in hours:
+        target = event.next_target(after)
+        targets.append(target)
+        after = target + timedelta(seconds=1)
+    assert [t.hour for t in targets] == hours
+    assert all(t.date() == MONDAY.date() and t.minute == 0 for t in targets)
+
+
+def test_next_target_second_offset():
+    event = compiled(Hours=[{'hour': '3', 'period': 'PM'}], MinuteInterval='5',
+                     TenMinuteInterval=['00', '30'], Second=20)
+    assert event.next_target(MONDAY) == MONDAY.replace(hour=15, minute=5, second=20)
+    assert event.next_target(MONDAY.replace(hour=15, minute=5, second=20)) == MONDAY.replace(hour=15, minute=5, second=20)
+    assert event.next_target(MONDAY.replace(hour=15, minute=5, second=21)) == MONDAY.replace(hour=15, minute=35, second=20)
+    assert event.next_target(MONDAY.replace(hour=15, minute=35, second=20, microsecond=1)) == \
+        MONDAY.replace(hour=15, minute=5, second=20) + timedelta(days=1)
+
+
+def test_align_second_offset():
+    event = compiled(MinuteInterval='0', Second=20)
+    assert event.align(MONDAY.replace(hour=9, minute=5, second=47)) == MONDAY.replace(hour=9, minute=5, second=20)
+    assert event.align(MONDAY.replace(hour=9, minute=5, second=20)) == MONDAY.replace(hour=9, minute=5, second=20)
+    assert event.align(MONDAY.replace(hour=9, minute=5, second=10)) == MONDAY.replace(hour=9, minute=4, second=20)
+
+
+def test_lead_covers_separate_load_run_offsets():
+    default = compiled(MinuteInterval='0')
+    split = compiled(MinuteInterval='0', client_config={
+        'c1': {'action': 'LoadRun', 'separate_load_run': True, 'load_offset': '-90', 'run_offset': '-30'},
+    })
+    assert default.lead == timedelta(seconds=main.DEFAULT_LEAD_SECONDS)
+    assert split.lead == timedelta(seconds=90 + main.LEAD_MARGIN_SECONDS)
+
+
+def test_event_trigger_fires_lead_ahead_of_target():
+    event = compiled(Hours=[{'hour': '3', 'period': 'PM'}], MinuteInterval='5',
+                     TenMinuteInterval=['00', '30'], Second=20)
+    trigger = main.EventTrigger(event, timezone=UTC)
+    now = MONDAY.replace(hour=14, tzinfo=UTC)
+    first = trigger.get_next_fire_time(None, now)
+    assert first == MONDAY.replace(hour=15, minute=5, second=20, tzinfo=UTC) - event.lead
+    # The job wakes inside the lead window; aligning now + lead recovers the target it fires for.
+    assert event.align(first.replace(tzinfo=None) + event.lead) == MONDAY.replace(hour=15, minute=5, second=20)
+    second = trigger.get_next_fire_time(first, first)
+    assert second == MONDAY.replace(hour=15, minute=35, second=20, tzinfo=UTC) - event.lead
+
+
+def test_wave_trigger_uses_earliest_member_and_widest_lead():
+    early = compiled(DisplayName='early', MinuteInterval='2', TenMinuteInterval=['00'])
+    late = compiled(DisplayName='late', MinuteInterval='7', TenMinuteInterval=['00'], client_config={
+        'c1': {'action': 'LoadRun', 'separate_load_run': True, 'load_offset': '-80', 'run_offset': '-40'},
+    })
+    trigger = main.WaveTrigger([early, late], timezone=UTC)
+    assert trigger.lead == late.lead
+    now = MONDAY.replace(hour=10, tzinfo=UTC)
+    first = trigger.get_next_fire_time(None, now)
+    assert first == MONDAY.replace(hour=10, minute=2, tzinfo=UTC) - late.lead
+    second = trigger.get_next_fire_time(first, first)
+    assert second == MONDAY.replace(hour=10, minute=7, tzinfo=UTC) - late.lead
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    clock = FakeClock(MONDAY.replace(hour=12))
+    engine = main.EventSchedulerEngine(None, clock=clock)
+    monkeypatch.setattr(provision.get_connection_registry(), 'get_session', lambda cid: None)
+    return engine
+
+
+I2_CLIENT = {'id': 'c1', 'star': 'i2xd', 'protocol': 'ssh',
+             'credentials': {'hostname': 'host', 'user': 'u', 'password': 'p', 'port': 22}}
+
+
+def fake_send(clock, calls, rtt):
+    """Stand-in for provision.execute_ssh_command that records which i2 call went out and when."""
+    async def send(**kwargs):
+        calls.append((kwargs['command'].rsplit('" ', 1)[1].split('(')[0], clock.elapsed))
+        clock.advance(rtt)
+        return ('', '')
+    return send
+
+
+def test_dispatch_sleeps_to_target_minus_latency(engine, monkeypatch):
+    clock, calls = engine.clock, []
+    monkeypatch.setattr(provision, 'execute_ssh_command', fake_send(clock, calls, 0.4))
+    engine.latency.record('c1', 0.5)
+    plan = main.ActionPlan.compile(I2_CLIENT, {'action': 'LoadRun', 'flavor': 'domestic/Local'}, {})
+    target = clock.now() + timedelta(seconds=30)
+
+    asyncio.run(engine._dispatch_client_action(plan, target, is_manual=False))
+
+    assert clock.sleeps == [29.5]
+    assert calls == [('loadRunPres', 29.5)]
+    assert engine.last_event_offsets['c1'] == pytest.approx(-0.1)
+    assert engine.latency.estimate('c1') == pytest.approx(0.5 + engine.latency.alpha * (0.4 - 0.5))
+
+
+def test_dispatch_separate_load_and_run_offsets(engine, monkeypatch):
+    clock, calls = engine.clock, []
+    monkeypatch.setattr(provision, 'execute_ssh_command', fake_send(clock, calls, 0.2))
+    engine.latency.record('c1', 0.2)
+    plan = main.ActionPlan.compile(I2_CLIENT, {'action': 'LoadRun', 'separate_load_run': True,
+                                               'load_offset': '-20', 'run_offset': '-12'}, {})
+    target = clock.now() + timedelta(seconds=30)
+
+    asyncio.run(engine._dispatch_client_action(plan, target, is_manual=False))
+
+    assert clock.sleeps == [pytest.approx(9.8), pytest.approx(7.8)]
+    assert [name for name, _ in calls] == ['loadPres', 'runPres']
+    assert calls[0][1] == pytest.approx(9.8)
+    assert calls[1][1] == pytest.approx(17.8)
+    assert engine.last_event_offsets['c1'] == pytest.approx(0.0)
+
+
+def test_dispatch_manual_does_not_sleep(engine, monkeypatch):
+    clock, calls = engine.clock, []
+    monkeypatch.setattr(provision, 'execute_ssh_command', fake_send(clock, calls, 0.3))
+    plan = main.ActionPlan.compile(I2_CLIENT, {'action': 'LoadRun'}, {})
+
+    asyncio.run(engine._dispatch_client_action(plan, clock.now() + timedelta(seconds=30), is_manual=True))
+
+    assert clock.sleeps == []
+    assert calls == [('loadRunPres', 0.0)]
+    assert 'c1' not in engine.latency.snapshot()
+
+
+def test_dispatch_noop_cancel_records_no_latency(engine):
+    udp_client = dict(I2_CLIENT, protocol='udp')
+    plan = main.ActionPlan.compile(udp_client, {'action': 'Cancel'}, {})
+    target = engine.clock.now() + timedelta(seconds=5)
+
+    asyncio.run(engine._dispatch_client_action(plan, target, is_manual=False))
+
+    assert engine.clock.sleeps == [5.0]
+    assert 'c1' not in engine.latency.snapshot()
+    assert 'c1' not in engine.last_event_offsets